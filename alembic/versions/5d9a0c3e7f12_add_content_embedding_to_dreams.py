@@ -0,0 +1,29 @@
+"""add content_embedding to dreams
+
+Revision ID: 5d9a0c3e7f12
+Revises: e3f81a6c27b4
+Create Date: 2026-10-19 16:12:08.503114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d9a0c3e7f12'
+down_revision: Union[str, Sequence[str], None] = 'e3f81a6c27b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Embedding of the dream text itself (bulk import); `embedding` is the synthesis's
+    op.execute("ALTER TABLE dreams ADD COLUMN content_embedding vector(384)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("ALTER TABLE dreams DROP COLUMN IF EXISTS content_embedding")
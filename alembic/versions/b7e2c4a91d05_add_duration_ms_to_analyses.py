@@ -0,0 +1,31 @@
+"""add duration_ms to analyses
+
+Revision ID: b7e2c4a91d05
+Revises: 4c500d3a38da
+Create Date: 2026-10-19 11:30:12.481907
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e2c4a91d05'
+down_revision: Union[str, Sequence[str], None] = '4c500d3a38da'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('analyses', sa.Column('duration_ms', sa.Float(), nullable=True))
+    # Model router reads recent history (created_at window)
+    op.create_index(op.f('ix_analyses_created_at'), 'analyses', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_analyses_created_at'), table_name='analyses')
+    op.drop_column('analyses', 'duration_ms')
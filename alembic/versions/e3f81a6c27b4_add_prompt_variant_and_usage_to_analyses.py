@@ -0,0 +1,34 @@
+"""add prompt_variant and usage to analyses
+
+Revision ID: e3f81a6c27b4
+Revises: b7e2c4a91d05
+Create Date: 2026-10-19 15:04:37.215630
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3f81a6c27b4'
+down_revision: Union[str, Sequence[str], None] = 'b7e2c4a91d05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('analyses', sa.Column('prompt_variant', sa.String(length=100), server_default='default', nullable=False))
+    op.add_column('analyses', sa.Column('prompt_tokens', sa.Integer(), nullable=True))
+    op.add_column('analyses', sa.Column('completion_tokens', sa.Integer(), nullable=True))
+    op.add_column('analyses', sa.Column('ttft_ms', sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('analyses', 'ttft_ms')
+    op.drop_column('analyses', 'completion_tokens')
+    op.drop_column('analyses', 'prompt_tokens')
+    op.drop_column('analyses', 'prompt_variant')
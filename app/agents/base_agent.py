@@ -1,13 +1,17 @@
 from abc import ABC, abstractmethod
 
+from app.agents.prompts import DEFAULT_VARIANT, OVERRIDE_VARIANT
 from app.core.models_config import DEFAULT_MODEL
 
 
 class BaseAgent(ABC):
     """Base class for all dream analysis agents."""
 
-    def __init__(self, model: str = DEFAULT_MODEL):
+    def __init__(self, model: str = DEFAULT_MODEL, system_prompt: str | None = None):
         self.model = model
+        self.system_prompt = system_prompt  # None = the agent's own SYSTEM_PROMPT
+        # Recorded with the analysis; see app.agents.prompts
+        self.prompt_variant = DEFAULT_VARIANT if system_prompt is None else OVERRIDE_VARIANT
 
     @property
     @abstractmethod
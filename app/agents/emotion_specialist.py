@@ -35,7 +35,12 @@ class EmotionSpecialist(BaseAgent):
             f"First-pass analysis:\n{context}\n\n"
             "Provide a deep emotional analysis."
         )
-        return await generate(model=self.model, prompt=prompt, system=SYSTEM_PROMPT)
+        return await generate(
+            model=self.model,
+            prompt=prompt,
+            system=self.system_prompt or SYSTEM_PROMPT,
+            agent=self.name,
+        )
 
     async def analyze_stream(self, dream_content: str, context: str | None = None):
         logger.info(f"EmotionSpecialist streaming with {self.model}")
@@ -44,5 +49,10 @@ class EmotionSpecialist(BaseAgent):
             f"First-pass analysis:\n{context}\n\n"
             "Provide a deep emotional analysis."
         )
-        async for chunk in generate_stream(model=self.model, prompt=prompt, system=SYSTEM_PROMPT):
+        async for chunk in generate_stream(
+            model=self.model,
+            prompt=prompt,
+            system=self.system_prompt or SYSTEM_PROMPT,
+            agent=self.name,
+        ):
             yield chunk
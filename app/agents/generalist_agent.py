@@ -31,7 +31,8 @@ class GeneralistAgent(BaseAgent):
         return await generate(
             model=self.model,
             prompt=f'Here\'s the dream:\n\n"{dream_content}"\n\nProvide a structured first-pass analysis.',  # noqa: E501
-            system=SYSTEM_PROMPT,
+            system=self.system_prompt or SYSTEM_PROMPT,
+            agent=self.name,
         )
 
     async def analyze_stream(self, dream_content: str, context: str | None = None):
@@ -39,6 +40,7 @@ class GeneralistAgent(BaseAgent):
         async for chunk in generate_stream(
             model=self.model,
             prompt=f'Here\'s the dream:\n\n"{dream_content}"\n\nProvide a structured first-pass analysis.',  # noqa: E501
-            system=SYSTEM_PROMPT,
+            system=self.system_prompt or SYSTEM_PROMPT,
+            agent=self.name,
         ):
             yield chunk
@@ -0,0 +1,79 @@
+"""
+Versioned system prompt variants and A/B assignment (PROMPT_EXPERIMENTS).
+
+Every agent has the "default" variant, its module's SYSTEM_PROMPT. Other variants are
+files: PROMPTS_DIR/<agent name>/<variant>.txt, e.g. prompts/symbol_specialist/terse-v1.txt.
+A variant is a version: once it has run, change it by adding terse-v2.txt instead of
+editing it, so stored results keep meaning what they say. Files are read once per worker.
+
+PROMPT_EXPERIMENTS weights the variants per agent. A dream's variant is picked from a
+hash of the agent name and dream id, so it is the same on every worker and every re-run,
+and each agent's split is independent of the others. The variant is stored on the
+analysis (`prompt_variant`); GET /api/v1/prompts/report compares them.
+"""
+
+import hashlib
+from functools import lru_cache
+from pathlib import Path
+
+from loguru import logger
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+DEFAULT_VARIANT = "default"
+OVERRIDE_VARIANT = "override"  # A prompt passed in directly (evals)
+
+
+def _agent_dir(agent: str) -> Path:
+    return Path(settings.prompts_dir) / agent
+
+
+@lru_cache(maxsize=256)
+def load_variant(agent: str, variant: str) -> str | None:
+    """A variant's prompt text, or None if there is no such file."""
+    path = _agent_dir(agent) / f"{variant}.txt"
+    if not path.is_file():
+        return None
+    return path.read_text().strip()
+
+
+def list_variants(agent: str) -> list[str]:
+    directory = _agent_dir(agent)
+    files = sorted(path.stem for path in directory.glob("*.txt")) if directory.is_dir() else []
+    return [DEFAULT_VARIANT, *files]
+
+
+def list_agents() -> list[str]:
+    """Agents with variant files or an experiment."""
+    root = Path(settings.prompts_dir)
+    with_files = {path.name for path in root.iterdir() if path.is_dir()} if root.is_dir() else set()
+    return sorted(with_files | set(settings.prompt_experiments))
+
+
+def assign_variant(agent: str, dream_id: int) -> str:
+    """The variant `agent` uses for `dream_id` under PROMPT_EXPERIMENTS."""
+    weights = {v: w for v, w in settings.prompt_experiments.get(agent, {}).items() if w > 0}
+    if not weights:
+        return DEFAULT_VARIANT
+    digest = hashlib.sha256(f"{agent}:{dream_id}".encode()).digest()
+    point = int.from_bytes(digest[:8], "big") / 2**64 * sum(weights.values())
+    variants = sorted(weights)  # Independent of config key order
+    for variant in variants:
+        point -= weights[variant]
+        if point < 0:
+            return variant
+    return variants[-1]
+
+
+def choose_prompt(agent: str, dream_id: int) -> tuple[str, str | None]:
+    """(variant, prompt text) for a dream; text None means the agent's own SYSTEM_PROMPT."""
+    variant = assign_variant(agent, dream_id)
+    if variant == DEFAULT_VARIANT:
+        return variant, None
+    text = load_variant(agent, variant)
+    if text is None:
+        logger.error(f"Prompt variant {agent}/{variant} not found; using {DEFAULT_VARIANT}")
+        return DEFAULT_VARIANT, None
+    return variant, text
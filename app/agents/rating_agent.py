@@ -31,7 +31,12 @@ class RatingAgent(BaseAgent):
         """Rate an analysis. dream_content = original dream, context = analysis to rate."""
         logger.info(f"RatingAgent evaluating with {self.model}")
         prompt = f'Dream:\n"{dream_content}"\n\nAnalysis to evaluate:\n{context}'
-        return await generate(model=self.model, prompt=prompt, system=SYSTEM_PROMPT)
+        return await generate(
+            model=self.model,
+            prompt=prompt,
+            system=self.system_prompt or SYSTEM_PROMPT,
+            agent=self.name,
+        )
 
     async def analyze_stream(self, dream_content: str, context: str | None = None):
         result = await self.analyze(dream_content, context)
@@ -34,7 +34,12 @@ class SymbolSpecialist(BaseAgent):
             f"First-pass analysis:\n{context}\n\n"
             "Provide a deep symbol analysis."
         )
-        return await generate(model=self.model, prompt=prompt, system=SYSTEM_PROMPT)
+        return await generate(
+            model=self.model,
+            prompt=prompt,
+            system=self.system_prompt or SYSTEM_PROMPT,
+            agent=self.name,
+        )
 
     async def analyze_stream(self, dream_content: str, context: str | None = None):
         logger.info(f"SymbolSpecialist streaming with {self.model}")
@@ -43,5 +48,10 @@ class SymbolSpecialist(BaseAgent):
             f"First-pass analysis:\n{context}\n\n"
             "Provide a deep symbol analysis."
         )
-        async for chunk in generate_stream(model=self.model, prompt=prompt, system=SYSTEM_PROMPT):
+        async for chunk in generate_stream(
+            model=self.model,
+            prompt=prompt,
+            system=self.system_prompt or SYSTEM_PROMPT,
+            agent=self.name,
+        ):
             yield chunk
@@ -30,7 +30,12 @@ class SynthesizerAgent(BaseAgent):
             f"Specialist analyses:\n{context}\n\n"
             "Write the final synthesis."
         )
-        return await generate(model=self.model, prompt=prompt, system=SYSTEM_PROMPT)
+        return await generate(
+            model=self.model,
+            prompt=prompt,
+            system=self.system_prompt or SYSTEM_PROMPT,
+            agent=self.name,
+        )
 
     async def analyze_stream(self, dream_content: str, context: str | None = None):
         logger.info(f"SynthesizerAgent streaming with {self.model}")
@@ -39,5 +44,10 @@ class SynthesizerAgent(BaseAgent):
             f"Specialist analyses:\n{context}\n\n"
             "Write the final synthesis."
         )
-        async for chunk in generate_stream(model=self.model, prompt=prompt, system=SYSTEM_PROMPT):
+        async for chunk in generate_stream(
+            model=self.model,
+            prompt=prompt,
+            system=self.system_prompt or SYSTEM_PROMPT,
+            agent=self.name,
+        ):
             yield chunk
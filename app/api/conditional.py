@@ -0,0 +1,59 @@
+"""ETag / Last-Modified helpers for conditional GETs on dream reads."""
+
+import hashlib
+from collections.abc import Iterable
+from datetime import UTC, datetime
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Request, Response, status
+
+from app.core.cache import CachedResponse
+
+
+def _validator(dream: dict) -> str:
+    # updated_at covers edits to the dream itself; analyses only ever get appended or
+    # re-scored, so the newest timestamp, the count and the scores cover the rest.
+    analyses = dream["analyses"]
+    latest = max((a["created_at"] for a in analyses), default=None)
+    scores = ",".join(str(a["score"] or "") for a in sorted(analyses, key=lambda a: a["id"]))
+    return f"{dream['id']}:{dream['updated_at'].isoformat()}:{latest}:{len(analyses)}:{scores}"
+
+
+def compute_etag(dreams: Iterable[dict]) -> str:
+    """Strong ETag over dream rows as returned by DreamService.get_dream_rows."""
+    digest = hashlib.sha1("|".join(_validator(d) for d in dreams).encode()).hexdigest()
+    return f'"{digest}"'
+
+
+def compute_last_modified(dreams: Iterable[dict]) -> datetime | None:
+    stamps = [max([d["updated_at"], *(a["created_at"] for a in d["analyses"])]) for d in dreams]
+    return max(stamps, default=None)
+
+
+def _not_modified(request: Request, entry: CachedResponse) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-None-Match wins over If-Modified-Since when both are sent (RFC 9110 13.2.2)
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in candidates or entry.etag in candidates
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and entry.last_modified:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        # HTTP dates have whole-second precision
+        return entry.last_modified.replace(microsecond=0) <= since
+    return False
+
+
+def conditional_response(request: Request, entry: CachedResponse) -> Response:
+    """Return 304 if the client's validators still match, else the cached JSON body."""
+    headers = {"ETag": entry.etag, "Cache-Control": "no-cache"}
+    if entry.last_modified:
+        headers["Last-Modified"] = format_datetime(entry.last_modified.astimezone(UTC), usegmt=True)
+
+    if _not_modified(request, entry):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
@@ -1,28 +1,39 @@
 import asyncio
-import json
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, status
 from fastapi.responses import StreamingResponse
-from sqlalchemy import text
+from loguru import logger
+from redis.exceptions import RedisError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.agents.emotion_specialist import EmotionSpecialist
-from app.agents.generalist_agent import GeneralistAgent
-from app.agents.rating_agent import RatingAgent
-from app.agents.symbol_specialist import SymbolSpecialist
-from app.agents.synthesizer_agent import SynthesizerAgent
-from app.agents.theme_specialist import ThemeSpecialist
-from app.core.database import AsyncSessionLocal, get_db
+from app.api.conditional import compute_etag, compute_last_modified, conditional_response
+from app.core import cache
+from app.core.config import get_settings
+from app.core.database import get_db
+from app.core.metrics import track_stream
 from app.core.models_config import DEFAULT_MODEL
-from app.schemas.dream import DreamCreate, DreamRead, DreamUpdate
+from app.core.serialization import dumps
+from app.core.sse import sse_response, stream_response
+from app.schemas.dream import DreamCreate, DreamImportResult, DreamRead, DreamUpdate
+from app.schemas.timeline import Timeline
 from app.services.analysis_service import AnalysisService
 from app.services.dream_service import DreamService
-from app.ui.embeddings import embed_text
+from app.services.import_service import ImportService, iter_lines
+from app.services.timeline_service import build_timeline, read_dream_spans
+from app.workflows.analysis_queue import enqueue_analysis
 from app.workflows.dream_analysis import run_dream_analysis
+from app.workflows.run_streams import parse_event_id, run_exists, run_frames, start_run
+from app.workflows.streaming import (
+    stream_analysis_events,
+    stream_generalist_chunks,
+    stream_pipeline_events,
+)
 
 router = APIRouter()
 
+settings = get_settings()
+
 
 @router.post("/dreams", response_model=DreamRead, status_code=status.HTTP_201_CREATED)
 async def create_dream(
@@ -35,6 +46,66 @@ async def create_dream(
     return await service.get_dream_with_analyses(created.id)
 
 
+@router.post("/dreams/import", response_model=DreamImportResult)
+async def import_dreams(
+    request: Request,
+    embed: bool = Query(default=False, description="Compute content embeddings in batches"),
+    analyze: bool = Query(default=False, description="Queue the full pipeline for each dream"),
+    model: str = Query(default=DEFAULT_MODEL),
+    chunk_size: Annotated[int, Query(ge=1, le=10000)] = settings.import_chunk_size,
+    db: AsyncSession = Depends(get_db),
+):
+    """Bulk-import dreams from an NDJSON request body (one DreamCreate per line).
+
+    The body is read as a stream and inserted with COPY in chunks. Invalid lines are
+    reported individually and don't abort the import.
+    """
+    result = await ImportService(db).import_ndjson(
+        iter_lines(request.stream()), chunk_size=chunk_size, embed=embed
+    )
+    if analyze and result.dream_ids:
+        enqueue_analysis(result.dream_ids, model=model)
+        result.analysis_enqueued = len(result.dream_ids)
+    return result
+
+
+@router.post("/dreams/pipeline")
+async def stream_pipeline(
+    request: Request,
+    dream: DreamCreate,
+    db: AsyncSession = Depends(get_db),
+):
+    """Create a dream and stream its whole pipeline over one SSE connection.
+
+    Replaces create → stream-generalist → stream-analyze → similar round trips. Channels:
+      {"event": "dream", "data": {"id": ...}}    — dream created (first event)
+      {"agent": "generalist", "token": "..."}    — then the stream-analyze events:
+      specialist tokens, scores, synthesizer tokens, followed by
+      {"event": "embedding", "data": {...}}      — synthesis embedding stored
+      {"event": "similar", "data": [...]}        — similar dreams, as GET /similar
+      {"event": "done"} / {"event": "error"}
+
+    Runs like stream-analyze: published to a Redis stream (X-Run-ID), resumable via
+    Last-Event-ID on GET /runs/{run_id}/events.
+    """
+    created = await DreamService(db).create_dream(
+        content=dream.content, dream_date=dream.dream_date
+    )
+    events = stream_pipeline_events(created.id, created.content, dream.model)
+
+    try:
+        run_id, _ = await start_run(created.id, events)
+    except RedisError as e:
+        logger.warning(f"Run streams unavailable, streaming dream {created.id} directly: {e}")
+        return sse_response(request, events)
+
+    return stream_response(
+        request,
+        run_frames(run_id),
+        headers={"X-Run-ID": run_id, "X-Dream-ID": str(created.id)},
+    )
+
+
 @router.post("/dreams/{dream_id}/stream-generalist")
 async def stream_generalist(
     dream_id: int,
@@ -48,39 +119,34 @@ async def stream_generalist(
             status_code=status.HTTP_404_NOT_FOUND, detail=f"Dream {dream_id} not found"
         )
 
-    dream_content = dream.content
-
-    async def generate():
-        agent = GeneralistAgent(model=model)
-        full_output = ""
-        async for chunk in agent.analyze_stream(dream_content):
-            full_output += chunk
-            yield chunk
-
-        async with AsyncSessionLocal() as save_db:
-            await AnalysisService(save_db).create_analysis(
-                dream_id=dream_id,
-                agent_name=agent.name,
-                agent_type=agent.agent_type,
-                model_used=agent.model,
-                content=full_output,
-            )
-
-    return StreamingResponse(generate(), media_type="text/plain")
+    chunks = stream_generalist_chunks(dream_id, dream.content, model)
+    return StreamingResponse(
+        track_stream("/api/v1/dreams/{dream_id}/stream-generalist", chunks),
+        media_type="text/plain",
+    )
 
 
 @router.post("/dreams/{dream_id}/stream-analyze")
 async def stream_analyze(
+    request: Request,
     dream_id: int,
     db: AsyncSession = Depends(get_db),
     model: str = Query(default=DEFAULT_MODEL),
+    last_event_id: Annotated[str | None, Header()] = None,
 ):
     """Stream specialists + rating + synthesizer via SSE.
 
     Events:
-      {"agent": "<name>", "token": "<chunk>"}   — token from a streaming agent
+      {"agent": "<name>", "token": "<chunk>"}   — token(s) from a streaming agent
       {"event": "scores", "data": {...}}         — rating scores after specialists finish
+      {"event": "embedding", "data": {...}}      — synthesis embedding written: stored, ms
       {"event": "done"}                          — pipeline complete
+      {"event": "error", "detail": "..."}        — pipeline failed
+
+    The pipeline runs in the background and is published to a Redis stream (run id in
+    the X-Run-ID header). Reconnecting with Last-Event-ID resumes after that event; a
+    request for a dream whose run is still in flight joins it instead of starting a new
+    one. Tokens are coalesced per agent, so one token event may carry several chunks.
     """
     dream = await DreamService(db).get_dream_by_id(dream_id)
     if not dream:
@@ -91,121 +157,21 @@ async def stream_analyze(
     analyses = await AnalysisService(db).get_analyses_for_dream(dream_id)
     generalist_row = next((a for a in analyses if a.agent_name == "generalist"), None)
     generalist_output = generalist_row.content if generalist_row else ""
-    dream_content = dream.content
-
-    async def generate():
-        queue: asyncio.Queue = asyncio.Queue()
-
-        async def stream_specialist(agent, context: str) -> str:
-            full = ""
-            async for chunk in agent.analyze_stream(dream_content, context=context):
-                full += chunk
-                await queue.put({"agent": agent.name, "token": chunk})
-            await queue.put({"_done": agent.name, "content": full})
-            return full
-
-        symbol_agent = SymbolSpecialist(model=model)
-        emotion_agent = EmotionSpecialist(model=model)
-        theme_agent = ThemeSpecialist(model=model)
-
-        tasks = [
-            asyncio.create_task(stream_specialist(symbol_agent, generalist_output)),
-            asyncio.create_task(stream_specialist(emotion_agent, generalist_output)),
-            asyncio.create_task(stream_specialist(theme_agent, generalist_output)),
-        ]
-
-        # Drain queue until all three specialists signal done
-        results: dict[str, str] = {}
-        while len(results) < 3:
-            event = await queue.get()
-            if "_done" in event:
-                results[event["_done"]] = event["content"]
-            else:
-                yield f"data: {json.dumps({'agent': event['agent'], 'token': event['token']})}\n\n"
-
-        await asyncio.gather(*tasks)
-
-        # Save specialists to DB
-        async with AsyncSessionLocal() as save_db:
-            service = AnalysisService(save_db)
-            symbol_row = await service.create_analysis(
-                dream_id=dream_id,
-                agent_name=symbol_agent.name,
-                agent_type=symbol_agent.agent_type,
-                model_used=symbol_agent.model,
-                content=results[symbol_agent.name],
-            )
-            emotion_row = await service.create_analysis(
-                dream_id=dream_id,
-                agent_name=emotion_agent.name,
-                agent_type=emotion_agent.agent_type,
-                model_used=emotion_agent.model,
-                content=results[emotion_agent.name],
-            )
-            theme_row = await service.create_analysis(
-                dream_id=dream_id,
-                agent_name=theme_agent.name,
-                agent_type=theme_agent.agent_type,
-                model_used=theme_agent.model,
-                content=results[theme_agent.name],
-            )
-
-        # Rate all three in parallel
-        judge = RatingAgent(model=model)
-        s_raw, e_raw, t_raw = await asyncio.gather(
-            judge.analyze(dream_content, context=results[symbol_agent.name]),
-            judge.analyze(dream_content, context=results[emotion_agent.name]),
-            judge.analyze(dream_content, context=results[theme_agent.name]),
-        )
-        scores = {
-            "symbol": judge.average_score(judge.parse_scores(s_raw)),
-            "emotion": judge.average_score(judge.parse_scores(e_raw)),
-            "theme": judge.average_score(judge.parse_scores(t_raw)),
-        }
-
-        async with AsyncSessionLocal() as score_db:
-            service = AnalysisService(score_db)
-            await service.update_analysis_score(symbol_row.id, scores["symbol"])
-            await service.update_analysis_score(emotion_row.id, scores["emotion"])
-            await service.update_analysis_score(theme_row.id, scores["theme"])
-
-        yield f"data: {json.dumps({'event': 'scores', 'data': scores})}\n\n"
-
-        # Stream synthesizer
-        synth = SynthesizerAgent(model=model)
-        context = (
-            f"First-pass analysis:\n{generalist_output}\n\n"
-            f"Symbol analysis:\n{results[symbol_agent.name]}\n\n"
-            f"Emotion analysis:\n{results[emotion_agent.name]}\n\n"
-            f"Theme analysis:\n{results[theme_agent.name]}"
-        )
-        synth_output = ""
-        async for chunk in synth.analyze_stream(dream_content, context=context):
-            synth_output += chunk
-            yield f"data: {json.dumps({'agent': 'synthesizer', 'token': chunk})}\n\n"
-
-        async with AsyncSessionLocal() as synth_db:
-            await AnalysisService(synth_db).create_analysis(
-                dream_id=dream_id,
-                agent_name=synth.name,
-                agent_type=synth.agent_type,
-                model_used=synth.model,
-                content=synth_output,
-            )
-
-        async with AsyncSessionLocal() as embed_db:
-            embedding = embed_text(synth_output)
-            # Convert list to pgvector format: "[0.1, 0.2, ...]"
-            embedding_str = str(embedding)
-            await embed_db.execute(
-                text("UPDATE dreams SET embedding = CAST(:emb AS vector) WHERE id = :id"),
-                {"emb": embedding_str, "id": dream_id},
-            )
-            await embed_db.commit()
+    events = stream_analysis_events(dream_id, dream.content, generalist_output, model)
 
-        yield f"data: {json.dumps({'event': 'done'})}\n\n"
+    try:
+        resume = parse_event_id(last_event_id)
+        if resume and await run_exists(resume[0]):
+            await events.aclose()
+            run_id, after = resume
+        else:
+            run_id, _ = await start_run(dream_id, events)
+            after = "0-0"
+    except RedisError as e:
+        logger.warning(f"Run streams unavailable, streaming dream {dream_id} directly: {e}")
+        return sse_response(request, events)
 
-    return StreamingResponse(generate(), media_type="text/event-stream")
+    return stream_response(request, run_frames(run_id, after), headers={"X-Run-ID": run_id})
 
 
 @router.post("/dreams/{dream_id}/analyze", response_model=DreamRead)
@@ -239,24 +205,63 @@ async def analyze_dream(
 
 @router.get("/dreams", response_model=list[DreamRead])
 async def get_dreams(
+    request: Request,
     skip: Annotated[int, Query(ge=0)] = 0,
     limit: Annotated[int, Query(ge=1, le=100)] = 100,
     db: AsyncSession = Depends(get_db),
 ):
-    return await DreamService(db).get_all_dreams(skip=skip, limit=limit)
+    """List dreams. Supports If-None-Match / If-Modified-Since and is cached in Redis."""
+    key = await cache.list_key(skip, limit)
+    entry = await cache.get_cached(key)
+    if entry is None:
+        dreams = await DreamService(db).get_dream_rows(skip=skip, limit=limit)
+        entry = cache.CachedResponse(
+            body=dumps(dreams),
+            etag=compute_etag(dreams),
+            last_modified=compute_last_modified(dreams),
+        )
+        await cache.set_cached(key, entry)
+    return conditional_response(request, entry)
 
 
 @router.get("/dreams/{dream_id}", response_model=DreamRead)
 async def get_dream(
+    request: Request,
     dream_id: int,
     db: AsyncSession = Depends(get_db),
 ):
-    dream = await DreamService(db).get_dream_by_id(dream_id)
-    if not dream:
+    """Get one dream with its analyses. Supports conditional GET and is cached in Redis."""
+    key = await cache.dream_key(dream_id)
+    entry = await cache.get_cached(key)
+    if entry is None:
+        dream = await DreamService(db).get_dream_row(dream_id)
+        if not dream:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail=f"Dream {dream_id} not found"
+            )
+        entry = cache.CachedResponse(
+            body=dumps(dream),
+            etag=compute_etag([dream]),
+            last_modified=compute_last_modified([dream]),
+        )
+        await cache.set_cached(key, entry)
+    return conditional_response(request, entry)
+
+
+@router.get("/dreams/{dream_id}/timeline", response_model=Timeline)
+async def get_dream_timeline(dream_id: int, trace_id: str | None = None):
+    """Spans of the dream's latest pipeline run (or `trace_id`) with its critical path.
+
+    Needs the "json" tracing exporter (TRACING_EXPORTERS); spans show up a few seconds
+    after they end.
+    """
+    spans = await asyncio.to_thread(read_dream_spans, dream_id)
+    timeline = build_timeline(dream_id, spans, trace_id)
+    if timeline is None:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail=f"Dream {dream_id} not found"
+            status_code=status.HTTP_404_NOT_FOUND, detail=f"No traced runs for dream {dream_id}"
         )
-    return dream
+    return timeline
 
 
 @router.put("/dreams/{dream_id}", response_model=DreamRead)
@@ -304,28 +309,4 @@ async def get_similar_dreams(
             status_code=status.HTTP_404_NOT_FOUND, detail=f"Dream {dream_id} not found"
         )
 
-    result = await db.execute(text("SELECT embedding FROM dreams WHERE id = :id"), {"id": dream_id})
-    row = result.fetchone()
-    if not row or not row[0]:
-        return []
-
-    # Find similar dreams by cosine distance
-    query = text("""
-        SELECT id, content, 1 - (embedding <=> CAST(:target AS vector)) as similarity
-        FROM dreams
-        WHERE id != :dream_id AND embedding IS NOT NULL
-        ORDER BY embedding <=> CAST(:target AS vector)
-        LIMIT :limit
-    """)
-
-    result = await db.execute(query, {"target": row[0], "dream_id": dream_id, "limit": limit})
-    rows = result.fetchall()
-
-    return [
-        {
-            "id": r[0],
-            "content": r[1][:100] + ("..." if len(r[1]) > 100 else ""),
-            "similarity": round(float(r[2]) * 100),
-        }
-        for r in rows
-    ]
+    return await DreamService(db).get_similar_dreams(dream_id, limit=limit)
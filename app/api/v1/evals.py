@@ -0,0 +1,23 @@
+import asyncio
+from typing import Annotated
+
+from fastapi import APIRouter, HTTPException, Path, status
+
+from app.evals.report import list_reports, load_report
+from app.schemas.eval import EvalReport
+
+router = APIRouter()
+
+
+@router.get("", response_model=list[EvalReport])
+async def get_evals():
+    """Comparison tables of every eval run with `python -m app.cli.evals`, newest first."""
+    return await asyncio.to_thread(list_reports)
+
+
+@router.get("/{name}", response_model=EvalReport)
+async def get_eval(name: Annotated[str, Path(pattern=r"^[\w.-]+$")]):
+    report = await asyncio.to_thread(load_report, name)
+    if report is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Eval {name} not found")
+    return report
@@ -0,0 +1,58 @@
+from datetime import datetime
+from typing import Annotated
+
+from fastapi import APIRouter, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+
+from app.core.config import get_settings
+from app.core.database import AsyncSessionLocal
+from app.services.export_service import (
+    MEDIA_TYPES,
+    ExportFormat,
+    ExportService,
+    parquet_available,
+    serialize,
+)
+
+router = APIRouter()
+
+settings = get_settings()
+
+
+@router.get("/dreams")
+async def export_dreams(
+    format: ExportFormat = ExportFormat.NDJSON,
+    date_from: datetime | None = None,
+    date_to: datetime | None = None,
+    model_used: str | None = None,
+    after_id: Annotated[int, Query(ge=0)] = 0,
+):
+    """Stream every dream with its analyses and scores as NDJSON, CSV or Parquet.
+
+    Rows are read through a server-side cursor and written as they arrive, so memory
+    stays flat regardless of table size. Rows are ordered by dream id; to resume an
+    interrupted export pass the last fully received dream id as `after_id`.
+    """
+    if format == ExportFormat.PARQUET and not parquet_available():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Parquet export requires pyarrow (install the 'export' extra)",
+        )
+
+    async def generate():
+        async with AsyncSessionLocal() as db:
+            batches = ExportService(db).iter_batches(
+                batch_size=settings.export_batch_size,
+                date_from=date_from,
+                date_to=date_to,
+                model_used=model_used,
+                after_id=after_id,
+            )
+            async for chunk in serialize(batches, format):
+                yield chunk
+
+    return StreamingResponse(
+        generate(),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="dreams.{format.value}"'},
+    )
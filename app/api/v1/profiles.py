@@ -0,0 +1,38 @@
+import asyncio
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi.responses import FileResponse, HTMLResponse, PlainTextResponse
+
+from app.core import profiling
+from app.schemas.profile import ProfileFormat, ProfileInfo
+
+router = APIRouter()
+
+
+def require_admin(x_profile: Annotated[str | None, Header()] = None) -> None:
+    """Profiles expose code paths and timings; require the admin token."""
+    if not profiling.authorized(x_profile):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="X-Profile required")
+
+
+@router.get("", response_model=list[ProfileInfo], dependencies=[Depends(require_admin)])
+async def list_profiles(limit: Annotated[int, Query(ge=1, le=1000)] = 50):
+    """Recent request and pipeline profiles, newest first."""
+    return await asyncio.to_thread(profiling.list_profiles, limit)
+
+
+@router.get("/{profile_id}", dependencies=[Depends(require_admin)])
+async def get_profile(profile_id: str, raw: bool = False):
+    """pyinstrument profiles as HTML; cProfile ones as a text report (?raw=true: the .prof)."""
+    found = await asyncio.to_thread(profiling.get_profile, profile_id)
+    if found is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail=f"Profile {profile_id} not found"
+        )
+    info, path = found
+    if info.format == ProfileFormat.HTML:
+        return HTMLResponse(await asyncio.to_thread(path.read_text))
+    if raw:
+        return FileResponse(path, filename=path.name, media_type="application/octet-stream")
+    return PlainTextResponse(await asyncio.to_thread(profiling.pstats_report, path))
@@ -0,0 +1,37 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.agents.prompts import list_agents, list_variants
+from app.core.config import get_settings
+from app.core.database import get_db
+from app.schemas.prompt import ExperimentReport, PromptAgent
+from app.services.experiment_service import ExperimentService
+
+settings = get_settings()
+router = APIRouter()
+
+
+@router.get("", response_model=list[PromptAgent])
+async def get_prompts():
+    """Agents with prompt variant files or an experiment, and their traffic split."""
+    return [
+        PromptAgent(
+            agent=agent,
+            variants=list_variants(agent),
+            weights=settings.prompt_experiments.get(agent, {}),
+        )
+        for agent in list_agents()
+    ]
+
+
+@router.get("/report", response_model=ExperimentReport)
+async def get_prompt_report(
+    days: Annotated[int, Query(ge=1, le=365)] = 14,
+    agent: str | None = None,
+    model: str | None = None,
+    db: AsyncSession = Depends(get_db),
+):
+    """Score, tokens, TTFT and duration per agent and prompt variant."""
+    return await ExperimentService(db).report(days, agent=agent, model=model)
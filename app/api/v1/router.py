@@ -1,12 +1,21 @@
 from fastapi import APIRouter
 
-from app.api.v1 import dreams
+from app.api.v1 import dreams, evals, export, profiles, prompts, runs, transcriptions
+from app.core.config import get_settings
+
+settings = get_settings()
 
 api_router = APIRouter()
 
 api_router.include_router(dreams.router, tags=["dreams"])
+api_router.include_router(evals.router, prefix="/evals", tags=["evals"])
+api_router.include_router(export.router, prefix="/export", tags=["export"])
+if settings.profiling_enabled:
+    api_router.include_router(profiles.router, prefix="/profiles", tags=["profiles"])
+api_router.include_router(prompts.router, prefix="/prompts", tags=["prompts"])
+api_router.include_router(runs.router, prefix="/runs", tags=["runs"])
+api_router.include_router(transcriptions.router, prefix="/transcriptions", tags=["transcriptions"])
 
 # As we build more features, we'll add more routers:
-# from app.api.v1 import analysis, evals
+# from app.api.v1 import analysis
 # api_router.include_router(analysis.router, prefix="/analysis", tags=["analysis"])
-# api_router.include_router(evals.router, prefix="/evals", tags=["evals"])
@@ -0,0 +1,27 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Header, HTTPException, Request, status
+
+from app.core.sse import stream_response
+from app.workflows.run_streams import parse_event_id, run_exists, run_frames
+
+router = APIRouter()
+
+
+@router.get("/{run_id}/events")
+async def stream_run_events(
+    request: Request,
+    run_id: str,
+    last_event_id: Annotated[str | None, Header()] = None,
+):
+    """Watch a pipeline run (started by stream-analyze) from the start or from Last-Event-ID.
+
+    Any number of viewers can follow the same run; nothing is re-run. Runs stay
+    replayable for PIPELINE_STREAM_TTL seconds after they finish.
+    """
+    if not await run_exists(run_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Run {run_id} not found")
+
+    resume = parse_event_id(last_event_id)
+    after = resume[1] if resume and resume[0] == run_id else "0-0"
+    return stream_response(request, run_frames(run_id, after), headers={"X-Run-ID": run_id})
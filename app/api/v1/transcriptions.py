@@ -0,0 +1,81 @@
+import asyncio
+import contextlib
+import os
+import tempfile
+
+from fastapi import APIRouter, HTTPException, Request, status
+from redis.exceptions import RedisError
+
+from app.core.config import get_settings
+from app.schemas.transcription import TranscriptionJob
+from app.workflows.transcription_queue import get_job, submit_transcription, transcription_queue
+
+router = APIRouter()
+
+settings = get_settings()
+
+
+def _discard(path: str) -> None:
+    with contextlib.suppress(FileNotFoundError):
+        os.unlink(path)
+
+
+@router.post("", response_model=TranscriptionJob, status_code=status.HTTP_202_ACCEPTED)
+async def create_transcription(request: Request):
+    """Queue an audio file (raw request body: WAV, FLAC, OGG, MP3...) for transcription.
+
+    The body is streamed to disk, never held in memory. Poll GET /transcriptions/{id}
+    for status; `text` fills in chunk by chunk while the job runs. Jobs run on the worker
+    that accepted the upload: if it restarts, its unfinished jobs are reported as failed.
+    """
+    # File I/O runs in threads so a slow disk doesn't stall the event loop
+    fd, path = await asyncio.to_thread(tempfile.mkstemp, prefix="dreamscape-audio-")
+    size = 0
+    try:
+        f = await asyncio.to_thread(os.fdopen, fd, "wb")
+        try:
+            async for chunk in request.stream():
+                size += len(chunk)
+                if size > settings.transcription_max_bytes:
+                    raise HTTPException(
+                        status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+                        detail=f"Audio larger than {settings.transcription_max_bytes} bytes",
+                    )
+                await asyncio.to_thread(f.write, chunk)
+        finally:
+            await asyncio.to_thread(f.close)
+        if size == 0:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Empty body")
+
+        job_id = await submit_transcription(path)
+    except RedisError as e:
+        await asyncio.to_thread(_discard, path)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Transcription jobs are unavailable: {e}",
+        ) from e
+    except BaseException:
+        await asyncio.to_thread(_discard, path)
+        raise
+
+    return await get_job(job_id)
+
+
+@router.get("/{job_id}", response_model=TranscriptionJob)
+async def get_transcription(job_id: str):
+    """Status, progress and (partial) text of a transcription job."""
+    job = await get_job(job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail=f"Transcription {job_id} not found"
+        )
+    return job
+
+
+@router.get("")
+async def transcription_queue_status():
+    """Jobs waiting for a transcription worker on this API worker."""
+    return {
+        "queued": transcription_queue.depth,
+        "concurrency": transcription_queue.concurrency,
+    }
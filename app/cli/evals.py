@@ -0,0 +1,88 @@
+"""
+Run an offline eval: every dream × target × model × prompt variant in a spec, judged by
+RatingAgent, then print a comparison table (see app.evals.spec for the spec format).
+
+Finished cells are cached under EVALS_DIR/<name>/, so re-running an interrupted or
+extended eval only runs what is missing. The table is also saved as report.json there
+and served at GET /api/v1/evals/<name>.
+
+Usage:
+    uv run python -m app.cli.evals evals/small-models.json
+    uv run python -m app.cli.evals evals/small-models.json --limit 5 --fresh
+    uv run python -m app.cli.evals evals/small-models.json --report-only
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+from app.core.database import engine
+from app.db import base  # noqa: F401 - Import models for SQLAlchemy
+from app.evals.report import build_report, format_table, save_report
+from app.evals.runner import EvalRunner, load_cached
+from app.evals.spec import Cell, expand_cells, judge_model, load_spec
+from app.schemas.eval import CellResult
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run an eval spec and compare the results.")
+    parser.add_argument("spec", type=Path, help="Eval spec JSON")
+    parser.add_argument("--limit", type=int, help="Only the first N dreams of the dataset")
+    parser.add_argument("--fresh", action="store_true", help="Ignore cached cells")
+    parser.add_argument(
+        "--report-only", action="store_true", help="Build the table from cached cells only"
+    )
+    return parser.parse_args()
+
+
+def _limit(cells: list[Cell], dreams: int | None) -> list[Cell]:
+    if dreams is None:
+        return cells
+    keep = list(dict.fromkeys(cell.dream.id for cell in cells))[:dreams]
+    return [cell for cell in cells if cell.dream.id in keep]
+
+
+async def _run(args: argparse.Namespace) -> None:
+    spec = load_spec(args.spec)
+    cells = _limit(expand_cells(spec, args.spec), args.limit)
+
+    if args.report_only:
+        cached = [(cell, load_cached(spec.name, cell.key)) for cell in cells]
+        results = [
+            result.model_copy(update={"prompt": cell.prompt})
+            for cell, result in cached
+            if result is not None
+        ]
+        print(f"{len(results)}/{len(cells)} cells cached", file=sys.stderr)
+    else:
+        done = 0
+
+        def progress(cell: Cell, result: CellResult, cached: bool) -> None:
+            nonlocal done
+            done += 1
+            outcome = (
+                f"score {result.score} in {result.duration_ms / 1000:.1f}s"
+                if result.status == "ok"
+                else result.error
+            )
+            source = " (cached)" if cached else ""
+            print(
+                f"[{done}/{len(cells)}] {cell.target} {cell.model} {cell.prompt} "
+                f"dream {cell.dream.id} #{cell.repeat}: {outcome}{source}",
+                file=sys.stderr,
+            )
+
+        runner = EvalRunner(spec.name, concurrency=spec.concurrency, on_result=progress)
+        try:
+            results = await runner.run(cells, fresh=args.fresh)
+        finally:
+            await engine.dispose()
+
+    report = build_report(spec.name, judge_model(spec), results)
+    save_report(report)
+    print(format_table(report))
+
+
+if __name__ == "__main__":
+    asyncio.run(_run(_parse_args()))
@@ -0,0 +1,53 @@
+"""
+Export dreams, analyses and scores without going through the API.
+
+Usage:
+    uv run python -m app.cli.export --format csv --output dreams.csv
+    uv run python -m app.cli.export --model-used ollama/qwen2.5:7b --after-id 5000 > rest.ndjson
+"""
+
+import argparse
+import asyncio
+import sys
+from datetime import datetime
+
+from app.core.config import get_settings
+from app.core.database import AsyncSessionLocal, engine
+from app.db import base  # noqa: F401 - Import models for SQLAlchemy
+from app.services.export_service import ExportFormat, ExportService, serialize
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Stream dreams + analyses to a file.")
+    parser.add_argument("--format", type=ExportFormat, default=ExportFormat.NDJSON)
+    parser.add_argument("--output", "-o", help="Output file (defaults to stdout)")
+    parser.add_argument("--date-from", type=datetime.fromisoformat)
+    parser.add_argument("--date-to", type=datetime.fromisoformat)
+    parser.add_argument("--model-used")
+    parser.add_argument("--after-id", type=int, default=0, help="Resume after this dream id")
+    parser.add_argument("--batch-size", type=int, default=get_settings().export_batch_size)
+    return parser.parse_args()
+
+
+async def _run(args: argparse.Namespace) -> None:
+    out = open(args.output, "wb") if args.output else sys.stdout.buffer
+    try:
+        async with AsyncSessionLocal() as db:
+            batches = ExportService(db).iter_batches(
+                batch_size=args.batch_size,
+                date_from=args.date_from,
+                date_to=args.date_to,
+                model_used=args.model_used,
+                after_id=args.after_id,
+            )
+            async for chunk in serialize(batches, args.format):
+                out.write(chunk)
+    finally:
+        out.flush()
+        if args.output:
+            out.close()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(_run(_parse_args()))
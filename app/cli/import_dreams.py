@@ -0,0 +1,68 @@
+"""
+Bulk-import dreams from an NDJSON file (one {"content": ..., "dream_date": ...} per line).
+
+Usage:
+    uv run python -m app.cli.import_dreams journal.ndjson --embed
+    cat journal.ndjson | uv run python -m app.cli.import_dreams - --analyze
+"""
+
+import argparse
+import asyncio
+import sys
+
+from app.core.config import get_settings
+from app.core.database import AsyncSessionLocal, engine
+from app.core.models_config import DEFAULT_MODEL
+from app.core.task_queue import stop_all_queues
+from app.db import base  # noqa: F401 - Import models for SQLAlchemy
+from app.services.import_service import ImportService, iter_lines
+from app.workflows.analysis_queue import analysis_queue, enqueue_analysis
+
+READ_SIZE = 1 << 16
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Bulk-import dreams via COPY.")
+    parser.add_argument("path", help="NDJSON file, or - for stdin")
+    parser.add_argument("--embed", action="store_true", help="Compute content embeddings")
+    parser.add_argument("--analyze", action="store_true", help="Run the pipeline on each dream")
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--chunk-size", type=int, default=get_settings().import_chunk_size)
+    return parser.parse_args()
+
+
+async def _read_chunks(path: str):
+    stream = sys.stdin.buffer if path == "-" else open(path, "rb")
+    try:
+        while chunk := await asyncio.to_thread(stream.read, READ_SIZE):
+            yield chunk
+    finally:
+        if path != "-":
+            stream.close()
+
+
+async def _run(args: argparse.Namespace) -> None:
+    try:
+        async with AsyncSessionLocal() as db:
+            result = await ImportService(db).import_ndjson(
+                iter_lines(_read_chunks(args.path)), chunk_size=args.chunk_size, embed=args.embed
+            )
+        print(
+            f"Imported {result.imported} dreams, {result.failed} failed "
+            f"in {result.seconds}s ({result.rows_per_second} rows/s)"
+        )
+        for error in result.errors:
+            print(f"  line {error.line}: {error.error}", file=sys.stderr)
+
+        if args.analyze and result.dream_ids:
+            # No API process to hand the jobs to, so drain the queue before exiting
+            enqueue_analysis(result.dream_ids, model=args.model)
+            print(f"Analyzing {len(result.dream_ids)} dreams with {args.model}...")
+            await analysis_queue.join()
+    finally:
+        await stop_all_queues()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(_run(_parse_args()))
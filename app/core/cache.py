@@ -0,0 +1,107 @@
+"""
+Redis-backed cache for serialized dream responses.
+
+Keys carry a generation number instead of being deleted on write: invalidation bumps the
+generation, so a reader that loaded data just before a write can never store it under the
+key later readers will look up. Redis being unavailable only disables caching.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+
+from loguru import logger
+from redis.exceptions import RedisError
+
+from app.core.config import get_settings
+from app.core.redis import get_redis
+
+settings = get_settings()
+
+LIST_GENERATION_KEY = "cache:dreams:list:gen"
+
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    etag: str
+    last_modified: datetime | None = None
+
+
+def _dream_generation_key(dream_id: int) -> str:
+    return f"cache:dream:{dream_id}:gen"
+
+
+async def _generation(key: str) -> int:
+    value = await get_redis().get(key)
+    return int(value) if value else 0
+
+
+async def dream_key(dream_id: int) -> str | None:
+    """Cache key for one dream's detail response, or None if caching is unavailable."""
+    if not settings.response_cache_enabled:
+        return None
+    try:
+        generation = await _generation(_dream_generation_key(dream_id))
+    except RedisError as e:
+        logger.warning(f"Response cache unavailable: {e}")
+        return None
+    return f"cache:dream:{dream_id}:{generation}"
+
+
+async def list_key(skip: int, limit: int) -> str | None:
+    """Cache key for a page of the dream list, or None if caching is unavailable."""
+    if not settings.response_cache_enabled:
+        return None
+    try:
+        generation = await _generation(LIST_GENERATION_KEY)
+    except RedisError as e:
+        logger.warning(f"Response cache unavailable: {e}")
+        return None
+    return f"cache:dreams:list:{generation}:{skip}:{limit}"
+
+
+async def get_cached(key: str | None) -> CachedResponse | None:
+    if key is None:
+        return None
+    try:
+        data = await get_redis().hgetall(key)
+    except RedisError as e:
+        logger.warning(f"Response cache read failed: {e}")
+        return None
+    if not data:
+        return None
+    last_modified = data.get(b"last_modified")
+    return CachedResponse(
+        body=data[b"body"],
+        etag=data[b"etag"].decode(),
+        last_modified=datetime.fromisoformat(last_modified.decode()) if last_modified else None,
+    )
+
+
+async def set_cached(key: str | None, entry: CachedResponse) -> None:
+    if key is None:
+        return
+    mapping = {"body": entry.body, "etag": entry.etag}
+    if entry.last_modified:
+        mapping["last_modified"] = entry.last_modified.isoformat()
+    try:
+        async with get_redis().pipeline(transaction=True) as pipe:
+            pipe.hset(key, mapping=mapping)
+            pipe.expire(key, settings.response_cache_ttl)
+            await pipe.execute()
+    except RedisError as e:
+        logger.warning(f"Response cache write failed: {e}")
+
+
+async def invalidate_dream(dream_id: int | None = None) -> None:
+    """Invalidate one dream's detail response (if given) and every cached list page."""
+    if not settings.response_cache_enabled:
+        return
+    try:
+        async with get_redis().pipeline(transaction=True) as pipe:
+            if dream_id is not None:
+                pipe.incr(_dream_generation_key(dream_id))
+            pipe.incr(LIST_GENERATION_KEY)
+            await pipe.execute()
+    except RedisError as e:
+        logger.warning(f"Response cache invalidation failed for dream {dream_id}: {e}")
@@ -0,0 +1,155 @@
+"""
+Record and replay LLM traffic ("cassettes").
+
+LLM_CASSETTE_MODE=record wraps the real provider: every completed call is saved with
+its chunk boundaries, each chunk's offset from the request, and token usage.
+LLM_CASSETTE_MODE=replay serves those recordings instead of calling any provider,
+at the recorded pace divided by LLM_CASSETTE_SPEED (0 = no delays). A call with no
+recording fails with CassetteMissError, so an offline run can't silently go online.
+
+Cassettes are keyed by a hash of model, messages and temperature and stored as JSON
+under LLM_CASSETTE_DIR/<key[:2]>/<key>.json. Streamed and non-streamed calls share
+keys: either kind of recording replays for either kind of call.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from datetime import UTC, datetime
+from functools import lru_cache
+from pathlib import Path
+from types import SimpleNamespace
+
+from loguru import logger
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+
+class CassetteMissError(LookupError):
+    """Replay mode found no recording for a request."""
+
+
+def cassette_key(model: str, messages: list[dict], temperature: float | None) -> str:
+    payload = json.dumps([model, messages, temperature], sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def cassette_path(key: str) -> Path:
+    return Path(settings.llm_cassette_dir) / key[:2] / f"{key}.json"
+
+
+def _usage_dict(usage) -> dict | None:
+    if usage is None:
+        return None
+    return {
+        "prompt_tokens": getattr(usage, "prompt_tokens", 0) or 0,
+        "completion_tokens": getattr(usage, "completion_tokens", 0) or 0,
+    }
+
+
+def _write(key: str, cassette: dict) -> None:
+    path = cassette_path(key)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(cassette))
+    os.replace(tmp, path)  # Concurrent recorders of one key: last complete write wins
+
+
+async def _save(key: str, model: str, stream: bool, chunks: list, usage) -> None:
+    cassette = {
+        "key": key,
+        "model": model,
+        "stream": stream,
+        "recorded_at": datetime.now(UTC).isoformat(),
+        "chunks": chunks,  # [[ms since request, text], ...]
+        "usage": _usage_dict(usage),
+    }
+    try:
+        await asyncio.to_thread(_write, key, cassette)
+    except OSError as e:
+        logger.error(f"Saving cassette {key} failed: {e}")
+
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 3)
+
+
+def recording(acompletion):
+    """Wrap a provider's acompletion so completed calls are saved as cassettes."""
+
+    async def record(model: str, messages: list[dict], stream: bool = False, **kwargs):
+        key = cassette_key(model, messages, kwargs.get("temperature"))
+        started = time.perf_counter()
+        response = await acompletion(model=model, messages=messages, stream=stream, **kwargs)
+        if not stream:
+            content = response.choices[0].message.content or ""
+            chunks = [[_elapsed_ms(started), content]]
+            await _save(key, model, False, chunks, getattr(response, "usage", None))
+            return response
+
+        async def chunks_recorded():
+            chunks: list = []
+            usage = None
+            async for chunk in response:
+                if getattr(chunk, "usage", None):
+                    usage = chunk.usage
+                if chunk.choices and chunk.choices[0].delta.content:
+                    chunks.append([_elapsed_ms(started), chunk.choices[0].delta.content])
+                yield chunk
+            await _save(key, model, True, chunks, usage)
+
+        return chunks_recorded()
+
+    return record
+
+
+@lru_cache(maxsize=4096)
+def _load(key: str) -> dict | None:
+    path = cassette_path(key)
+    if not path.exists():
+        return None
+    return json.loads(path.read_text())
+
+
+def _usage(cassette: dict) -> SimpleNamespace | None:
+    return SimpleNamespace(**cassette["usage"]) if cassette.get("usage") else None
+
+
+def _delay(ms: float) -> float:
+    speed = settings.llm_cassette_speed
+    return ms / 1000 / speed if speed > 0 else 0.0
+
+
+async def replay(model: str, messages: list[dict], stream: bool = False, **kwargs):
+    """acompletion stand-in serving recorded responses at LLM_CASSETTE_SPEED."""
+    key = cassette_key(model, messages, kwargs.get("temperature"))
+    cassette = _load(key)
+    if cassette is None:
+        raise CassetteMissError(
+            f"No cassette for {model} ({key[:12]}) in {settings.llm_cassette_dir}"
+        )
+
+    chunks = cassette["chunks"]
+    if not stream:
+        if chunks:
+            await asyncio.sleep(_delay(chunks[-1][0]))
+        message = SimpleNamespace(content="".join(text for _, text in chunks))
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=_usage(cassette))
+
+    async def chunks_replayed():
+        started = time.perf_counter()
+        for offset_ms, text in chunks:
+            # Sleep to the chunk's scheduled time, so per-chunk overhead doesn't accumulate
+            wait = _delay(offset_ms) - (time.perf_counter() - started)
+            if wait > 0:
+                await asyncio.sleep(wait)
+            yield SimpleNamespace(
+                choices=[SimpleNamespace(delta=SimpleNamespace(content=text))], usage=None
+            )
+        yield SimpleNamespace(choices=[], usage=_usage(cassette))
+
+    return chunks_replayed()
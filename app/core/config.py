@@ -1,9 +1,25 @@
+from enum import StrEnum
 from functools import lru_cache
 
-from pydantic import PostgresDsn
+from pydantic import BaseModel, PostgresDsn
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
+class RoutingPolicy(StrEnum):
+    FIXED = "fixed"  # `model`, or the request's model if unset
+    CHEAPEST_ABOVE_SCORE = "cheapest_above_score"  # Cheapest candidate scoring >= min_score
+    FASTEST_P95 = "fastest_p95"  # Candidate with the lowest p95 duration
+
+
+class ModelRoute(BaseModel):
+    """How one agent's model is picked; see app.services.model_router."""
+
+    policy: RoutingPolicy = RoutingPolicy.FIXED
+    model: str | None = None
+    candidates: list[str] = []
+    min_score: float = 3.5
+
+
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
 
@@ -18,6 +34,8 @@ class Settings(BaseSettings):
     app_name: str = "Dreamscape"
     debug: bool = False
     environment: str = "development"  # development, staging, production
+    serve_ui: bool = True  # False = API only: no Gradio mount, no UI imports at startup
+    serve_workers: int = 0  # Workers for `python -m app.serve` (0 = one per CPU)
 
     # Database
     postgres_user: str = "dreamscape"
@@ -57,10 +75,123 @@ class Settings(BaseSettings):
     # Redis
     redis_host: str = "localhost"
     redis_port: int = 6379
+    response_cache_enabled: bool = True  # Cache serialized GET /dreams responses in Redis
+    response_cache_ttl: int = 300  # Seconds; entries are also invalidated on every write
 
     # AI Providers
     openrouter_api_key: str | None = None
     ollama_base_url: str = "http://localhost:11434"
+    ollama_keep_alive: str = "30m"  # How long Ollama keeps a model loaded after a request
+
+    # Offline stub provider for `stub/<name>` models (benchmarks, load tests). Per-model
+    # overrides in the name: stub/fast?ttft_ms=50&tps=400&jitter=0&failure_rate=0.1
+    stub_llm_enabled: bool = False  # Off = stub/ models are rejected (any client can name one)
+    stub_ttft_ms: float = 400
+    stub_tokens_per_second: float = 40
+    stub_jitter: float = 0.2  # ± fraction applied to TTFT and every token delay
+    stub_failure_rate: float = 0.0
+    stub_max_tokens: int = 300  # Replies are 50-100% of this long
+
+    # LLM cassettes: "record" saves every completed call (chunks, timing, usage), "replay"
+    # serves saved calls instead of any provider, at recorded pace / LLM_CASSETTE_SPEED
+    llm_cassette_mode: str = "off"  # off, record, replay
+    llm_cassette_dir: str = "cassettes"
+    llm_cassette_speed: float = 1.0  # 2 = twice as fast, 0 = no delays
+
+    # Speech-to-text
+    whisper_model: str = "openai/whisper-small"  # e.g. openai/whisper-base on small CPU hosts
+    whisper_quantize: bool = False  # int8 dynamic quantization of the linear layers (CPU)
+    whisper_chunk_seconds: float = 30  # Max chunk length after splitting on pauses
+    whisper_batch_size: int = 4  # Chunks per inference call; partial text after each
+    transcription_concurrency: int = 1  # Jobs transcribed at once per API worker
+    transcription_max_bytes: int = 50 * 1024 * 1024  # Max upload size for POST /transcriptions
+    transcription_job_ttl: int = 86400  # Seconds a job's status and text are kept
+    # Seconds between heartbeats of the worker holding jobs; 3 missed ones fail its jobs
+    transcription_heartbeat_seconds: int = 10
+
+    # Out-of-process model server for embeddings and Whisper (python -m app.model_server).
+    # Unset = models run inside each web worker.
+    model_server_socket: str | None = None  # e.g. /tmp/dreamscape-models.sock
+    model_server_timeout: float = 120  # Seconds per request, including queueing
+    model_server_max_batch: int = 64  # Max texts per batched embedding call
+    model_server_max_wait_ms: float = 5  # How long a batch waits for more requests
+
+    # Warmup at startup, in the background; GET /ready is 503 until it has finished.
+    # Components: llm (litellm import), embedding, whisper (UI only), ollama.
+    # Env: WARMUP='["llm", "embedding"]'
+    warmup: list[str] = ["llm", "embedding", "whisper", "ollama"]
+    warmup_optional: list[str] = ["ollama"]  # Failing these doesn't keep /ready at 503
+    warmup_retry_seconds: float = 5  # First retry delay of a failed component; doubles
+    warmup_retry_max_seconds: float = 300
+
+    # Tracing, one trace per pipeline run: "otlp" (OTEL_EXPORTER_OTLP_* env, `otlp` extra)
+    # and/or "json" (files under TRACING_JSON_DIR, read by GET /dreams/{id}/timeline).
+    # Env: TRACING_EXPORTERS='["json"]'
+    tracing_exporters: list[str] = []
+    tracing_json_dir: str = "traces"
+
+    # On-demand profiling of requests and run_dream_analysis (GET /api/v1/profiles).
+    # Requests are profiled when sent with `X-Profile: <PROFILING_ADMIN_TOKEN>`.
+    profiling_enabled: bool = False
+    profiling_admin_token: str | None = None  # Required when enabled; also guards the API
+    profiling_sample_rate: float = 0.0  # Fraction of requests and pipeline runs profiled anyway
+    profiling_interval_ms: float = 1  # pyinstrument sampling interval
+    profiling_dir: str = "profiles"
+    profiling_keep: int = 100  # Newest profiles kept on disk
+
+    # SSE token coalescing for streaming endpoints (both <= 0 sends one frame per token)
+    sse_flush_interval_ms: int = 50
+    sse_flush_max_bytes: int = 2048
+    sse_gzip: bool = False  # Gzip SSE streams for clients sending Accept-Encoding: gzip
+    sse_keepalive_seconds: int = 15  # Comment frame on idle streams (e.g. while judging)
+
+    # Pipeline runs published to Redis Streams
+    pipeline_stream_ttl: int = 3600  # Seconds a finished run stays replayable
+    pipeline_run_timeout: int = 1800  # Max seconds a dream stays locked to one active run
+    # The publishing worker refreshes an owner key this often; a run whose key lapsed
+    # (3 missed beats, e.g. the worker died) is orphaned: readers end, new requests replace it
+    pipeline_run_heartbeat_seconds: int = 10
+
+    # Gradio UI
+    ui_api_base_url: str | None = None  # e.g. http://api:8000/api/v1; unset = call in-process
+    ui_concurrency_limit: int | None = 32  # Concurrent analyses per worker (None = unlimited)
+    ui_max_fps: float = 10  # Max output frames per second while streaming (0 = every event)
+
+    # Per-agent model routing, by agent name (generalist, symbol_specialist, rating_agent,
+    # ...). Agents without a route use the request's model. History-based policies read
+    # the analyses of the last MODEL_ROUTER_WINDOW_DAYS and fall back to the request's
+    # model when no candidate has MODEL_ROUTER_MIN_SAMPLES runs. Env: MODEL_ROUTES=
+    # '{"rating_agent": {"model": "ollama/qwen2.5:7b"}, "synthesizer": {"policy":
+    # "cheapest_above_score", "candidates": ["ollama/qwen2.5:7b", "openrouter/..."]}}'
+    model_routes: dict[str, ModelRoute] = {}
+    model_router_window_days: int = 14
+    model_router_min_samples: int = 10
+    # Share of requests sent to a random candidate with fewer than MIN_SAMPLES runs, so
+    # new candidates build history; 0 = seed them yourself (e.g. with evals)
+    model_router_explore_rate: float = 0.05
+    model_router_refresh_seconds: float = 60  # How long history stats are cached per worker
+    model_costs: dict[str, tuple[float, float]] = {}  # Overrides MODEL_COSTS (models_config)
+
+    # Prompt A/B tests: variants are PROMPTS_DIR/<agent>/<variant>.txt plus "default" (the
+    # agent's SYSTEM_PROMPT); each dream gets one per agent, by weight, from a hash of its
+    # id. Env: PROMPT_EXPERIMENTS='{"symbol_specialist": {"default": 1, "terse-v1": 1}}'
+    prompts_dir: str = "prompts"
+    prompt_experiments: dict[str, dict[str, float]] = {}
+
+    # Offline evals (python -m app.cli.evals <spec.json>): cell cache and report per eval
+    evals_dir: str = "eval_results"
+    eval_judge_model: str | None = None  # Judge for every cell; unset = DEFAULT_MODEL
+    # Cells run at once per provider (model prefix before the first "/"), e.g. local Ollama
+    # serves one request at a time. Env: EVAL_CONCURRENCY='{"ollama": 1}'
+    eval_concurrency: dict[str, int] = {"ollama": 1, "openrouter": 8, "stub": 32}
+    eval_default_concurrency: int = 4  # Providers not listed above
+
+    # Export
+    export_batch_size: int = 1000  # Rows per server-side cursor fetch
+
+    # Import / background analysis
+    import_chunk_size: int = 1000  # Rows per COPY + commit
+    analysis_queue_concurrency: int = 2  # Pipelines run at once for queued (imported) dreams
 
 
 @lru_cache
@@ -0,0 +1,57 @@
+"""
+Framing for the model server's Unix socket protocol.
+
+A frame is a JSON header plus an optional binary body (raw float32 arrays, so vectors
+and audio don't go through JSON):
+
+    [4-byte header length][4-byte body length][header JSON][body]
+
+Lengths are unsigned big-endian. Blocking helpers are for the web-side clients, async
+ones for the server.
+"""
+
+import asyncio
+import socket
+import struct
+
+import orjson
+
+_PREFIX = struct.Struct(">II")
+
+
+def encode_frame(header: dict, body: bytes = b"") -> bytes:
+    head = orjson.dumps(header)
+    return _PREFIX.pack(len(head), len(body)) + head + body
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> bytes:
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        n = sock.recv_into(view[received:])
+        if n == 0:
+            raise ConnectionError("model server closed the connection")
+        received += n
+    return bytes(buffer)
+
+
+def send_frame(sock: socket.socket, header: dict, body: bytes = b"") -> None:
+    sock.sendall(encode_frame(header, body))
+
+
+def recv_frame(sock: socket.socket) -> tuple[dict, bytes]:
+    head_len, body_len = _PREFIX.unpack(_recv_exactly(sock, _PREFIX.size))
+    header = orjson.loads(_recv_exactly(sock, head_len))
+    return header, _recv_exactly(sock, body_len) if body_len else b""
+
+
+async def read_frame(reader: asyncio.StreamReader) -> tuple[dict, bytes]:
+    head_len, body_len = _PREFIX.unpack(await reader.readexactly(_PREFIX.size))
+    header = orjson.loads(await reader.readexactly(head_len))
+    return header, await reader.readexactly(body_len) if body_len else b""
+
+
+async def write_frame(writer: asyncio.StreamWriter, header: dict, body: bytes = b"") -> None:
+    writer.write(encode_frame(header, body))
+    await writer.drain()
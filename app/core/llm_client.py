@@ -1,14 +1,41 @@
 import os
+from types import ModuleType
+from typing import TYPE_CHECKING
 
-import litellm
-from litellm import CustomStreamWrapper, ModelResponse
 from loguru import logger
 
+from app.core import cassettes, stub_llm
 from app.core.config import get_settings
+from app.core.metrics import LLMCall, track_llm_call
+from app.core.tracing import in_own_task, span
+
+if TYPE_CHECKING:
+    from litellm import CustomStreamWrapper, ModelResponse
 
 settings = get_settings()
 
-litellm.drop_params = True  # Ignore unsupported params per model
+_litellm: ModuleType | None = None
+
+
+def get_litellm() -> ModuleType:
+    """Import and configure litellm on first use; it takes seconds to import."""
+    global _litellm
+    if _litellm is None:
+        import litellm
+
+        litellm.drop_params = True  # Ignore unsupported params per model
+        _litellm = litellm
+    return _litellm
+
+
+def _acompletion(model: str):
+    """litellm's acompletion (or the offline stub for `stub/` models), per cassette mode."""
+    if settings.llm_cassette_mode == "replay":
+        return cassettes.replay
+    acompletion = stub_llm.acompletion if stub_llm.is_stub(model) else get_litellm().acompletion
+    if settings.llm_cassette_mode == "record":
+        return cassettes.recording(acompletion)
+    return acompletion
 
 
 def _build_messages(prompt: str, system: str | None) -> list[dict]:
@@ -26,31 +53,59 @@ def _configure_provider(model: str) -> None:
         os.environ["OLLAMA_API_BASE"] = settings.ollama_base_url
 
 
+def _span_attributes(model: str, agent: str) -> dict:
+    return {"gen_ai.request.model": model, "gen_ai.agent.name": agent}
+
+
+def _record_usage(current, call: LLMCall) -> None:
+    current.set_attribute("gen_ai.usage.input_tokens", call.prompt_tokens)
+    current.set_attribute("gen_ai.usage.output_tokens", call.completion_tokens)
+    if call.first_token_at is not None:
+        current.set_attribute("llm.ttft_ms", round((call.first_token_at - call.started) * 1000, 1))
+
+
+def _provider_kwargs(model: str) -> dict:
+    if model.startswith("ollama/"):
+        # Every Ollama request resets the model's unload timer to the value it carries
+        return {"keep_alive": settings.ollama_keep_alive}
+    return {}
+
+
 async def generate(
     model: str,
     prompt: str,
     system: str | None = None,
     temperature: float = 0.7,
+    agent: str = "unknown",
 ) -> str:
-    """Generate text from any supported model."""
+    """Generate text from any supported model. `agent` labels the call's metrics and span."""
     _configure_provider(model)
     messages = _build_messages(prompt, system)
 
     logger.info(f"LLM call: {model}")
 
-    response: ModelResponse = await litellm.acompletion(  # type: ignore[assignment]
-        model=model,
-        messages=messages,
-        temperature=temperature,
-    )
+    with (
+        span("llm.generate", **_span_attributes(model, agent)) as current,
+        track_llm_call(model, agent, "call") as call,
+    ):
+        response: ModelResponse = await _acompletion(model)(  # type: ignore[assignment]
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            **_provider_kwargs(model),
+        )
+        call.usage(getattr(response, "usage", None))
+        _record_usage(current, call)
     return response.choices[0].message.content or ""  # type: ignore[union-attr]
 
 
+@in_own_task
 async def generate_stream(
     model: str,
     prompt: str,
     system: str | None = None,
     temperature: float = 0.7,
+    agent: str = "unknown",
 ):
     """Generate text from any supported model with streaming."""
     _configure_provider(model)
@@ -58,14 +113,33 @@ async def generate_stream(
 
     logger.info(f"LLM stream: {model}")
 
-    response: CustomStreamWrapper = await litellm.acompletion(  # type: ignore[assignment]
-        model=model,
-        messages=messages,
-        temperature=temperature,
-        stream=True,
-    )
-
-    async for chunk in response:
-        content = chunk.choices[0].delta.content  # type: ignore[union-attr]
-        if content:
-            yield content
+    with (
+        span("llm.stream", **_span_attributes(model, agent)) as current,
+        track_llm_call(model, agent, "stream") as call,
+    ):
+        response: CustomStreamWrapper = await _acompletion(model)(  # type: ignore[assignment]
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            stream=True,
+            # Final chunk carries token usage (dropped for providers without it)
+            stream_options={"include_usage": True},
+            **_provider_kwargs(model),
+        )
+
+        chunks = 0
+        async for chunk in response:
+            if getattr(chunk, "usage", None):
+                call.usage(chunk.usage)  # type: ignore[union-attr]
+            if not chunk.choices:
+                continue
+            content = chunk.choices[0].delta.content  # type: ignore[union-attr]
+            if content:
+                if call.first_token_at is None:
+                    call.first_token()
+                    current.add_event("first_token")
+                chunks += 1
+                yield content
+        if not call.completion_tokens:
+            call.completion_tokens = chunks  # ~one token per chunk without provider usage
+        _record_usage(current, call)
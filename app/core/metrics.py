@@ -0,0 +1,311 @@
+"""
+Prometheus metrics, served at /metrics.
+
+Hot paths record into the module-level metrics below: LLM calls (latency, time to first
+token, tokens/sec, in-flight), workflow nodes, analysis writes, embedding batches,
+open SSE streams and event loop lag. Values that already live somewhere (SQLAlchemy
+pool, queue depths) are read at scrape time by `RuntimeCollector` instead of being
+mirrored.
+
+With several workers (`python -m app.serve --workers N`) every worker has its own
+registry; set PROMETHEUS_MULTIPROC_DIR to an empty directory before starting and
+/metrics aggregates all of them (pool and queue gauges stay per scraped worker).
+"""
+
+import asyncio
+import functools
+import os
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.registry import Collector
+
+# LLM calls run from under a second (judge on a small model) to minutes (synthesis)
+_LLM_BUCKETS = (0.25, 0.5, 1, 2, 4, 8, 15, 30, 60, 120, 300)
+_TTFT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2, 4, 8, 15, 30)
+_TPS_BUCKETS = (1, 5, 10, 20, 40, 80, 160, 320)
+_DB_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+_BATCH_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+LLM_LATENCY = Histogram(
+    "dreamscape_llm_request_seconds",
+    "LLM call duration, request to last token.",
+    ["model", "agent", "mode", "outcome"],
+    buckets=_LLM_BUCKETS,
+)
+LLM_TTFT = Histogram(
+    "dreamscape_llm_time_to_first_token_seconds",
+    "Time from request to the first streamed token.",
+    ["model", "agent"],
+    buckets=_TTFT_BUCKETS,
+)
+LLM_TOKENS_PER_SECOND = Histogram(
+    "dreamscape_llm_tokens_per_second",
+    "Completion tokens per second of generation (after the first token when streaming).",
+    ["model", "agent"],
+    buckets=_TPS_BUCKETS,
+)
+LLM_TOKENS = Counter(
+    "dreamscape_llm_tokens",
+    "Tokens processed by LLM calls.",
+    ["model", "agent", "kind"],
+)
+LLM_IN_FLIGHT = Gauge(
+    "dreamscape_llm_in_flight",
+    "LLM calls currently waiting on the provider.",
+    ["model"],
+    multiprocess_mode="livesum",
+)
+
+NODE_LATENCY = Histogram(
+    "dreamscape_workflow_node_seconds",
+    "Dream analysis workflow node duration, including its database writes.",
+    ["node", "outcome"],
+    buckets=_LLM_BUCKETS,
+)
+DB_WRITE_LATENCY = Histogram(
+    "dreamscape_db_write_seconds",
+    "AnalysisService write duration (commit and cache invalidation).",
+    ["operation"],
+    buckets=_DB_BUCKETS,
+)
+DB_POOL_CHECKOUTS = Counter(
+    "dreamscape_db_pool_checkouts",
+    "Connections checked out of the SQLAlchemy pool.",
+)
+
+EMBEDDING_BATCH_SIZE = Histogram(
+    "dreamscape_embedding_batch_size",
+    "Texts per embedding call.",
+    ["backend"],
+    buckets=_BATCH_BUCKETS,
+)
+
+STREAMS = Counter(
+    "dreamscape_streams",
+    "Streaming responses started.",
+    ["route"],
+)
+STREAMS_OPEN = Gauge(
+    "dreamscape_streams_open",
+    "Streaming responses currently open.",
+    ["route"],
+    multiprocess_mode="livesum",
+)
+
+EVENT_LOOP_LAG = Histogram(
+    "dreamscape_event_loop_lag_seconds",
+    "How late a periodic timer fires on the event loop (time blocked by other work).",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+
+
+async def monitor_event_loop_lag(interval: float = 0.1) -> None:
+    """Record event loop lag every `interval` seconds until cancelled."""
+    loop = asyncio.get_running_loop()
+    while True:
+        started = loop.time()
+        await asyncio.sleep(interval)
+        EVENT_LOOP_LAG.observe(max(0.0, loop.time() - started - interval))
+
+
+def _outcome(exc: BaseException | None) -> str:
+    if exc is None:
+        return "ok"
+    return "error" if isinstance(exc, Exception) else "cancelled"
+
+
+class LLMCall:
+    """Timing of one LLM call; see `track_llm_call`."""
+
+    def __init__(self, model: str, agent: str, mode: str):
+        self.model = model
+        self.agent = agent
+        self.mode = mode
+        self.started = time.perf_counter()
+        self.first_token_at: float | None = None
+        self.ended: float | None = None
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+    def first_token(self) -> None:
+        if self.first_token_at is None:
+            self.first_token_at = time.perf_counter()
+            LLM_TTFT.labels(self.model, self.agent).observe(self.first_token_at - self.started)
+
+    def usage(self, usage) -> None:
+        """Record a provider `usage` object (prompt_tokens / completion_tokens), if any."""
+        if usage is None:
+            return
+        self.prompt_tokens = getattr(usage, "prompt_tokens", 0) or 0
+        self.completion_tokens = getattr(usage, "completion_tokens", 0) or 0
+
+    def finish(self, exc: BaseException | None) -> None:
+        self.ended = ended = time.perf_counter()
+        LLM_LATENCY.labels(self.model, self.agent, self.mode, _outcome(exc)).observe(
+            ended - self.started
+        )
+        if self.prompt_tokens:
+            LLM_TOKENS.labels(self.model, self.agent, "prompt").inc(self.prompt_tokens)
+        if self.completion_tokens:
+            LLM_TOKENS.labels(self.model, self.agent, "completion").inc(self.completion_tokens)
+            generating = ended - (self.first_token_at or self.started)
+            if exc is None and generating > 0:
+                LLM_TOKENS_PER_SECOND.labels(self.model, self.agent).observe(
+                    self.completion_tokens / generating
+                )
+
+
+# Every open collect_llm_calls block's list; nested blocks all see a call
+_collected_calls: ContextVar[tuple[list[LLMCall], ...]] = ContextVar("collected_calls", default=())
+
+
+@contextmanager
+def collect_llm_calls() -> Iterator[list[LLMCall]]:
+    """Collect every LLM call made in the block, including in tasks it starts (evals,
+    per-analysis token counts)."""
+    calls: list[LLMCall] = []
+    token = _collected_calls.set((*_collected_calls.get(), calls))
+    try:
+        yield calls
+    finally:
+        _collected_calls.reset(token)
+
+
+@contextmanager
+def track_llm_call(model: str, agent: str, mode: str) -> Iterator[LLMCall]:
+    """Count an LLM call as in flight and record its latency, TTFT and token rate."""
+    call = LLMCall(model, agent, mode)
+    for collected in _collected_calls.get():
+        collected.append(call)
+    in_flight = LLM_IN_FLIGHT.labels(model)
+    in_flight.inc()
+    try:
+        yield call
+    except BaseException as e:
+        call.finish(e)
+        raise
+    else:
+        call.finish(None)
+    finally:
+        in_flight.dec()
+
+
+@contextmanager
+def track_node(node: str) -> Iterator[None]:
+    started = time.perf_counter()
+    exc: BaseException | None = None
+    try:
+        yield
+    except BaseException as e:
+        exc = e
+        raise
+    finally:
+        NODE_LATENCY.labels(node, _outcome(exc)).observe(time.perf_counter() - started)
+
+
+def timed_node[**P, R](
+    name: str,
+) -> Callable[[Callable[P, Awaitable[R]]], Callable[P, Awaitable[R]]]:
+    """Decorate an async workflow node to record its duration under `name`."""
+
+    def decorator(fn: Callable[P, Awaitable[R]]) -> Callable[P, Awaitable[R]]:
+        @functools.wraps(fn)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            with track_node(name):
+                return await fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+async def track_stream(route: str, chunks: AsyncIterator) -> AsyncIterator:
+    """Pass a response body through, counting it as an open stream while it is sent."""
+    STREAMS.labels(route).inc()
+    open_streams = STREAMS_OPEN.labels(route)
+    open_streams.inc()
+    try:
+        async for chunk in chunks:
+            yield chunk
+    finally:
+        open_streams.dec()
+
+
+class RuntimeCollector(Collector):
+    """SQLAlchemy pool and background queue gauges, read when Prometheus scrapes."""
+
+    def collect(self):
+        from app.core.database import engine
+        from app.core.task_queue import all_queues
+
+        pool = engine.pool
+        pool_gauges = {
+            "size": "Configured pool size.",
+            "checkedout": "Connections currently checked out.",
+            "overflow": "Connections open beyond pool_size (negative while below it).",
+        }
+        for stat, doc in pool_gauges.items():
+            family = GaugeMetricFamily(f"dreamscape_db_pool_{stat}", doc)
+            family.add_metric([], getattr(pool, stat)())
+            yield family
+
+        depth = GaugeMetricFamily(
+            "dreamscape_queue_depth", "Jobs waiting in a background queue.", labels=["queue"]
+        )
+        workers = GaugeMetricFamily(
+            "dreamscape_queue_concurrency", "Workers of a background queue.", labels=["queue"]
+        )
+        for queue in all_queues():
+            depth.add_metric([queue.name], queue.depth)
+            workers.add_metric([queue.name], queue.concurrency)
+        yield depth
+        yield workers
+
+
+_runtime = RuntimeCollector()
+REGISTRY.register(_runtime)
+
+
+def _count_checkout(*_) -> None:
+    DB_POOL_CHECKOUTS.inc()
+
+
+def instrument_engine(engine) -> None:
+    """Count pool checkouts on an (async) engine."""
+    from sqlalchemy import event
+
+    event.listen(getattr(engine, "sync_engine", engine), "checkout", _count_checkout)
+
+
+def multiprocess_enabled() -> bool:
+    return bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+
+def render() -> tuple[bytes, str]:
+    """Exposition body and content type for /metrics."""
+    if not multiprocess_enabled():
+        return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    registry.register(_runtime)
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_worker_dead(pid: int) -> None:
+    """Drop a dead worker's live gauges (in-flight calls, open streams) in multiprocess mode."""
+    if multiprocess_enabled():
+        multiprocess.mark_process_dead(pid)
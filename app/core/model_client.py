@@ -0,0 +1,74 @@
+"""
+Blocking client for the out-of-process model server (`python -m app.model_server`).
+
+Used by app.ui.embeddings and app.ui.whisper when MODEL_SERVER_SOCKET is set. Callers
+already run inference off the event loop (threads), so the client is plain blocking
+socket I/O with one persistent connection per thread.
+"""
+
+import socket
+import threading
+
+import numpy as np
+
+from app.core.config import get_settings
+from app.core.ipc import recv_frame, send_frame
+
+settings = get_settings()
+
+_local = threading.local()
+
+
+class ModelServerError(RuntimeError):
+    """The model server answered with an error."""
+
+
+def _connect() -> socket.socket:
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(settings.model_server_timeout)
+    sock.connect(str(settings.model_server_socket))
+    return sock
+
+
+# A restarted server: the cached connection is dead, or the socket is briefly missing.
+# BrokenPipeError is a ConnectionError; a timeout is not retried, the request was too slow
+_RECONNECT_ERRORS = (ConnectionError, FileNotFoundError)
+
+
+def _call(header: dict, body: bytes = b"") -> tuple[dict, bytes]:
+    # Retry once on a fresh connection: the cached one may predate a server restart
+    for attempt in range(2):
+        sock = getattr(_local, "sock", None)
+        try:
+            if sock is None:
+                sock = _local.sock = _connect()
+            send_frame(sock, header, body)
+            response, payload = recv_frame(sock)
+            break
+        except OSError as e:
+            # Whatever failed, the connection may be mid-frame: never reuse it
+            if sock is not None:
+                sock.close()
+            _local.sock = None
+            if attempt or not isinstance(e, _RECONNECT_ERRORS):
+                raise
+    if "error" in response:
+        raise ModelServerError(response["error"])
+    return response, payload
+
+
+def embed(texts: list[str]) -> np.ndarray:
+    """Embed non-blank texts; returns a float32 array of shape (len(texts), dimensions)."""
+    response, payload = _call({"op": "embed", "texts": texts})
+    return np.frombuffer(payload, dtype=np.float32).reshape(response["shape"])
+
+
+def transcribe(sample_rate: int, audio: np.ndarray) -> str:
+    """Transcribe mono float32 audio in [-1, 1]."""
+    body = np.ascontiguousarray(audio, dtype=np.float32).tobytes()
+    response, _ = _call({"op": "transcribe", "sampling_rate": sample_rate}, body)
+    return response["text"]
+
+
+def ping() -> dict:
+    return _call({"op": "ping"})[0]
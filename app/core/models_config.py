@@ -22,3 +22,13 @@ MODEL_ESCALATION: dict[str, str] = {
     "openrouter/anthropic/claude-haiku-4.5":    "openrouter/anthropic/claude-sonnet-4.5",
     # claude-sonnet-4.5 and gpt-5.2 are top of chain
 }
+
+# USD per 1M (input, output) tokens, OpenRouter list prices; used by the model router's
+# cheapest_above_score policy. Local providers (ollama/, stub/) count as free.
+MODEL_COSTS: dict[str, tuple[float, float]] = {
+    "openrouter/openai/gpt-5-nano":             (0.05, 0.40),
+    "openrouter/openai/gpt-5.2":                (1.75, 14.00),
+    "openrouter/anthropic/claude-haiku-4.5":    (1.00, 5.00),
+    "openrouter/anthropic/claude-sonnet-4.5":   (3.00, 15.00),
+    "openrouter/google/gemini-3-flash-preview": (0.50, 3.00),
+}
@@ -0,0 +1,220 @@
+"""
+Opt-in profiling of requests and pipeline runs.
+
+With PROFILING_ENABLED, `ProfilingMiddleware` profiles a request when it carries
+`X-Profile: <PROFILING_ADMIN_TOKEN>` or is picked by PROFILING_SAMPLE_RATE, and
+`maybe_profile` does the same for `run_dream_analysis` (sampling only). Streaming
+responses are profiled until their last chunk is sent.
+
+pyinstrument (the `profiling` extra) is used when installed: it samples and, in async
+mode, attributes only the profiled task's time. Otherwise cProfile runs, which
+sees everything on the event loop thread while it is on. Either way one profile runs
+per worker at a time; requests arriving meanwhile are simply not profiled. Inference
+in worker threads (embeddings, Whisper) is not captured.
+
+Profiles go to PROFILING_DIR (newest PROFILING_KEEP kept) and are listed at
+GET /api/v1/profiles, which is only mounted with PROFILING_ENABLED. Access fails closed:
+without PROFILING_ADMIN_TOKEN no header is accepted, and the app refuses to start.
+"""
+
+import asyncio
+import contextlib
+import cProfile
+import pstats
+import random
+import re
+import secrets
+import threading
+import time
+import uuid
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime
+from io import StringIO
+from pathlib import Path
+
+from loguru import logger
+
+from app.core.config import get_settings
+from app.schemas.profile import ProfileFormat, ProfileInfo
+
+settings = get_settings()
+
+PROFILE_HEADER = "x-profile"
+PROFILE_ID_HEADER = "x-profile-id"
+
+_PROFILE_ID = re.compile(r"^\d{13}-[0-9a-f]{8}$")
+_lock = threading.Lock()
+
+
+def _profile_dir() -> Path:
+    return Path(settings.profiling_dir)
+
+
+def authorized(token: str | None) -> bool:
+    """Whether a request's X-Profile value grants access (never without an admin token)."""
+    expected = settings.profiling_admin_token
+    if not expected or token is None:
+        return False
+    return secrets.compare_digest(token.encode(), expected.encode())
+
+
+def sampled() -> bool:
+    return settings.profiling_sample_rate > 0 and random.random() < settings.profiling_sample_rate
+
+
+class _Profiler:
+    """pyinstrument if installed, else cProfile."""
+
+    def __init__(self):
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            self.format = ProfileFormat.PSTATS
+            self._profiler = cProfile.Profile()
+        else:
+            self.format = ProfileFormat.HTML
+            self._profiler = Profiler(
+                interval=settings.profiling_interval_ms / 1000, async_mode="enabled"
+            )
+
+    def start(self) -> None:
+        if self.format == ProfileFormat.HTML:
+            self._profiler.start()
+        else:
+            self._profiler.enable()
+
+    def stop(self) -> None:
+        if self.format == ProfileFormat.HTML:
+            self._profiler.stop()
+        else:
+            self._profiler.disable()
+
+    def save(self, path: Path) -> None:
+        if self.format == ProfileFormat.HTML:
+            path.write_text(self._profiler.output_html())
+        else:
+            self._profiler.dump_stats(path)
+
+
+def _artifact(profile_id: str, fmt: ProfileFormat) -> Path:
+    return _profile_dir() / f"{profile_id}.{fmt.value}"
+
+
+def _save(profiler: _Profiler, info: ProfileInfo) -> None:
+    directory = _profile_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    profiler.save(_artifact(info.id, info.format))
+    (directory / f"{info.id}.json").write_text(info.model_dump_json())
+
+    # Ids start with a millisecond timestamp, so name order is age order
+    sidecars = sorted(directory.glob("*.json"))
+    for stale in sidecars[: max(len(sidecars) - settings.profiling_keep, 0)]:
+        stale_id = stale.stem
+        for fmt in ProfileFormat:
+            _artifact(stale_id, fmt).unlink(missing_ok=True)
+        stale.unlink(missing_ok=True)
+
+
+@asynccontextmanager
+async def profile(kind: str, target: str) -> AsyncIterator[str | None]:
+    """Profile the block; yields the profile id, or None if another profile is running."""
+    if not _lock.acquire(blocking=False):
+        yield None
+        return
+    try:
+        profiler = _Profiler()
+        profile_id = f"{time.time_ns() // 1_000_000}-{uuid.uuid4().hex[:8]}"
+        started_at = datetime.now(UTC)
+        started = time.perf_counter()
+        try:
+            profiler.start()
+        except ValueError as e:  # cProfile: another profiler (e.g. coverage) is active
+            logger.warning(f"Profiling {kind} {target} skipped: {e}")
+            yield None
+            return
+        try:
+            yield profile_id
+        finally:
+            profiler.stop()
+            info = ProfileInfo(
+                id=profile_id,
+                kind=kind,
+                target=target,
+                started_at=started_at,
+                duration_ms=round((time.perf_counter() - started) * 1000, 1),
+                format=profiler.format,
+            )
+            try:
+                await asyncio.to_thread(_save, profiler, info)
+                logger.info(f"Profiled {kind} {target} in {info.duration_ms} ms: {profile_id}")
+            except OSError as e:
+                logger.error(f"Saving profile {profile_id} failed: {e}")
+    finally:
+        _lock.release()
+
+
+def maybe_profile(kind: str, target: str):
+    """`profile` if profiling is enabled and this call is sampled, else a no-op."""
+    if settings.profiling_enabled and sampled():
+        return profile(kind, target)
+    return contextlib.nullcontext()
+
+
+class ProfilingMiddleware:
+    """ASGI middleware profiling requests asked for by header or picked by sampling."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith("/api/v1/profiles"):
+            await self.app(scope, receive, send)
+            return
+
+        token = next(
+            (value.decode() for name, value in scope["headers"] if name == PROFILE_HEADER.encode()),
+            None,
+        )
+        if not (authorized(token) or sampled()):
+            await self.app(scope, receive, send)
+            return
+
+        async with profile("request", f"{scope['method']} {scope['path']}") as profile_id:
+            if profile_id is None:
+                await self.app(scope, receive, send)
+                return
+
+            async def send_with_id(message):
+                if message["type"] == "http.response.start":
+                    headers = list(message.get("headers", []))
+                    headers.append((PROFILE_ID_HEADER.encode(), profile_id.encode()))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            await self.app(scope, receive, send_with_id)
+
+
+def list_profiles(limit: int) -> list[ProfileInfo]:
+    directory = _profile_dir()
+    if not directory.exists():
+        return []
+    sidecars = sorted(directory.glob("*.json"), reverse=True)[:limit]
+    return [ProfileInfo.model_validate_json(path.read_text()) for path in sidecars]
+
+
+def get_profile(profile_id: str) -> tuple[ProfileInfo, Path] | None:
+    if not _PROFILE_ID.match(profile_id):
+        return None
+    sidecar = _profile_dir() / f"{profile_id}.json"
+    if not sidecar.exists():
+        return None
+    info = ProfileInfo.model_validate_json(sidecar.read_text())
+    return info, _artifact(profile_id, info.format)
+
+
+def pstats_report(path: Path, limit: int = 60) -> str:
+    """Top functions by cumulative time, as text."""
+    out = StringIO()
+    pstats.Stats(str(path), stream=out).sort_stats("cumulative").print_stats(limit)
+    return out.getvalue()
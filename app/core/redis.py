@@ -0,0 +1,22 @@
+from redis.asyncio import Redis
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+_client: Redis | None = None
+
+
+def get_redis() -> Redis:
+    """Shared Redis client. The connection pool is created lazily on first use."""
+    global _client
+    if _client is None:
+        _client = Redis(host=settings.redis_host, port=settings.redis_port)
+    return _client
+
+
+async def close_redis() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
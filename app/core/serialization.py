@@ -0,0 +1,10 @@
+import orjson
+
+# OPT_UTC_Z matches Pydantic's "Z" suffix for UTC datetimes, so responses are byte-for-byte
+# what DreamRead.model_dump_json would have produced for the same data.
+_OPTIONS = orjson.OPT_UTC_Z
+
+
+def dumps(obj) -> bytes:
+    """Fast JSON encoding for plain dict/list payloads built from DB rows."""
+    return orjson.dumps(obj, option=_OPTIONS)
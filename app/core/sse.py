@@ -0,0 +1,178 @@
+"""
+Server-Sent Events helpers for the streaming pipeline endpoints.
+
+Pipeline code produces plain event dicts:
+    {"agent": "<name>", "token": "<chunk>"}   — token from a streaming agent
+    {"event": "<type>", ...}                   — everything else (scores, done, ...)
+
+`coalesce_tokens` merges token events per agent into one event every N ms or M bytes,
+`format_event` turns an event into an SSE frame and `gzip_frames` optionally compresses
+the frame stream with a sync flush after every frame so the client still sees each
+frame immediately.
+"""
+
+import asyncio
+import json
+import zlib
+from collections.abc import AsyncIterator
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+
+from app.core.config import get_settings
+from app.core.metrics import track_stream
+
+settings = get_settings()
+
+_END = object()
+
+
+class _Failure:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+class _Flush:
+    def __init__(self, window: int):
+        self.window = window
+
+
+def format_event(event: dict, event_id: str | None = None) -> str:
+    frame = f"data: {json.dumps(event)}\n\n"
+    return f"id: {event_id}\n{frame}" if event_id else frame
+
+
+async def coalesce_tokens(
+    events: AsyncIterator[dict],
+    interval_ms: int,
+    max_bytes: int,
+) -> AsyncIterator[dict]:
+    """
+    Batch token events per agent, flushing every `interval_ms` or once `max_bytes` of
+    token text is pending, whichever comes first.
+
+    Tokens of one agent stay in order and are simply concatenated. Non-token events
+    flush everything pending first, so they keep their position relative to tokens.
+    Only the interleaving of different agents inside one window changes (each flush
+    emits agents in the order they first produced a token). Both limits <= 0 disables
+    batching.
+    """
+    if interval_ms <= 0 and max_bytes <= 0:
+        async for event in events:
+            yield event
+        return
+
+    # The source is drained by one dedicated task, so it always runs in the same
+    # task/context no matter how often we stop waiting on it to flush.
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def pump() -> None:
+        try:
+            async for event in events:
+                await queue.put(event)
+        except Exception as e:
+            await queue.put(_Failure(e))
+        else:
+            await queue.put(_END)
+
+    pump_task = asyncio.create_task(pump())
+    loop = asyncio.get_running_loop()
+
+    pending: dict[str, list[str]] = {}
+    pending_bytes = 0
+    # The interval flush is a marker the timer drops into the queue, so the hot path is a
+    # plain queue.get(). The window number discards a marker for an already-flushed window.
+    window = 0
+    timer: asyncio.TimerHandle | None = None
+
+    def flush() -> list[dict]:
+        nonlocal pending_bytes, window, timer
+        batch = [{"agent": agent, "token": "".join(parts)} for agent, parts in pending.items()]
+        pending.clear()
+        pending_bytes = 0
+        window += 1
+        if timer is not None:
+            timer.cancel()
+            timer = None
+        return batch
+
+    try:
+        while True:
+            item = await queue.get()
+
+            if isinstance(item, _Flush):
+                if item.window == window:
+                    for event in flush():
+                        yield event
+                continue
+            if item is _END:
+                break
+            if isinstance(item, _Failure):
+                for event in flush():
+                    yield event
+                raise item.error
+
+            if "token" in item:
+                pending.setdefault(item["agent"], []).append(item["token"])
+                pending_bytes += len(item["token"])
+                if timer is None and interval_ms > 0:
+                    timer = loop.call_later(interval_ms / 1000, queue.put_nowait, _Flush(window))
+                if max_bytes > 0 and pending_bytes >= max_bytes:
+                    for event in flush():
+                        yield event
+            else:
+                for event in flush():
+                    yield event
+                yield item
+
+        for event in flush():
+            yield event
+    finally:
+        if timer is not None:
+            timer.cancel()
+        pump_task.cancel()
+        await asyncio.gather(pump_task, return_exceptions=True)
+
+
+async def sse_frames(events: AsyncIterator[dict]) -> AsyncIterator[str]:
+    async for event in events:
+        yield format_event(event)
+
+
+async def gzip_frames(frames: AsyncIterator[str]) -> AsyncIterator[bytes]:
+    """Gzip a frame stream, sync-flushing after each frame so nothing sits in the buffer."""
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+    async for frame in frames:
+        yield compressor.compress(frame.encode()) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    yield compressor.flush()
+
+
+def accepts_gzip(accept_encoding: str | None) -> bool:
+    return "gzip" in (accept_encoding or "").lower()
+
+
+def coalesce(events: AsyncIterator[dict]) -> AsyncIterator[dict]:
+    """coalesce_tokens with the configured SSE flush limits."""
+    return coalesce_tokens(events, settings.sse_flush_interval_ms, settings.sse_flush_max_bytes)
+
+
+def stream_response(
+    request: Request,
+    frames: AsyncIterator[str],
+    headers: dict[str, str] | None = None,
+) -> StreamingResponse:
+    """Serve SSE frames, gzipped if enabled and accepted by the client."""
+    route = request.scope.get("route")
+    frames = track_stream(getattr(route, "path", request.url.path), frames)
+    headers = dict(headers or {})
+    if settings.sse_gzip and accepts_gzip(request.headers.get("accept-encoding")):
+        headers.update({"Content-Encoding": "gzip", "Vary": "Accept-Encoding"})
+        return StreamingResponse(
+            gzip_frames(frames), media_type="text/event-stream", headers=headers
+        )
+    return StreamingResponse(frames, media_type="text/event-stream", headers=headers)
+
+
+def sse_response(request: Request, events: AsyncIterator[dict]) -> StreamingResponse:
+    """Coalesce, frame and serve a pipeline event stream directly."""
+    return stream_response(request, sse_frames(coalesce(events)))
@@ -0,0 +1,182 @@
+"""
+Offline stub LLM provider: models named `stub/<anything>`.
+
+`acompletion` mimics the slice of litellm's API that llm_client uses (message content,
+streamed deltas, a final usage chunk), so metrics, tracing and every caller work
+unchanged. Output is derived from a hash of the model, system prompt and prompt:
+the same request always gives the same text, timing and failures. Text reuses the
+prompt's own words; when the system prompt asks for JSON like `{"depth": <1-5>}`
+(the judge), the answer is valid JSON with integers in those ranges.
+
+Timing follows STUB_* settings, overridable per model in the name:
+    stub/fast?ttft_ms=50&tps=400
+    stub/flaky?failure_rate=0.2&jitter=0.5&max_tokens=80
+
+API clients pick the model, so the stub only answers with STUB_LLM_ENABLED, and
+overrides are clamped to `OVERRIDE_LIMITS` so a name can't pin a worker for hours.
+"""
+
+import asyncio
+import hashlib
+import json
+import math
+import random
+import re
+from dataclasses import dataclass, fields, replace
+from types import SimpleNamespace
+from urllib.parse import parse_qsl
+
+from loguru import logger
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+PREFIX = "stub/"
+
+_JSON_FIELD = re.compile(r'"(\w+)":\s*<(\d+)-(\d+)>')
+_WORD = re.compile(r"[A-Za-z']{4,}")
+_FILLER = (
+    "the dream suggests a quiet tension between what is wanted and what is feared "
+    "an image of passage and return that the dreamer keeps circling back to while "
+    "memory and longing shape each scene into something half familiar"
+).split()
+
+
+class StubLLMError(RuntimeError):
+    """Injected failure (STUB_FAILURE_RATE)."""
+
+
+class StubLLMDisabledError(RuntimeError):
+    """A stub/ model was requested without STUB_LLM_ENABLED."""
+
+
+@dataclass(frozen=True)
+class StubProfile:
+    ttft_ms: float
+    tps: float
+    jitter: float
+    failure_rate: float
+    max_tokens: int
+
+
+# Bounds for the model name's overrides (the STUB_* settings themselves are trusted)
+OVERRIDE_LIMITS: dict[str, tuple[float, float]] = {
+    "ttft_ms": (0, 60_000),
+    "tps": (0, 10_000),
+    "jitter": (0, 1),
+    "failure_rate": (0, 1),
+    "max_tokens": (1, 4096),
+}
+
+
+def is_stub(model: str) -> bool:
+    return model.startswith(PREFIX)
+
+
+def stub_profile(model: str) -> StubProfile:
+    """Settings defaults with the model name's query-string overrides applied."""
+    profile = StubProfile(
+        ttft_ms=settings.stub_ttft_ms,
+        tps=settings.stub_tokens_per_second,
+        jitter=settings.stub_jitter,
+        failure_rate=settings.stub_failure_rate,
+        max_tokens=settings.stub_max_tokens,
+    )
+    _, _, query = model.partition("?")
+    types = {field.name: field.type for field in fields(StubProfile)}
+    overrides = {}
+    for key, value in parse_qsl(query):
+        if key not in types:
+            continue
+        try:
+            number = float(value)
+        except ValueError:
+            number = math.nan
+        if not math.isfinite(number):
+            logger.warning(f"{model}: ignoring {key}={value!r}, not a finite number")
+            continue
+        low, high = OVERRIDE_LIMITS[key]
+        overrides[key] = types[key](min(max(number, low), high))  # type: ignore[operator]
+    return replace(profile, **overrides)
+
+
+def _rng(model: str, messages: list[dict]) -> random.Random:
+    digest = hashlib.sha256(json.dumps([model, messages], sort_keys=True).encode()).digest()
+    return random.Random(int.from_bytes(digest[:8], "big"))
+
+
+def _jittered(seconds: float, jitter: float, rng: random.Random) -> float:
+    return max(0.0, seconds * (1 + jitter * rng.uniform(-1, 1)))
+
+
+def _tokens(messages: list[dict], profile: StubProfile, rng: random.Random) -> list[str]:
+    system = next((m["content"] for m in messages if m["role"] == "system"), "")
+    prompt = messages[-1]["content"]
+
+    json_fields = _JSON_FIELD.findall(system)
+    if json_fields:
+        answer = {name: rng.randint(int(low), int(high)) for name, low, high in json_fields}
+        return [json.dumps(answer)]
+
+    words = [word.lower() for word in _WORD.findall(prompt)] or _FILLER
+    count = rng.randint(max(1, profile.max_tokens // 2), max(1, profile.max_tokens))
+    tokens: list[str] = []
+    sentence_left = 0
+    for _ in range(count):
+        word = rng.choice(words) if rng.random() < 0.6 else rng.choice(_FILLER)
+        if sentence_left == 0:
+            sentence_left = rng.randint(8, 16)
+            word = word.capitalize()
+        sentence_left -= 1
+        tokens.append((" " if tokens else "") + word + ("." if sentence_left == 0 else ""))
+    return tokens
+
+
+def _usage(messages: list[dict], completion: list[str]) -> SimpleNamespace:
+    prompt_tokens = sum(len(m["content"].split()) for m in messages)
+    return SimpleNamespace(
+        prompt_tokens=prompt_tokens,
+        completion_tokens=len(completion),
+        total_tokens=prompt_tokens + len(completion),
+    )
+
+
+def _chunk(content: str | None, usage=None) -> SimpleNamespace:
+    choices = [SimpleNamespace(delta=SimpleNamespace(content=content))] if content else []
+    return SimpleNamespace(choices=choices, usage=usage)
+
+
+async def _first_token(model: str, profile: StubProfile, rng: random.Random) -> None:
+    await asyncio.sleep(_jittered(profile.ttft_ms / 1000, profile.jitter, rng))
+    if rng.random() < profile.failure_rate:
+        raise StubLLMError(f"{model}: injected failure")
+
+
+async def _stream(model, messages, profile, rng, tokens):
+    await _first_token(model, profile, rng)
+    per_token = 1 / profile.tps if profile.tps > 0 else 0.0
+    for i, token in enumerate(tokens):
+        if i:
+            await asyncio.sleep(_jittered(per_token, profile.jitter, rng))
+        yield _chunk(token)
+    yield _chunk(None, usage=_usage(messages, tokens))
+
+
+async def acompletion(model: str, messages: list[dict], stream: bool = False, **_):
+    """litellm.acompletion stand-in. Other litellm kwargs (temperature, ...) are ignored."""
+    if not settings.stub_llm_enabled:
+        raise StubLLMDisabledError(f"{model}: stub models are disabled (STUB_LLM_ENABLED)")
+    profile = stub_profile(model)
+    rng = _rng(model, messages)
+    tokens = _tokens(messages, profile, rng)
+    if stream:
+        return _stream(model, messages, profile, rng, tokens)
+
+    await _first_token(model, profile, rng)
+    if profile.tps > 0:
+        await asyncio.sleep(_jittered(len(tokens) / profile.tps, profile.jitter, rng))
+    message = SimpleNamespace(content="".join(tokens))
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=message)], usage=_usage(messages, tokens)
+    )
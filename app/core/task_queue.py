@@ -0,0 +1,81 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from loguru import logger
+
+# Every queue registers itself here so lifespan can stop them all on shutdown
+_queues: dict[str, "BackgroundQueue"] = {}
+
+
+class BackgroundQueue:
+    """
+    In-process job queue with a fixed number of asyncio workers.
+
+    Jobs are handed to `handler` one at a time per worker, so at most `concurrency`
+    jobs run at once and the rest wait in the queue. Workers start lazily on the
+    first enqueue (there must be a running event loop).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[[Any], Awaitable[None]],
+        concurrency: int = 1,
+    ):
+        self.name = name
+        self.handler = handler
+        self.concurrency = concurrency
+        self._queue: asyncio.Queue | None = None
+        self._workers: list[asyncio.Task] = []
+        _queues[name] = self
+
+    @property
+    def depth(self) -> int:
+        """Jobs waiting to be picked up."""
+        return self._queue.qsize() if self._queue else 0
+
+    def _ensure_started(self) -> asyncio.Queue:
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+            self._workers = [
+                asyncio.create_task(self._worker(i), name=f"{self.name}-worker-{i}")
+                for i in range(self.concurrency)
+            ]
+            logger.info(f"Started {self.concurrency} worker(s) for queue '{self.name}'")
+        return self._queue
+
+    async def _worker(self, index: int) -> None:
+        assert self._queue is not None
+        while True:
+            job = await self._queue.get()
+            try:
+                await self.handler(job)
+            except Exception as e:
+                logger.error(f"Queue '{self.name}' worker {index} failed on {job!r}: {e}")
+            finally:
+                self._queue.task_done()
+
+    def enqueue(self, job: Any) -> None:
+        self._ensure_started().put_nowait(job)
+
+    async def join(self) -> None:
+        """Wait until every queued job has been processed."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def stop(self) -> None:
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+
+
+def all_queues() -> list[BackgroundQueue]:
+    return list(_queues.values())
+
+
+async def stop_all_queues() -> None:
+    for queue in all_queues():
+        await queue.stop()
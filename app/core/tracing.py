@@ -0,0 +1,211 @@
+"""
+OpenTelemetry tracing for pipeline runs.
+
+Every pipeline run (LangGraph or streaming) is one trace: a root span per run, a span
+per node or stage, and spans for each LLM call (with a `first_token` event), each
+AnalysisService write and each embedding call. Spans started under a span carrying
+`dream.id` inherit it, so every span of a run can be found by dream.
+
+TRACING_EXPORTERS picks where spans go:
+  "otlp" — OTLP/HTTP to OTEL_EXPORTER_OTLP_ENDPOINT (needs the `otlp` extra)
+  "json" — JSON lines under TRACING_JSON_DIR, one file per dream; these files back
+           GET /api/v1/dreams/{id}/timeline
+With no exporter, spans are no-ops.
+
+Streaming stages are async generators, and a span can't stay current across a `yield`:
+the generator may be resumed by another task, whose Context can't detach it, so later
+spans lose their parent. Such generators are wrapped in `in_own_task`.
+"""
+
+import asyncio
+import functools
+import json
+import os
+import threading
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator, Sequence
+from contextlib import contextmanager
+from pathlib import Path
+
+from loguru import logger
+from opentelemetry import trace
+from opentelemetry.context import Context
+from opentelemetry.sdk.resources import SERVICE_NAME, Resource
+from opentelemetry.sdk.trace import ReadableSpan, Span, SpanProcessor, TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, SpanExporter, SpanExportResult
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+tracer = trace.get_tracer("dreamscape")
+
+DREAM_ID = "dream.id"
+
+_provider: TracerProvider | None = None
+
+
+@contextmanager
+def span(name: str, **attributes) -> Iterator[trace.Span]:
+    """Start a child of the current span (or a new trace). None attributes are dropped."""
+    attributes = {key: value for key, value in attributes.items() if value is not None}
+    with tracer.start_as_current_span(name, attributes=attributes) as current:
+        yield current
+
+
+def traced[**P, R](name: str) -> Callable[[Callable[P, Awaitable[R]]], Callable[P, Awaitable[R]]]:
+    """Decorate an async function to run inside a span called `name`."""
+
+    def decorator(fn: Callable[P, Awaitable[R]]) -> Callable[P, Awaitable[R]]:
+        @functools.wraps(fn)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            with span(name):
+                return await fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+_END = object()
+
+
+class _Failure:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+def in_own_task[**P, T](fn: Callable[P, AsyncIterator[T]]) -> Callable[P, AsyncIterator[T]]:
+    """
+    Run an async generator function's body in a task of its own, passing its items on.
+
+    Context managers that set context variables (span, collect_llm_calls) can then be held
+    across the body's yields: it always runs in one Context, copied from the consumer's
+    when iteration starts, however many tasks the consumer resumes it from.
+    """
+
+    @functools.wraps(fn)
+    async def wrapper(*args: P.args, **kwargs: P.kwargs) -> AsyncIterator[T]:
+        queue: asyncio.Queue = asyncio.Queue()
+
+        async def pump() -> None:
+            try:
+                async for item in fn(*args, **kwargs):
+                    await queue.put(item)
+            except Exception as e:
+                await queue.put(_Failure(e))
+            else:
+                await queue.put(_END)
+
+        pump_task = asyncio.create_task(pump())
+        try:
+            while (item := await queue.get()) is not _END:
+                if isinstance(item, _Failure):
+                    raise item.error
+                yield item
+        finally:
+            pump_task.cancel()
+            await asyncio.gather(pump_task, return_exceptions=True)
+
+    return wrapper
+
+
+class DreamIdProcessor(SpanProcessor):
+    """Copy `dream.id` from the parent span onto each new span."""
+
+    def on_start(self, span: Span, parent_context: Context | None = None) -> None:
+        if DREAM_ID in (span.attributes or {}):
+            return
+        parent = trace.get_current_span(parent_context)
+        dream_id = (getattr(parent, "attributes", None) or {}).get(DREAM_ID)
+        if dream_id is not None:
+            span.set_attribute(DREAM_ID, dream_id)
+
+
+def dream_spans_path(dream_id: int) -> Path:
+    return Path(settings.tracing_json_dir) / f"dream-{dream_id}.jsonl"
+
+
+def span_record(span: ReadableSpan) -> dict:
+    context = span.get_span_context()
+    return {
+        "trace_id": f"{context.trace_id:032x}" if context else None,
+        "span_id": f"{context.span_id:016x}" if context else None,
+        "parent_id": f"{span.parent.span_id:016x}" if span.parent else None,
+        "name": span.name,
+        "start": span.start_time,
+        "end": span.end_time,
+        "status": span.status.status_code.name,
+        "attributes": dict(span.attributes or {}),
+        "events": [{"name": event.name, "time": event.timestamp} for event in span.events],
+    }
+
+
+class JsonFileSpanExporter(SpanExporter):
+    """
+    Append finished spans as JSON lines: `dream-<id>.jsonl` for spans of a dream,
+    `spans.jsonl` for the rest. Lines are written with one O_APPEND write each, so
+    several workers can share the directory.
+    """
+
+    def __init__(self, directory: str):
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        lines: dict[Path, list[str]] = {}
+        for finished in spans:
+            dream_id = (finished.attributes or {}).get(DREAM_ID)
+            path = (
+                dream_spans_path(int(dream_id))  # type: ignore[arg-type]
+                if dream_id is not None
+                else self._directory / "spans.jsonl"
+            )
+            lines.setdefault(path, []).append(json.dumps(span_record(finished), default=str))
+        try:
+            with self._lock:
+                for path, records in lines.items():
+                    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+                    try:
+                        os.write(fd, ("\n".join(records) + "\n").encode())
+                    finally:
+                        os.close(fd)
+        except OSError as e:
+            logger.error(f"Writing spans to {self._directory} failed: {e}")
+            return SpanExportResult.FAILURE
+        return SpanExportResult.SUCCESS
+
+
+def _otlp_exporter() -> SpanExporter | None:
+    try:
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+    except ImportError:
+        logger.warning("TRACING_EXPORTERS has otlp but the `otlp` extra is not installed")
+        return None
+    return OTLPSpanExporter()  # Endpoint and headers from OTEL_EXPORTER_OTLP_* env vars
+
+
+def setup_tracing() -> None:
+    """Install the tracer provider; call once per process (after forking)."""
+    global _provider
+    exporters: list[SpanExporter] = []
+    if "otlp" in settings.tracing_exporters and (otlp := _otlp_exporter()):
+        exporters.append(otlp)
+    if "json" in settings.tracing_exporters:
+        exporters.append(JsonFileSpanExporter(settings.tracing_json_dir))
+    if not exporters:
+        return
+
+    resource = Resource.create({SERVICE_NAME: os.environ.get("OTEL_SERVICE_NAME", "dreamscape")})
+    _provider = TracerProvider(resource=resource)
+    _provider.add_span_processor(DreamIdProcessor())
+    for exporter in exporters:
+        _provider.add_span_processor(BatchSpanProcessor(exporter))
+    trace.set_tracer_provider(_provider)
+    logger.info(f"Tracing enabled: {', '.join(settings.tracing_exporters)}")
+
+
+def shutdown_tracing() -> None:
+    """Flush pending spans."""
+    if _provider is not None:
+        _provider.shutdown()
@@ -0,0 +1,159 @@
+"""
+Startup warmup and readiness.
+
+Models load lazily, so without warmup the first request after a deploy pays for
+importing litellm, loading SentenceTransformer and Whisper, and Ollama reading the
+model into memory. `start_warmup()` runs from the lifespan in the background: it loads the
+components listed in WARMUP, runs a dummy inference through each, and asks Ollama to
+keep its models resident for OLLAMA_KEEP_ALIVE. GET /ready reports the result, so a
+load balancer only routes to warm workers.
+
+A failed component is retried with exponential backoff (WARMUP_RETRY_SECONDS, doubling
+up to WARMUP_RETRY_MAX_SECONDS) until it loads. Components in WARMUP_OPTIONAL (Ollama by
+default) don't hold readiness back once they have failed: they only make first requests
+to them slower, while a worker that can't embed can't serve at all.
+"""
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+import httpx
+from loguru import logger
+
+from app.core.config import get_settings
+from app.core.models_config import DEFAULT_MODEL
+
+settings = get_settings()
+
+READY_STATES = {"ready", "skipped"}
+
+
+@dataclass
+class ComponentStatus:
+    state: str = "pending"  # pending, loading, ready, failed (retrying), skipped
+    seconds: float | None = None  # Of the last attempt
+    error: str | None = None
+    attempts: int = 0
+    required: bool = True  # False for WARMUP_OPTIONAL: a failure doesn't block /ready
+
+
+_status: dict[str, ComponentStatus] = {}
+
+
+def ollama_models() -> list[str]:
+    """Ollama models this worker will use unasked (the default model and MODEL_ROUTES), without
+    the litellm "ollama/" prefix. Models only picked per request aren't preloaded."""
+    used = {DEFAULT_MODEL}
+    for route in settings.model_routes.values():
+        used.update(route.candidates)
+        if route.model:
+            used.add(route.model)
+    return sorted(model.removeprefix("ollama/") for model in used if model.startswith("ollama/"))
+
+
+async def _warm_llm() -> None:
+    from app.core.llm_client import get_litellm
+
+    await asyncio.to_thread(get_litellm)
+
+
+async def _warm_embedding() -> None:
+    from app.ui.embeddings import embed_text
+
+    await asyncio.to_thread(embed_text, "warmup")
+
+
+async def _warm_whisper() -> None:
+    import numpy as np
+
+    from app.ui.whisper import WHISPER_SAMPLE_RATE, transcribe_chunks
+
+    # One second of silence; transcribe_audio would drop it as non-speech
+    silence = np.zeros(WHISPER_SAMPLE_RATE, dtype=np.float32)
+    await asyncio.to_thread(transcribe_chunks, [silence], WHISPER_SAMPLE_RATE)
+
+
+async def _warm_ollama() -> None:
+    # A generate request without a prompt only loads the model; keep_alive keeps it loaded
+    async with httpx.AsyncClient(
+        base_url=settings.ollama_base_url, timeout=httpx.Timeout(300, connect=5)
+    ) as client:
+        for model in ollama_models():
+            response = await client.post(
+                "/api/generate", json={"model": model, "keep_alive": settings.ollama_keep_alive}
+            )
+            response.raise_for_status()
+
+
+WARMERS: dict[str, Callable[[], Awaitable[None]]] = {
+    "llm": _warm_llm,
+    "embedding": _warm_embedding,
+    "whisper": _warm_whisper,
+    "ollama": _warm_ollama,
+}
+
+
+def status() -> dict[str, ComponentStatus]:
+    return dict(_status)
+
+
+def blocks_readiness(component: ComponentStatus) -> bool:
+    if component.state in READY_STATES:
+        return False
+    return component.required or component.state != "failed"
+
+
+def is_ready() -> bool:
+    return not any(blocks_readiness(s) for s in _status.values())
+
+
+async def _run(name: str) -> None:
+    component = _status[name]
+    component.state = "loading"
+    delay = settings.warmup_retry_seconds
+    while True:
+        component.attempts += 1
+        started = time.perf_counter()
+        try:
+            await WARMERS[name]()
+        except Exception as e:
+            # Stays "failed" while retrying, so an optional component doesn't flap /ready
+            component.state = "failed"
+            component.error = str(e)
+            component.seconds = round(time.perf_counter() - started, 3)
+            logger.error(f"Warmup of {name} failed, retrying in {delay:g}s: {e}")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, settings.warmup_retry_max_seconds)
+        else:
+            component.state = "ready"
+            component.error = None
+            component.seconds = round(time.perf_counter() - started, 3)
+            logger.info(f"Warmup of {name} done in {component.seconds:.1f}s")
+            return
+
+
+def start_warmup() -> asyncio.Task:
+    """
+    Warm every component in WARMUP concurrently, in a background task.
+
+    Components are registered as pending before this returns, so /ready can't report
+    ready in the window before the task first runs.
+    """
+    names = []
+    for name in settings.warmup:
+        if name not in WARMERS:
+            logger.warning(f"Unknown warmup component {name!r}, expected one of {list(WARMERS)}")
+        elif name == "whisper" and not settings.serve_ui:
+            _status[name] = ComponentStatus(state="skipped")  # only the UI transcribes
+        elif name == "ollama" and not ollama_models():
+            _status[name] = ComponentStatus(state="skipped")  # no Ollama model in use
+        else:
+            _status[name] = ComponentStatus(required=name not in settings.warmup_optional)
+            names.append(name)
+    return asyncio.create_task(_warm_all(names), name="warmup")
+
+
+async def _warm_all(names: list[str]) -> None:
+    await asyncio.gather(*(_run(name) for name in names))
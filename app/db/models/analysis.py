@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, Text, func
+from sqlalchemy import DateTime, Float, ForeignKey, Integer, String, Text, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
@@ -42,9 +42,22 @@ class Analysis(Base):
     # Score from rating agent (1-5 avg). Only set on specialist analyses.
     score: Mapped[int | None] = mapped_column(Integer, nullable=True)
 
+    # Wall time of the agent's LLM call(s) in ms; the model router's latency history
+    duration_ms: Mapped[float | None] = mapped_column(Float, nullable=True)
+
+    # Prompt variant the agent ran with (app.agents.prompts), for A/B comparisons
+    prompt_variant: Mapped[str] = mapped_column(
+        String(100), nullable=False, server_default="default"
+    )
+
+    # Tokens of the agent's LLM call(s), and time to first token (streaming runs only)
+    prompt_tokens: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    completion_tokens: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    ttft_ms: Mapped[float | None] = mapped_column(Float, nullable=True)
+
     # Timestamps
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), nullable=False, server_default=func.now()
+        DateTime(timezone=True), nullable=False, server_default=func.now(), index=True
     )
 
     # Relationship: Analysis belongs to one dream
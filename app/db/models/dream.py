@@ -30,6 +30,8 @@ class Dream(Base):
 
     # For semantic search
     # embedding: Mapped[Vector] = mapped_column(Vector(1536), nullable=True)
+    # Raw SQL columns: embedding (synthesis, written by the pipeline, used by /similar)
+    # and content_embedding (the dream text, written by bulk import with embed=true)
 
     # Timestamps (automatically managed)
     created_at: Mapped[datetime] = mapped_column(
@@ -0,0 +1,109 @@
+"""
+Comparison table of eval results: one row per target × model × prompt variant.
+"""
+
+import math
+import statistics
+from collections import defaultdict
+from datetime import UTC, datetime
+from pathlib import Path
+
+from app.core.config import get_settings
+from app.evals.runner import eval_dir
+from app.schemas.eval import CellResult, ComparisonRow, EvalReport
+
+settings = get_settings()
+
+REPORT_FILE = "report.json"
+
+
+def _p95(values: list[float]) -> float:
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(0.95 * len(ordered)) - 1)]
+
+
+def _mean(values: list[float]) -> float | None:
+    return round(statistics.fmean(values), 2) if values else None
+
+
+def _row(target, model, prompt, results: list[CellResult]) -> ComparisonRow:
+    ok = [r for r in results if r.status == "ok"]
+    scores = [r.score for r in ok if r.score is not None]
+    durations = [r.duration_ms for r in ok]
+    return ComparisonRow(
+        target=target,
+        model=model,
+        prompt=prompt,
+        cells=len(results),
+        errors=len(results) - len(ok),
+        score_mean=_mean(scores),
+        score_min=min(scores) if scores else None,
+        duration_p50_ms=round(statistics.median(durations), 1) if durations else None,
+        duration_p95_ms=round(_p95(durations), 1) if durations else None,
+        prompt_tokens_mean=_mean([r.prompt_tokens for r in ok]),
+        completion_tokens_mean=_mean([r.completion_tokens for r in ok]),
+    )
+
+
+def build_report(name: str, judge_model: str, results: list[CellResult]) -> EvalReport:
+    groups: dict[tuple, list[CellResult]] = defaultdict(list)
+    for result in results:
+        groups[(result.target, result.model, result.prompt)].append(result)
+    rows = [_row(*key, group) for key, group in groups.items()]
+    rows.sort(key=lambda row: (row.target, -(row.score_mean or 0), row.duration_p50_ms or 0))
+    return EvalReport(
+        name=name,
+        judge_model=judge_model,
+        generated_at=datetime.now(UTC),
+        cells=len(results),
+        errors=sum(row.errors for row in rows),
+        rows=rows,
+    )
+
+
+def save_report(report: EvalReport) -> None:
+    path = eval_dir(report.name) / REPORT_FILE
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(report.model_dump_json(indent=2))
+
+
+def load_report(name: str) -> EvalReport | None:
+    path = eval_dir(name) / REPORT_FILE
+    if not path.exists():
+        return None
+    return EvalReport.model_validate_json(path.read_text())
+
+
+def list_reports() -> list[EvalReport]:
+    """Every saved report, newest first."""
+    root = Path(settings.evals_dir)
+    if not root.exists():
+        return []
+    reports = [
+        EvalReport.model_validate_json(path.read_text()) for path in root.glob(f"*/{REPORT_FILE}")
+    ]
+    return sorted(reports, key=lambda report: report.generated_at, reverse=True)
+
+
+def _fmt(value: float | None, digits: int = 0) -> str:
+    return "-" if value is None else f"{value:.{digits}f}"
+
+
+def format_table(report: EvalReport) -> str:
+    """The report as a fixed-width text table."""
+    width = max([len(row.model) for row in report.rows] + [5]) + 2
+    lines = [
+        f"{report.name}: {report.cells} cells, {report.errors} errors, judge {report.judge_model}",
+        f"{'target':<20}{'model':<{width}}{'prompt':<12}{'n':>4}{'err':>5}"
+        f"{'score':>7}{'min':>6}{'p50 s':>8}{'p95 s':>8}{'in tok':>8}{'out tok':>9}",
+    ]
+    for row in report.rows:
+        p50 = row.duration_p50_ms / 1000 if row.duration_p50_ms is not None else None
+        p95 = row.duration_p95_ms / 1000 if row.duration_p95_ms is not None else None
+        lines.append(
+            f"{row.target:<20}{row.model:<{width}}{row.prompt:<12}{row.cells:>4}{row.errors:>5}"
+            f"{_fmt(row.score_mean, 2):>7}{_fmt(row.score_min, 1):>6}"
+            f"{_fmt(p50, 1):>8}{_fmt(p95, 1):>8}"
+            f"{_fmt(row.prompt_tokens_mean):>8}{_fmt(row.completion_tokens_mean):>9}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,190 @@
+"""
+Run eval cells in parallel, caching each finished cell on disk.
+
+Cells run concurrently with at most EVAL_CONCURRENCY[provider] generating per provider;
+judging takes a slot of the judge model's provider. Every finished cell is written to
+EVALS_DIR/<name>/cells/<key>.json as soon as it completes, so an interrupted run picks
+up where it stopped: cells with a cached "ok" result are skipped, failed ones retried.
+
+Pipeline cells run the real graph (`run_dream_analysis`) on a scratch dream that is
+deleted afterwards, so they need the database. Single-agent cells only call the LLM.
+"""
+
+import asyncio
+import os
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime
+from pathlib import Path
+
+from loguru import logger
+
+from app.agents.base_agent import BaseAgent
+from app.agents.emotion_specialist import EmotionSpecialist
+from app.agents.generalist_agent import GeneralistAgent
+from app.agents.rating_agent import RatingAgent
+from app.agents.symbol_specialist import SymbolSpecialist
+from app.agents.theme_specialist import ThemeSpecialist
+from app.core.config import get_settings
+from app.core.database import AsyncSessionLocal
+from app.core.metrics import collect_llm_calls
+from app.evals.spec import Cell
+from app.schemas.eval import CellResult, EvalTarget
+from app.services.dream_service import DreamService
+from app.workflows.dream_analysis import run_dream_analysis
+
+settings = get_settings()
+
+AGENTS: dict[EvalTarget, type[BaseAgent]] = {
+    EvalTarget.GENERALIST: GeneralistAgent,
+    EvalTarget.SYMBOL: SymbolSpecialist,
+    EvalTarget.EMOTION: EmotionSpecialist,
+    EvalTarget.THEME: ThemeSpecialist,
+}
+_NEEDS_CONTEXT = {EvalTarget.SYMBOL, EvalTarget.EMOTION, EvalTarget.THEME}
+
+
+def eval_dir(name: str) -> Path:
+    return Path(settings.evals_dir) / name
+
+
+def _cell_path(name: str, key: str) -> Path:
+    return eval_dir(name) / "cells" / f"{key}.json"
+
+
+def load_cached(name: str, key: str) -> CellResult | None:
+    path = _cell_path(name, key)
+    if not path.exists():
+        return None
+    return CellResult.model_validate_json(path.read_text())
+
+
+def _save(name: str, result: CellResult) -> None:
+    path = _cell_path(name, result.key)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_text(result.model_dump_json(indent=2))
+    os.replace(tmp, path)  # A half-written cell would poison the cache
+
+
+class EvalRunner:
+    def __init__(
+        self,
+        name: str,
+        concurrency: dict[str, int] | None = None,
+        on_result: Callable[[Cell, CellResult, bool], None] | None = None,
+    ):
+        self.name = name
+        self.concurrency = {**settings.eval_concurrency, **(concurrency or {})}
+        self.on_result = on_result  # (cell, result, from cache)
+        self._slots: dict[str, asyncio.Semaphore] = {}
+        self._contexts: dict[tuple, asyncio.Task] = {}
+
+    def _slot(self, model: str) -> asyncio.Semaphore:
+        provider = model.split("/", 1)[0]
+        if provider not in self._slots:
+            limit = self.concurrency.get(provider, settings.eval_default_concurrency)
+            self._slots[provider] = asyncio.Semaphore(limit)
+        return self._slots[provider]
+
+    async def run(self, cells: list[Cell], fresh: bool = False) -> list[CellResult]:
+        """Run (or load from cache) every cell; results are in cell order."""
+        # Cells with equal keys (variants that don't touch the target) are evaluated once
+        shared: dict[str, asyncio.Task] = {}
+        for cell in cells:
+            if cell.key not in shared:
+                shared[cell.key] = asyncio.create_task(self._cached_or_evaluated(cell, fresh))
+
+        async def labelled(cell: Cell) -> CellResult:
+            result, cached = await shared[cell.key]
+            result = result.model_copy(update={"prompt": cell.prompt})
+            if self.on_result:
+                self.on_result(cell, result, cached)
+            return result
+
+        return list(await asyncio.gather(*(labelled(cell) for cell in cells)))
+
+    async def _cached_or_evaluated(self, cell: Cell, fresh: bool) -> tuple[CellResult, bool]:
+        cached = None if fresh else await asyncio.to_thread(load_cached, self.name, cell.key)
+        if cached is not None and cached.status == "ok":
+            return cached, True
+
+        try:
+            result = await self._evaluate(cell)
+        except Exception as e:
+            logger.warning(f"Eval cell {cell.key} ({cell.target} {cell.model}) failed: {e!r}")
+            result = self._result(cell, status="error", error=f"{type(e).__name__}: {e}")
+        await asyncio.to_thread(_save, self.name, result)
+        return result, False
+
+    async def _evaluate(self, cell: Cell) -> CellResult:
+        async with self._slot(cell.model):
+            context = await self._context(cell) if cell.target in _NEEDS_CONTEXT else None
+            started = time.perf_counter()
+            with collect_llm_calls() as calls:
+                if cell.target == EvalTarget.PIPELINE:
+                    output, pipeline_scores = await self._pipeline(cell)
+                else:
+                    agent = AGENTS[cell.target](
+                        model=cell.model, system_prompt=cell.prompts.get(cell.target)
+                    )
+                    output, pipeline_scores = await agent.analyze(cell.dream.content, context), {}
+            duration_ms = (time.perf_counter() - started) * 1000
+
+        judge = RatingAgent(model=cell.judge_model)
+        async with self._slot(cell.judge_model):
+            scores = judge.parse_scores(await judge.analyze(cell.dream.content, context=output))
+
+        return self._result(
+            cell,
+            status="ok",
+            output=output,
+            scores=scores,
+            score=round(sum(scores.values()) / len(scores), 2),
+            pipeline_scores=pipeline_scores,
+            duration_ms=round(duration_ms, 1),
+            llm_calls=len(calls),
+            prompt_tokens=sum(call.prompt_tokens for call in calls),
+            completion_tokens=sum(call.completion_tokens for call in calls),
+        )
+
+    async def _pipeline(self, cell: Cell) -> tuple[str, dict[str, int]]:
+        async with AsyncSessionLocal() as db:
+            dream = await DreamService(db).create_dream(cell.dream.content)
+        try:
+            state = await run_dream_analysis(
+                dream_id=dream.id,
+                dream=cell.dream.content,
+                model=cell.model,
+                prompts=cell.prompts,
+                routing=False,
+                experiments=False,
+            )
+        finally:
+            async with AsyncSessionLocal() as db:
+                await DreamService(db).delete_dream(dream.id)
+        return state["synthesis"], state["scores"]
+
+    async def _context(self, cell: Cell) -> str:
+        """Generalist output for a specialist cell: from the dataset, else generated once
+        per dream/model/prompt and shared by the cells that need it (not in their stats)."""
+        if cell.dream.context:
+            return cell.dream.context
+        generalist_prompt = cell.prompts.get(EvalTarget.GENERALIST)
+        key = (cell.dream.id, cell.model, generalist_prompt)
+        if key not in self._contexts:
+            agent = GeneralistAgent(model=cell.model, system_prompt=generalist_prompt)
+            self._contexts[key] = asyncio.create_task(agent.analyze(cell.dream.content))
+        return await self._contexts[key]
+
+    def _result(self, cell: Cell, **fields) -> CellResult:
+        return CellResult(
+            key=cell.key,
+            dream_id=cell.dream.id,
+            target=cell.target,
+            model=cell.model,
+            prompt=cell.prompt,
+            repeat=cell.repeat,
+            finished_at=datetime.now(UTC),
+            **fields,
+        )
@@ -0,0 +1,111 @@
+"""
+Loading eval specs and datasets, and expanding them into cells.
+
+A spec is a JSON file (see app.schemas.eval.EvalSpec):
+
+    {
+        "name": "small-models",
+        "dataset": "dreams.ndjson",
+        "models": ["ollama/qwen2.5:7b", "openrouter/openai/gpt-5-nano"],
+        "targets": ["pipeline", "symbol_specialist"],
+        "prompts": {"default": {}, "terse": {"symbol_specialist": "@prompts/terse.txt"}},
+        "judge_model": "openrouter/anthropic/claude-haiku-4.5",
+        "repeats": 2
+    }
+
+A cell's key hashes everything that determines its result (dream, target, model, the
+prompt texts it uses, judge, repeat), so editing a prompt file re-runs exactly the
+cells that use it, and variants that don't touch a target share its cached cells.
+"""
+
+import hashlib
+import itertools
+import json
+from dataclasses import dataclass
+from pathlib import Path
+
+from app.core.config import get_settings
+from app.core.models_config import DEFAULT_MODEL
+from app.schemas.eval import EvalDream, EvalSpec, EvalTarget
+
+settings = get_settings()
+
+
+@dataclass(frozen=True)
+class Cell:
+    dream: EvalDream
+    target: EvalTarget
+    model: str
+    prompt: str  # Variant name
+    prompts: dict[str, str]  # The variant's resolved overrides, by agent name
+    judge_model: str
+    repeat: int
+
+    @property
+    def key(self) -> str:
+        payload = json.dumps(
+            [
+                self.dream.content,
+                self.dream.context,
+                self.target,
+                self.model,
+                self._used_prompts(),
+                self.judge_model,
+                self.repeat,
+            ],
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+    def _used_prompts(self) -> dict[str, str]:
+        """Overrides that can change this cell's output: all of them for the pipeline;
+        the target's own (and the generalist's, which writes its context) otherwise."""
+        if self.target == EvalTarget.PIPELINE:
+            return self.prompts
+        used = {self.target, EvalTarget.GENERALIST}
+        return {agent: text for agent, text in self.prompts.items() if agent in used}
+
+
+def load_spec(path: Path) -> EvalSpec:
+    return EvalSpec.model_validate_json(path.read_text())
+
+
+def load_dataset(path: Path) -> list[EvalDream]:
+    """NDJSON dreams; lines without an "id" are numbered by line."""
+    dreams = []
+    with path.open() as f:
+        for number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            row["id"] = str(row.get("id", number))
+            dreams.append(EvalDream.model_validate(row))
+    return dreams
+
+
+def resolve_prompts(spec: EvalSpec, base_dir: Path) -> dict[str, dict[str, str]]:
+    """Variant -> agent -> prompt text, with "@path" values read relative to base_dir."""
+    return {
+        variant: {
+            agent: (base_dir / text[1:]).read_text() if text.startswith("@") else text
+            for agent, text in overrides.items()
+        }
+        for variant, overrides in spec.prompts.items()
+    }
+
+
+def judge_model(spec: EvalSpec) -> str:
+    return spec.judge_model or settings.eval_judge_model or DEFAULT_MODEL
+
+
+def expand_cells(spec: EvalSpec, spec_path: Path) -> list[Cell]:
+    base_dir = spec_path.parent
+    dreams = load_dataset(base_dir / spec.dataset)
+    prompts = resolve_prompts(spec, base_dir)
+    judge = judge_model(spec)
+    return [
+        Cell(dream, target, model, variant, prompts[variant], judge, repeat)
+        for dream, target, model, variant, repeat in itertools.product(
+            dreams, spec.targets, spec.models, prompts, range(spec.repeats)
+        )
+    ]
@@ -1,24 +1,31 @@
+import asyncio
 from contextlib import asynccontextmanager
+from dataclasses import asdict
 
-import gradio as gr
-from fastapi import FastAPI
+from fastapi import FastAPI, Response, status
 from fastapi.middleware.cors import CORSMiddleware
 from loguru import logger
 from sqlalchemy import text
 
 from app.api.v1.router import api_router
+from app.core import metrics, tracing, warmup
 from app.core.config import get_settings
 from app.core.database import engine
+from app.core.profiling import ProfilingMiddleware
+from app.core.redis import close_redis
+from app.core.task_queue import stop_all_queues
 from app.db import base  # noqa: F401 - Import models for SQLAlchemy
-from app.ui.gradio_app import gradio_ui
 
 settings = get_settings()
 
+metrics.instrument_engine(engine)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("Starting up Dreamscape API")
     logger.info(f"Environment: {settings.environment}")
+    tracing.setup_tracing()
     logger.info(
         f"Database: {settings.postgres_host}:{settings.postgres_port}/{settings.postgres_db}"
     )
@@ -30,10 +37,23 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"Database connection failed: {e}")
 
+    # Serve /health (and requests) right away; /ready turns 200 once models are warm
+    warmup_task = warmup.start_warmup()
+    lag_task = asyncio.create_task(metrics.monitor_event_loop_lag(), name="event-loop-lag")
+
     yield
 
     logger.info("Shutting down Dreamscape API")
+    warmup_task.cancel()
+    lag_task.cancel()
+    await stop_all_queues()
     await engine.dispose()
+    await close_redis()
+    tracing.shutdown_tracing()
+    if settings.serve_ui:
+        from app.ui.handlers import close_client
+
+        await close_client()
     logger.info("Database connections closed")
 
 
@@ -60,9 +80,21 @@ async def add_permissions_policy(request, call_next):
     response.headers["Permissions-Policy"] = "microphone=*"
     return response
 
+if settings.profiling_enabled:
+    if not settings.profiling_admin_token:
+        # Profiles expose code paths and timings; never serve them unauthenticated
+        raise RuntimeError("PROFILING_ENABLED requires PROFILING_ADMIN_TOKEN to be set")
+    app.add_middleware(ProfilingMiddleware)
+
 app.include_router(api_router, prefix="/api/v1")
 
-app = gr.mount_gradio_app(app, gradio_ui, path="/ui")
+if settings.serve_ui:
+    # Gradio (and the UI's import tree) is only loaded when the UI is served
+    import gradio as gr
+
+    from app.ui.gradio_app import gradio_ui
+
+    app = gr.mount_gradio_app(app, gradio_ui, path="/ui")
 
 
 @app.get("/health", tags=["health"])
@@ -73,3 +105,26 @@ async def health_check():
         "environment": settings.environment,
         "app": settings.app_name,
     }
+
+
+@app.get("/ready", tags=["health"])
+async def readiness_check(response: Response):
+    """Readiness for load balancers: 503 until warmup is done and the database answers."""
+    components = {name: asdict(s) for name, s in warmup.status().items()}
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+        components["database"] = {"state": "ready"}
+    except Exception as e:
+        components["database"] = {"state": "failed", "error": str(e)}
+
+    ready = warmup.is_ready() and components["database"]["state"] == "ready"
+    if not ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return {"status": "ready" if ready else "not_ready", "components": components}
+
+
+@app.get("/metrics", tags=["health"], include_in_schema=False)
+async def prometheus_metrics():
+    body, content_type = metrics.render()
+    return Response(body, media_type=content_type)
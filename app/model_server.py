@@ -0,0 +1,219 @@
+"""
+Model server: hosts the embedding model and Whisper for every web worker.
+
+Web workers set MODEL_SERVER_SOCKET and send their inference here over a Unix domain
+socket (framing in app.core.ipc), so they stay small and keep their GIL for requests.
+Requests from all connections are batched per model: the first request opens a short
+window (MODEL_SERVER_MAX_WAIT_MS) and everything that arrives in it, up to
+MODEL_SERVER_MAX_BATCH items, runs as one inference call on the model's own thread.
+
+    uv run python -m app.model_server --socket /tmp/dreamscape-models.sock
+"""
+
+import argparse
+import asyncio
+import contextlib
+import os
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+import numpy as np
+from loguru import logger
+
+from app.core.config import get_settings
+from app.core.ipc import read_frame, write_frame
+
+settings = get_settings()
+
+DEFAULT_SOCKET = "/tmp/dreamscape-models.sock"
+
+
+@dataclass
+class _Request:
+    items: list
+    future: asyncio.Future = field(
+        default_factory=lambda: asyncio.get_running_loop().create_future()
+    )
+
+
+class Batcher:
+    """Collects requests for one model and runs them as batched calls on a dedicated thread."""
+
+    def __init__(
+        self,
+        name: str,
+        infer: Callable[[list], Sequence],
+        max_batch: int,
+        max_wait_ms: float,
+    ):
+        self.name = name
+        self._infer = infer
+        self._max_batch = max_batch
+        self._max_wait = max_wait_ms / 1000
+        self._queue: asyncio.Queue[_Request] = asyncio.Queue()
+        # One thread per model: torch parallelizes inside a call, not across calls
+        self._executor = ThreadPoolExecutor(1, thread_name_prefix=f"model-{name}")
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run(), name=f"batcher-{self.name}")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def submit(self, items: list) -> Sequence:
+        request = _Request(items)
+        await self._queue.put(request)
+        return await request.future
+
+    async def _collect(self) -> list[_Request]:
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        size = len(batch[0].items)
+        deadline = loop.time() + self._max_wait
+        while size < self._max_batch:
+            if self._queue.empty():
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    request = await asyncio.wait_for(self._queue.get(), remaining)
+                except TimeoutError:
+                    break
+            else:
+                request = self._queue.get_nowait()
+            batch.append(request)
+            size += len(request.items)
+        return batch
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            items = [item for request in batch for item in request.items]
+            try:
+                results = await loop.run_in_executor(self._executor, self._infer, items)
+            except Exception as e:
+                logger.error(f"{self.name} batch of {len(items)} failed: {e}")
+                for request in batch:
+                    if not request.future.done():
+                        request.future.set_exception(e)
+                continue
+
+            start = 0
+            for request in batch:
+                end = start + len(request.items)
+                if not request.future.done():
+                    request.future.set_result(results[start:end])
+                start = end
+
+
+def _embedding_batcher() -> Batcher:
+    from app.ui.embeddings import get_embedding_model
+
+    model = get_embedding_model()
+
+    def infer(texts: list[str]) -> np.ndarray:
+        return model.encode(texts, batch_size=32, show_progress_bar=False, convert_to_numpy=True)
+
+    return Batcher(
+        "embedding", infer, settings.model_server_max_batch, settings.model_server_max_wait_ms
+    )
+
+
+def _whisper_batcher() -> Batcher:
+    from app.ui.whisper import get_whisper
+
+    pipe = get_whisper()
+
+    def infer(clips: list[dict]) -> list[dict]:
+        return pipe(clips, batch_size=len(clips))  # type: ignore[return-value]
+
+    # Clips are long; a few per batch is already most of the win
+    return Batcher("whisper", infer, max_batch=8, max_wait_ms=settings.model_server_max_wait_ms)
+
+
+class ModelServer:
+    def __init__(self, batchers: dict[str, Batcher]):
+        self._batchers = batchers
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    header, body = await read_frame(reader)
+                except asyncio.IncompleteReadError:
+                    return  # client closed the connection
+                try:
+                    response, payload = await self._dispatch(header, body)
+                except Exception as e:
+                    response, payload = {"error": f"{type(e).__name__}: {e}"}, b""
+                await write_frame(writer, response, payload)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def _dispatch(self, header: dict, body: bytes) -> tuple[dict, bytes]:
+        op = header.get("op")
+        if op == "ping":
+            return {"ok": True, "models": sorted(self._batchers)}, b""
+        if op not in ("embed", "transcribe"):
+            raise ValueError(f"unknown op {op!r}")
+
+        model = "embedding" if op == "embed" else "whisper"
+        if model not in self._batchers:
+            raise ValueError(f"{model} is not loaded on this model server")
+
+        if op == "embed":
+            texts = header["texts"]
+            if not texts:
+                return {"shape": [0, 0]}, b""
+            vectors = np.asarray(await self._batchers[model].submit(texts), dtype=np.float32)
+            return {"shape": list(vectors.shape)}, vectors.tobytes()
+
+        audio = np.frombuffer(body, dtype=np.float32)
+        (result,) = await self._batchers[model].submit(
+            [{"sampling_rate": header["sampling_rate"], "raw": audio}]
+        )
+        return {"text": result["text"]}, b""
+
+
+async def serve(path: str, whisper: bool = True) -> None:
+    batchers = {"embedding": _embedding_batcher()}
+    if whisper:
+        batchers["whisper"] = _whisper_batcher()
+    for batcher in batchers.values():
+        batcher.start()
+
+    with contextlib.suppress(FileNotFoundError):
+        os.unlink(path)  # stale socket from a previous run
+    server = await asyncio.start_unix_server(ModelServer(batchers).handle, path=path)
+    logger.info(f"Model server listening on {path} ({', '.join(batchers)})")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        for batcher in batchers.values():
+            await batcher.stop()
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(path)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve embedding and Whisper inference.")
+    parser.add_argument("--socket", default=settings.model_server_socket or DEFAULT_SOCKET)
+    parser.add_argument("--no-whisper", action="store_true", help="Only host the embedding model")
+    args = parser.parse_args()
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(serve(args.socket, whisper=not args.no_whisper))
+
+
+if __name__ == "__main__":
+    main()
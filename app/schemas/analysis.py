@@ -11,6 +11,11 @@ class AnalysisRead(BaseModel):
     model_used: str
     content: str
     score: int | None
+    duration_ms: float | None = None
+    prompt_variant: str = "default"
+    prompt_tokens: int | None = None
+    completion_tokens: int | None = None
+    ttft_ms: float | None = None
     created_at: datetime
 
     model_config = {"from_attributes": True}
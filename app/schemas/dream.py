@@ -51,3 +51,23 @@ class DreamUpdate(BaseModel):
     )
 
     dream_date: datetime | None = None
+
+
+class ImportLineError(BaseModel):
+    """A single NDJSON line that could not be imported."""
+
+    line: int
+    error: str
+
+
+class DreamImportResult(BaseModel):
+    """Summary of a bulk NDJSON import."""
+
+    imported: int
+    failed: int
+    dream_ids: list[int]
+    errors: list[ImportLineError]
+    embedded: bool
+    analysis_enqueued: int
+    seconds: float
+    rows_per_second: float
@@ -0,0 +1,78 @@
+from datetime import datetime
+from enum import StrEnum
+
+from pydantic import BaseModel, Field
+
+
+class EvalTarget(StrEnum):
+    PIPELINE = "pipeline"  # run_dream_analysis end to end; the synthesis is judged
+    GENERALIST = "generalist"
+    SYMBOL = "symbol_specialist"
+    EMOTION = "emotion_specialist"
+    THEME = "theme_specialist"
+
+
+class EvalDream(BaseModel):
+    """One dataset line. `context` is the generalist output given to specialist targets."""
+
+    id: str
+    content: str = Field(..., min_length=1)
+    context: str | None = None
+
+
+class EvalSpec(BaseModel):
+    """An eval: every dream × target × model × prompt variant × repeat is one cell."""
+
+    name: str = Field(..., pattern=r"^[\w.-]+$")
+    dataset: str  # NDJSON of {"content", "id"?, "context"?}, relative to the spec file
+    models: list[str] = Field(..., min_length=1)
+    targets: list[EvalTarget] = [EvalTarget.PIPELINE]
+    # Variant name -> agent name -> system prompt ("@path" reads a file next to the spec).
+    # Agents a variant doesn't mention keep their own prompt.
+    prompts: dict[str, dict[str, str]] = {"default": {}}
+    judge_model: str | None = None  # Unset = EVAL_JUDGE_MODEL
+    repeats: int = Field(default=1, ge=1)
+    concurrency: dict[str, int] = {}  # Per provider, overrides EVAL_CONCURRENCY
+
+
+class CellResult(BaseModel):
+    key: str
+    dream_id: str
+    target: EvalTarget
+    model: str
+    prompt: str  # Variant name
+    repeat: int
+    status: str  # "ok" or "error"
+    error: str | None = None
+    output: str = ""
+    scores: dict[str, int] = {}  # Judge's depth / relevance / insight for the output
+    score: float | None = None  # Their mean
+    pipeline_scores: dict[str, int] = {}  # The pipeline's own specialist ratings
+    duration_ms: float = 0
+    llm_calls: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    finished_at: datetime
+
+
+class ComparisonRow(BaseModel):
+    target: EvalTarget
+    model: str
+    prompt: str
+    cells: int
+    errors: int
+    score_mean: float | None
+    score_min: float | None
+    duration_p50_ms: float | None
+    duration_p95_ms: float | None
+    prompt_tokens_mean: float | None
+    completion_tokens_mean: float | None
+
+
+class EvalReport(BaseModel):
+    name: str
+    judge_model: str
+    generated_at: datetime
+    cells: int
+    errors: int
+    rows: list[ComparisonRow]  # Best mean score first within each target
@@ -0,0 +1,18 @@
+from datetime import datetime
+from enum import StrEnum
+
+from pydantic import BaseModel
+
+
+class ProfileFormat(StrEnum):
+    HTML = "html"  # pyinstrument
+    PSTATS = "prof"  # cProfile
+
+
+class ProfileInfo(BaseModel):
+    id: str
+    kind: str  # "request" or "pipeline"
+    target: str  # "GET /api/v1/dreams" or "dream 42"
+    started_at: datetime
+    duration_ms: float
+    format: ProfileFormat
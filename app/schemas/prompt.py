@@ -0,0 +1,31 @@
+from pydantic import BaseModel
+
+
+class PromptAgent(BaseModel):
+    """An agent's prompt variants and its PROMPT_EXPERIMENTS split (empty = all default)."""
+
+    agent: str
+    variants: list[str]
+    weights: dict[str, float]
+
+
+class VariantStats(BaseModel):
+    """Analyses one agent produced with one prompt variant in the report window."""
+
+    agent_name: str
+    prompt_variant: str
+    analyses: int
+    scored: int  # Only specialists are rated
+    score_mean: float | None
+    prompt_tokens_mean: float | None
+    completion_tokens_mean: float | None
+    ttft_p50_ms: float | None  # Streaming runs only
+    ttft_p95_ms: float | None
+    duration_p50_ms: float | None
+    duration_p95_ms: float | None
+
+
+class ExperimentReport(BaseModel):
+    days: int
+    model: str | None  # Only analyses by this model, if set
+    rows: list[VariantStats]  # By agent, then variant
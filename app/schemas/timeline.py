@@ -0,0 +1,36 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class TimelineSpan(BaseModel):
+    """One span of a pipeline run. Times are milliseconds from the start of the run."""
+
+    span_id: str
+    parent_id: str | None
+    name: str
+    start_ms: float
+    duration_ms: float
+    status: str
+    attributes: dict
+    critical: bool = False  # On the critical path
+
+
+class CriticalStep(BaseModel):
+    """A span on the critical path and the part of the run's wall time spent in it."""
+
+    span_id: str
+    name: str
+    start_ms: float
+    duration_ms: float
+    self_ms: float  # Critical time not covered by a child on the path
+
+
+class Timeline(BaseModel):
+    dream_id: int
+    trace_id: str
+    started_at: datetime
+    duration_ms: float
+    critical_path: list[CriticalStep]
+    spans: list[TimelineSpan]
+    runs: list[str]  # Trace ids of all recorded runs for the dream, newest first
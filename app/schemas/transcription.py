@@ -0,0 +1,24 @@
+from datetime import datetime
+from enum import StrEnum
+
+from pydantic import BaseModel
+
+
+class TranscriptionStatus(StrEnum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class TranscriptionJob(BaseModel):
+    """A transcription job. `text` grows as chunks finish, so it is useful while running."""
+
+    id: str
+    status: TranscriptionStatus
+    text: str = ""
+    chunks_done: int = 0
+    chunks_total: int | None = None  # Known once the audio has been split
+    error: str | None = None
+    created_at: datetime
+    updated_at: datetime
@@ -0,0 +1,177 @@
+"""
+Production server: preload models once, then fork uvicorn workers that share them.
+
+`uvicorn --workers` spawns fresh interpreters, so every worker imports the app and loads
+its own copy of the embedding model and Whisper. Here the parent imports the app and
+loads the weights, freezes the GC so collections don't dirty the shared pages, binds
+the socket, and forks. Workers inherit the weights copy-on-write and all accept on the
+same socket; the parent only supervises (restarts crashed workers, forwards signals).
+
+    uv run python -m app.serve --workers 4 --port 8000
+
+Only weights are loaded in the parent. Inference before fork would start torch's
+OpenMP thread pool, which isn't fork-safe, so each worker's lifespan warmup runs the
+dummy inference itself.
+"""
+
+import argparse
+import gc
+import os
+import signal
+import sys
+import time
+from collections.abc import Callable
+
+import uvicorn
+from loguru import logger
+
+from app.core.config import get_settings
+from app.core.metrics import mark_worker_dead
+
+settings = get_settings()
+
+# A worker that dies sooner than this after starting is restarted with a delay, so a
+# crash at startup doesn't turn into a fork loop
+MIN_WORKER_UPTIME = 5.0
+
+
+def _loaders() -> dict[str, Callable[[], object]]:
+    from app.core.llm_client import get_litellm
+    from app.ui.embeddings import get_embedding_model
+    from app.ui.whisper import get_whisper
+
+    loaders: dict[str, Callable[[], object]] = {"llm": get_litellm}
+    if not settings.model_server_socket:  # otherwise the model server hosts them
+        loaders["embedding"] = get_embedding_model
+        if settings.serve_ui:
+            loaders["whisper"] = get_whisper
+    return loaders
+
+
+def preload() -> None:
+    """Import the app and load the local models listed in WARMUP, without inference."""
+    import app.main  # noqa: F401 - the whole import tree, shared by every worker
+
+    loaders = _loaders()
+    for name in settings.warmup:
+        if name not in loaders:
+            continue
+        started = time.perf_counter()
+        try:
+            loaders[name]()
+        except Exception as e:
+            # Workers will retry in their own warmup and report it on /ready
+            logger.error(f"Preloading {name} failed: {e}")
+        else:
+            logger.info(f"Preloaded {name} in {time.perf_counter() - started:.1f}s")
+
+
+def _after_fork(workers: int) -> None:
+    gc.enable()
+    for sig in (signal.SIGTERM, signal.SIGINT, signal.SIGCHLD):
+        signal.signal(sig, signal.SIG_DFL)
+
+    # The engine is created at import time; drop any pool state inherited from the parent
+    from app.core.database import engine
+
+    engine.sync_engine.dispose(close=False)
+
+    if "torch" in sys.modules:
+        # Split the cores between workers instead of every worker using all of them
+        torch = sys.modules["torch"]
+        torch.set_num_threads(max(1, (os.cpu_count() or 1) // workers))
+
+
+def _spawn(config: uvicorn.Config, sock, workers: int) -> int:
+    pid = os.fork()
+    if pid:
+        return pid
+
+    code = 0
+    try:
+        _after_fork(workers)
+        uvicorn.Server(config).run(sockets=[sock])
+    except BaseException as e:
+        logger.exception(f"Worker {os.getpid()} crashed: {e}")
+        code = 1
+    finally:
+        os._exit(code)
+
+
+def serve(host: str, port: int, workers: int, preload_models: bool = True) -> None:
+    # No collections while preloading; whatever survives is frozen below so the GC
+    # never touches (and un-shares) those objects in the workers
+    gc.disable()
+    if preload_models:
+        preload()
+    else:
+        import app.main  # noqa: F401
+
+    from app.main import app
+
+    config = uvicorn.Config(app, host=host, port=port, proxy_headers=True, lifespan="on")
+    sock = config.bind_socket()
+
+    gc.collect()
+    gc.freeze()
+
+    children: dict[int, float] = {}
+    stopping = False
+
+    def stop(sig, frame) -> None:
+        nonlocal stopping
+        stopping = True
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    for _ in range(workers):
+        children[_spawn(config, sock, workers)] = time.monotonic()
+    logger.info(f"Serving on {host}:{port} with {workers} workers: {sorted(children)}")
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        started = children.pop(pid, None)
+        if started is None:
+            continue
+        mark_worker_dead(pid)
+        if stopping:
+            continue
+        logger.warning(f"Worker {pid} exited with status {os.waitstatus_to_exitcode(status)}")
+        if time.monotonic() - started < MIN_WORKER_UPTIME:
+            time.sleep(MIN_WORKER_UPTIME)
+        if not stopping:
+            children[_spawn(config, sock, workers)] = time.monotonic()
+
+    sock.close()
+    logger.info("All workers stopped")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve the API with preloaded, forked workers.")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--workers", type=int, default=settings.serve_workers or os.cpu_count() or 1
+    )
+    parser.add_argument(
+        "--no-preload",
+        action="store_true",
+        help="Don't load models before forking (each worker loads its own copy)",
+    )
+    args = parser.parse_args()
+    serve(args.host, args.port, args.workers, preload_models=not args.no_preload)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,52 @@
+import time
+from collections.abc import AsyncIterator, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.agents.base_agent import BaseAgent
+from app.agents.prompts import DEFAULT_VARIANT
+from app.core.cache import invalidate_dream
+from app.core.metrics import DB_WRITE_LATENCY, collect_llm_calls
+from app.core.tracing import DREAM_ID, in_own_task, span
 from app.db.models.analysis import Analysis
 
 
+@dataclass
+class AgentRun:
+    """What one agent run cost, stored with its analysis."""
+
+    duration_ms: float | None = None
+    prompt_tokens: int | None = None
+    completion_tokens: int | None = None
+    ttft_ms: float | None = None  # Streaming runs only
+
+
+@contextmanager
+def measure_run() -> Iterator[AgentRun]:
+    """Time the block and total the tokens of the LLM calls made in it."""
+    run = AgentRun()
+    started = time.perf_counter()
+    with collect_llm_calls() as calls:
+        yield run
+    run.duration_ms = round((time.perf_counter() - started) * 1000, 1)
+    run.prompt_tokens = sum(call.prompt_tokens for call in calls)
+    run.completion_tokens = sum(call.completion_tokens for call in calls)
+    if calls and calls[0].first_token_at is not None:
+        run.ttft_ms = round((calls[0].first_token_at - started) * 1000, 1)
+
+
+@in_own_task
+async def measure_stream(chunks: AsyncIterator[str], run: AgentRun) -> AsyncIterator[str]:
+    """Pass an agent's stream through, filling in `run` once it ends."""
+    with measure_run() as measured:
+        async for chunk in chunks:
+            yield chunk
+    vars(run).update(vars(measured))
+
+
 class AnalysisService:
     def __init__(self, db: AsyncSession):
         self.db = db
@@ -16,17 +58,30 @@ class AnalysisService:
         agent_type: str,
         model_used: str,
         content: str,
+        prompt_variant: str = DEFAULT_VARIANT,
+        run: AgentRun | None = None,
     ) -> Analysis:
+        run = run or AgentRun()
         analysis = Analysis(
             dream_id=dream_id,
             agent_name=agent_name,
             agent_type=agent_type,
             model_used=model_used,
             content=content,
+            prompt_variant=prompt_variant,
+            duration_ms=run.duration_ms,
+            prompt_tokens=run.prompt_tokens,
+            completion_tokens=run.completion_tokens,
+            ttft_ms=run.ttft_ms,
         )
-        self.db.add(analysis)
-        await self.db.commit()
-        await self.db.refresh(analysis)
+        with (
+            span("db.create_analysis", **{DREAM_ID: dream_id, "agent.name": agent_name}),
+            DB_WRITE_LATENCY.labels("create_analysis").time(),
+        ):
+            self.db.add(analysis)
+            await self.db.commit()
+            await self.db.refresh(analysis)
+            await invalidate_dream(dream_id)
         return analysis
 
     async def run_agent(
@@ -37,21 +92,29 @@ class AnalysisService:
         context: str | None = None,
     ) -> Analysis:
         """Run any agent and save result to DB."""
-        content = await agent.analyze(dream_content, context=context)
+        with measure_run() as run:
+            content = await agent.analyze(dream_content, context=context)
         return await self.create_analysis(
             dream_id=dream_id,
             agent_name=agent.name,
             agent_type=agent.agent_type,
             model_used=agent.model,
             content=content,
+            prompt_variant=agent.prompt_variant,
+            run=run,
         )
 
     async def update_analysis_score(self, analysis_id: int, score: int) -> None:
-        result = await self.db.execute(select(Analysis).where(Analysis.id == analysis_id))
-        analysis = result.scalar_one_or_none()
-        if analysis:
-            analysis.score = score
-            await self.db.commit()
+        with (
+            span("db.update_analysis_score", **{"analysis.id": analysis_id}),
+            DB_WRITE_LATENCY.labels("update_analysis_score").time(),
+        ):
+            result = await self.db.execute(select(Analysis).where(Analysis.id == analysis_id))
+            analysis = result.scalar_one_or_none()
+            if analysis:
+                analysis.score = score
+                await self.db.commit()
+                await invalidate_dream(analysis.dream_id)
 
     async def get_analyses_for_dream(self, dream_id: int) -> list[Analysis]:
         result = await self.db.execute(
@@ -2,14 +2,34 @@ from collections.abc import Sequence
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import select
+from sqlalchemy import select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.core.cache import invalidate_dream
+from app.db.models.analysis import Analysis
 from app.db.models.dream import Dream
 
 if TYPE_CHECKING:
-    from app.db.models.analysis import Analysis  # noqa: F401
+    from sqlalchemy.sql import Select
+
+# Column order mirrors DreamRead / AnalysisRead so row dicts serialize identically
+_DREAM_COLUMNS = (Dream.id, Dream.content, Dream.dream_date, Dream.created_at, Dream.updated_at)
+_ANALYSIS_COLUMNS = (
+    Analysis.id,
+    Analysis.dream_id,
+    Analysis.agent_name,
+    Analysis.agent_type,
+    Analysis.model_used,
+    Analysis.content,
+    Analysis.score,
+    Analysis.duration_ms,
+    Analysis.prompt_variant,
+    Analysis.prompt_tokens,
+    Analysis.completion_tokens,
+    Analysis.ttft_ms,
+    Analysis.created_at,
+)
 
 
 class DreamService:
@@ -42,6 +62,7 @@ class DreamService:
         self.db.add(dream)
         await self.db.commit()
         await self.db.refresh(dream)  # Get the generated id and timestamps
+        await invalidate_dream(dream.id)
 
         return dream
 
@@ -65,6 +86,56 @@ class DreamService:
         )
         return result.scalars().all()
 
+    async def get_dream_rows(self, skip: int = 0, limit: int = 100) -> list[dict]:
+        """
+        Same page as get_all_dreams, as plain dicts shaped like DreamRead.
+
+        Skips ORM instance construction and Pydantic validation entirely; intended for
+        read-only responses that are serialized straight to JSON.
+
+        Args:
+            skip: Number of records to skip (for pagination)
+            limit: Maximum number of records to return
+
+        Returns:
+            List of dream dicts, each with an "analyses" list of analysis dicts
+        """
+        return await self._rows(
+            select(*_DREAM_COLUMNS).order_by(Dream.created_at.desc()).offset(skip).limit(limit)
+        )
+
+    async def get_dream_row(self, dream_id: int) -> dict | None:
+        """
+        Get one dream as a plain dict shaped like DreamRead.
+
+        Args:
+            dream_id: The dream ID to fetch
+
+        Returns:
+            Dream dict with its "analyses", or None if not found
+        """
+        rows = await self._rows(select(*_DREAM_COLUMNS).where(Dream.id == dream_id))
+        return rows[0] if rows else None
+
+    async def _rows(self, stmt: "Select") -> list[dict]:
+        dreams = [dict(row._mapping) for row in (await self.db.execute(stmt)).all()]
+        if not dreams:
+            return dreams
+
+        by_id: dict[int, dict] = {}
+        for dream in dreams:
+            dream["analyses"] = []
+            by_id[dream["id"]] = dream
+
+        result = await self.db.execute(
+            select(*_ANALYSIS_COLUMNS)
+            .where(Analysis.dream_id.in_(by_id))
+            .order_by(Analysis.created_at.asc(), Analysis.id.asc())
+        )
+        for row in result.all():
+            by_id[row.dream_id]["analyses"].append(dict(row._mapping))
+        return dreams
+
     async def get_dream_by_id(self, dream_id: int) -> Dream | None:
         """
         Get a dream by its ID.
@@ -128,6 +199,7 @@ class DreamService:
 
         await self.db.commit()
         await self.db.refresh(dream)
+        await invalidate_dream(dream_id)
 
         return dream
 
@@ -148,5 +220,48 @@ class DreamService:
 
         await self.db.delete(dream)
         await self.db.commit()
+        await invalidate_dream(dream_id)
 
         return True
+
+    async def get_similar_dreams(self, dream_id: int, limit: int = 3) -> list[dict]:
+        """
+        Find dreams with similar synthesis embeddings using pgvector cosine distance.
+
+        Args:
+            dream_id: Dream to compare against
+            limit: Maximum number of similar dreams
+
+        Returns:
+            List of {id, content (100-char preview), similarity (0-100)}; empty if the
+            dream has no embedding yet
+        """
+        result = await self.db.execute(
+            text("SELECT embedding FROM dreams WHERE id = :id"), {"id": dream_id}
+        )
+        row = result.fetchone()
+        if not row or not row[0]:
+            return []
+
+        # Find similar dreams by cosine distance
+        query = text("""
+            SELECT id, content, 1 - (embedding <=> CAST(:target AS vector)) as similarity
+            FROM dreams
+            WHERE id != :dream_id AND embedding IS NOT NULL
+            ORDER BY embedding <=> CAST(:target AS vector)
+            LIMIT :limit
+        """)
+
+        result = await self.db.execute(
+            query, {"target": row[0], "dream_id": dream_id, "limit": limit}
+        )
+        rows = result.fetchall()
+
+        return [
+            {
+                "id": r[0],
+                "content": r[1][:100] + ("..." if len(r[1]) > 100 else ""),
+                "similarity": round(float(r[2]) * 100),
+            }
+            for r in rows
+        ]
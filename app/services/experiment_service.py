@@ -0,0 +1,69 @@
+"""
+Per-variant stats for prompt A/B tests (PROMPT_EXPERIMENTS, see app.agents.prompts).
+
+Every analysis records the variant its agent ran with, so a report is one grouped query
+over `analyses`: score, token and latency aggregates per agent and variant. TTFT is only
+measured for streaming runs; the other stats cover both pipelines.
+"""
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.analysis import Analysis
+from app.schemas.prompt import ExperimentReport, VariantStats
+
+
+def _round(value, digits: int = 1) -> float | None:
+    return None if value is None else round(float(value), digits)
+
+
+class ExperimentService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def report(
+        self, days: int, agent: str | None = None, model: str | None = None
+    ) -> ExperimentReport:
+        window = func.now() - func.make_interval(0, 0, 0, days)
+        stmt = (
+            select(
+                Analysis.agent_name,
+                Analysis.prompt_variant,
+                func.count(),
+                func.count(Analysis.score),
+                func.avg(Analysis.score),
+                func.avg(Analysis.prompt_tokens),
+                func.avg(Analysis.completion_tokens),
+                func.percentile_cont(0.5).within_group(Analysis.ttft_ms),
+                func.percentile_cont(0.95).within_group(Analysis.ttft_ms),
+                func.percentile_cont(0.5).within_group(Analysis.duration_ms),
+                func.percentile_cont(0.95).within_group(Analysis.duration_ms),
+            )
+            .where(Analysis.created_at >= window)
+            .group_by(Analysis.agent_name, Analysis.prompt_variant)
+            .order_by(Analysis.agent_name, Analysis.prompt_variant)
+        )
+        if agent is not None:
+            stmt = stmt.where(Analysis.agent_name == agent)
+        if model is not None:
+            stmt = stmt.where(Analysis.model_used == model)
+
+        rows = []
+        for row in (await self.db.execute(stmt)).all():
+            agent_name, variant, analyses, scored, score, p_tok, c_tok, *latencies = row
+            rows.append(
+                VariantStats(
+                    agent_name=agent_name,
+                    prompt_variant=variant,
+                    analyses=analyses,
+                    scored=scored,
+                    score_mean=_round(score, 2),
+                    prompt_tokens_mean=_round(p_tok),
+                    completion_tokens_mean=_round(c_tok),
+                    ttft_p50_ms=_round(latencies[0]),
+                    ttft_p95_ms=_round(latencies[1]),
+                    duration_p50_ms=_round(latencies[2]),
+                    duration_p95_ms=_round(latencies[3]),
+                )
+            )
+        return ExperimentReport(days=days, model=model, rows=rows)
@@ -0,0 +1,215 @@
+import csv
+import io
+import json
+from collections.abc import AsyncIterator
+from datetime import datetime
+from enum import StrEnum
+
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.analysis import Analysis
+from app.db.models.dream import Dream
+
+# One row per (dream, analysis) pair. Dreams without analyses export once with empty
+# analysis columns. Order matters: CSV header and Parquet schema follow it.
+EXPORT_COLUMNS: list[str] = [
+    "dream_id",
+    "dream_date",
+    "dream_created_at",
+    "dream_updated_at",
+    "dream_content",
+    "analysis_id",
+    "agent_name",
+    "agent_type",
+    "model_used",
+    "analysis_content",
+    "score",
+    "analysis_created_at",
+]
+
+
+class ExportFormat(StrEnum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+    PARQUET = "parquet"
+
+
+MEDIA_TYPES: dict[ExportFormat, str] = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+    ExportFormat.PARQUET: "application/vnd.apache.parquet",
+}
+
+
+class ExportService:
+    """Streams dreams + analyses out of the DB without materializing the table."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def iter_batches(
+        self,
+        batch_size: int = 1000,
+        date_from: datetime | None = None,
+        date_to: datetime | None = None,
+        model_used: str | None = None,
+        after_id: int = 0,
+    ) -> AsyncIterator[list[dict]]:
+        """
+        Yield export rows in batches using a server-side cursor.
+
+        Args:
+            batch_size: Rows fetched per round trip (yield_per)
+            date_from: Only dreams with dream_date >= this
+            date_to: Only dreams with dream_date < this
+            model_used: Only analyses produced by this model (dreams without one are skipped)
+            after_id: Resume point — only dreams with id > after_id
+
+        Yields:
+            Lists of row dicts keyed by EXPORT_COLUMNS
+        """
+        join_on = [Analysis.dream_id == Dream.id]
+        if model_used:
+            join_on.append(Analysis.model_used == model_used)
+
+        filters = [Dream.id > after_id]
+        if date_from:
+            filters.append(Dream.dream_date >= date_from)
+        if date_to:
+            filters.append(Dream.dream_date < date_to)
+
+        stmt = (
+            select(
+                Dream.id.label("dream_id"),
+                Dream.dream_date,
+                Dream.created_at.label("dream_created_at"),
+                Dream.updated_at.label("dream_updated_at"),
+                Dream.content.label("dream_content"),
+                Analysis.id.label("analysis_id"),
+                Analysis.agent_name,
+                Analysis.agent_type,
+                Analysis.model_used,
+                Analysis.content.label("analysis_content"),
+                Analysis.score,
+                Analysis.created_at.label("analysis_created_at"),
+            )
+            .join(Analysis, and_(*join_on), isouter=not model_used)
+            .where(*filters)
+            # Rows of one dream stay contiguous, so after_id resumes on a dream boundary
+            .order_by(Dream.id, Analysis.id)
+            .execution_options(yield_per=batch_size)
+        )
+
+        result = await self.db.stream(stmt)
+        async for partition in result.partitions():
+            yield [dict(row._mapping) for row in partition]
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+async def _ndjson(batches: AsyncIterator[list[dict]]) -> AsyncIterator[bytes]:
+    async for batch in batches:
+        yield "".join(
+            json.dumps(row, default=_json_default, ensure_ascii=False) + "\n" for row in batch
+        ).encode()
+
+
+async def _csv(batches: AsyncIterator[list[dict]]) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS)
+    writer.writeheader()
+    async for batch in batches:
+        writer.writerows(batch)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object that hands written bytes back to the caller."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _parquet_schema():
+    import pyarrow as pa
+
+    ts = pa.timestamp("us", tz="UTC")
+    return pa.schema(
+        [
+            ("dream_id", pa.int64()),
+            ("dream_date", ts),
+            ("dream_created_at", ts),
+            ("dream_updated_at", ts),
+            ("dream_content", pa.string()),
+            ("analysis_id", pa.int64()),
+            ("agent_name", pa.string()),
+            ("agent_type", pa.string()),
+            ("model_used", pa.string()),
+            ("analysis_content", pa.string()),
+            ("score", pa.int32()),
+            ("analysis_created_at", ts),
+        ]
+    )
+
+
+async def _parquet(batches: AsyncIterator[list[dict]]) -> AsyncIterator[bytes]:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _parquet_schema()
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema)
+    try:
+        # Each DB batch becomes one row group, flushed to the client as soon as it is written
+        async for batch in batches:
+            writer.write_batch(pa.RecordBatch.from_pylist(batch, schema=schema))
+            if data := sink.drain():
+                yield data
+    finally:
+        writer.close()
+    if data := sink.drain():
+        yield data
+
+
+def parquet_available() -> bool:
+    try:
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def serialize(batches: AsyncIterator[list[dict]], fmt: ExportFormat) -> AsyncIterator[bytes]:
+    """Turn row batches into an incremental byte stream in the requested format."""
+    if fmt == ExportFormat.CSV:
+        return _csv(batches)
+    if fmt == ExportFormat.PARQUET:
+        return _parquet(batches)
+    return _ndjson(batches)
@@ -0,0 +1,144 @@
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime
+
+from loguru import logger
+from pydantic import ValidationError
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import invalidate_dream
+from app.schemas.dream import DreamCreate, DreamImportResult, ImportLineError
+from app.ui.embeddings import embed_texts
+
+# Cap on per-line errors returned to the caller; everything past this is only counted
+MAX_REPORTED_ERRORS = 100
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Split an arbitrary byte stream into lines without buffering the whole body."""
+    pending = b""
+    async for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            yield line
+    if pending:
+        yield pending
+
+
+class ImportService:
+    """Bulk-loads dreams from NDJSON using Postgres COPY."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def import_ndjson(
+        self,
+        lines: AsyncIterator[bytes],
+        chunk_size: int = 1000,
+        embed: bool = False,
+    ) -> DreamImportResult:
+        """
+        Import dreams from NDJSON lines, one DreamCreate object per line.
+
+        Args:
+            lines: NDJSON lines (blank lines are ignored)
+            chunk_size: Rows per COPY + commit
+            embed: Also compute content embeddings in batches for each chunk, stored in
+                content_embedding (`embedding` holds the synthesis embedding that the
+                pipeline writes and /similar compares)
+
+        Returns:
+            DreamImportResult with new ids, per-line errors and throughput
+        """
+        started = time.perf_counter()
+        dream_ids: list[int] = []
+        errors: list[ImportLineError] = []
+        failed = 0
+
+        chunk: list[tuple[int, DreamCreate]] = []
+        line_no = 0
+
+        async def flush() -> None:
+            nonlocal failed
+            try:
+                dream_ids.extend(await self._copy_chunk([item for _, item in chunk], embed))
+            except Exception as e:
+                await self.db.rollback()
+                logger.error(f"Import chunk at lines {chunk[0][0]}-{chunk[-1][0]} failed: {e}")
+                failed += len(chunk)
+                for n, _ in chunk:
+                    if len(errors) < MAX_REPORTED_ERRORS:
+                        errors.append(ImportLineError(line=n, error=f"chunk insert failed: {e}"))
+            chunk.clear()
+
+        async for raw in lines:
+            line_no += 1
+            if not raw.strip():
+                continue
+            try:
+                chunk.append((line_no, DreamCreate.model_validate_json(raw)))
+            except ValidationError as e:
+                failed += 1
+                if len(errors) < MAX_REPORTED_ERRORS:
+                    errors.append(ImportLineError(line=line_no, error=str(e)))
+                continue
+            if len(chunk) >= chunk_size:
+                await flush()
+
+        if chunk:
+            await flush()
+
+        seconds = time.perf_counter() - started
+        logger.info(f"Imported {len(dream_ids)} dreams ({failed} failed) in {seconds:.2f}s")
+        return DreamImportResult(
+            imported=len(dream_ids),
+            failed=failed,
+            dream_ids=dream_ids,
+            errors=errors,
+            embedded=embed,
+            analysis_enqueued=0,
+            seconds=round(seconds, 3),
+            rows_per_second=round(len(dream_ids) / seconds, 1) if seconds else 0.0,
+        )
+
+    async def _copy_chunk(self, items: list[DreamCreate], embed: bool) -> list[int]:
+        conn = await self.db.connection()
+
+        # COPY can't return generated keys, so reserve ids up front from the sequence
+        result = await conn.execute(
+            text(
+                "SELECT nextval(pg_get_serial_sequence('dreams', 'id')) FROM generate_series(1, :n)"
+            ),
+            {"n": len(items)},
+        )
+        ids = list(result.scalars().all())
+
+        now = datetime.now(UTC)
+        records = [
+            (dream_id, item.content, item.dream_date or now)
+            for dream_id, item in zip(ids, items, strict=True)
+        ]
+        raw = await conn.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(  # type: ignore[union-attr]
+            "dreams",
+            records=records,
+            columns=["id", "content", "dream_date"],
+        )
+
+        if embed:
+            vectors = await asyncio.to_thread(embed_texts, [item.content for item in items])
+            await conn.execute(
+                text("""
+                    UPDATE dreams SET content_embedding = CAST(v.emb AS vector)
+                    FROM unnest(CAST(:ids AS integer[]), CAST(:embs AS text[])) AS v(id, emb)
+                    WHERE dreams.id = v.id
+                """),
+                {"ids": ids, "embs": [str(v) for v in vectors]},
+            )
+
+        await self.db.commit()
+        await invalidate_dream()
+        return ids
@@ -0,0 +1,185 @@
+"""
+Per-agent model selection (MODEL_ROUTES).
+
+Each agent can get its own route instead of the request's model:
+  fixed                 always `model` (e.g. a small local judge)
+  cheapest_above_score  the cheapest candidate whose mean score is >= `min_score`
+  fastest_p95           the candidate with the lowest p95 duration
+
+History comes from `analyses` (score, duration_ms) of the last MODEL_ROUTER_WINDOW_DAYS,
+aggregated per agent and model and cached for MODEL_ROUTER_REFRESH_SECONDS. Only
+specialists are scored, so agents without scores of their own are judged by the model's
+scores across all agents. Candidates with fewer than MODEL_ROUTER_MIN_SAMPLES runs are
+skipped; if none qualifies, or the history can't be read, the request's model is used.
+The selected model is what agents record in `model_used`.
+
+Skipped candidates would never be picked, so never get samples: a MODEL_ROUTER_EXPLORE_RATE
+share of requests goes to a random under-sampled candidate instead. Once every candidate
+has enough history, exploration stops.
+"""
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+
+from loguru import logger
+from sqlalchemy import func, select
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.config import ModelRoute, RoutingPolicy, get_settings
+from app.core.database import AsyncSessionLocal
+from app.core.models_config import MODEL_COSTS
+from app.db.models.analysis import Analysis
+
+settings = get_settings()
+
+_LOCAL_PROVIDERS = ("ollama/", "stub/")
+
+
+@dataclass
+class ModelStats:
+    runs: int  # Analyses with a duration
+    p95_ms: float | None
+    scored: int
+    score_sum: float
+
+    @property
+    def mean_score(self) -> float | None:
+        return self.score_sum / self.scored if self.scored else None
+
+
+class _StatsCache:
+    def __init__(self):
+        self.loaded_at = float("-inf")
+        self.by_agent: dict[tuple[str, str], ModelStats] = {}  # (agent, model)
+        self.by_model: dict[str, ModelStats] = {}  # Scores across agents
+        self.lock = asyncio.Lock()
+
+
+_cache = _StatsCache()
+
+
+def model_cost(model: str) -> float | None:
+    """Blended USD per 1M tokens (input + output), 0 for local models, None if unknown."""
+    if model.startswith(_LOCAL_PROVIDERS):
+        return 0.0
+    prices = settings.model_costs.get(model) or MODEL_COSTS.get(model)
+    return sum(prices) if prices else None
+
+
+async def _load_stats() -> None:
+    window = func.now() - func.make_interval(0, 0, 0, settings.model_router_window_days)
+    stmt = (
+        select(
+            Analysis.agent_name,
+            Analysis.model_used,
+            func.count(Analysis.duration_ms),
+            func.percentile_cont(0.95).within_group(Analysis.duration_ms),
+            func.count(Analysis.score),
+            func.coalesce(func.sum(Analysis.score), 0),
+        )
+        .where(Analysis.created_at >= window)
+        .group_by(Analysis.agent_name, Analysis.model_used)
+    )
+    async with AsyncSessionLocal() as db:
+        rows = (await db.execute(stmt)).all()
+
+    by_agent: dict[tuple[str, str], ModelStats] = {}
+    by_model: dict[str, ModelStats] = {}
+    for agent, model, runs, p95, scored, score_sum in rows:
+        by_agent[(agent, model)] = ModelStats(runs, p95, scored, float(score_sum))
+        total = by_model.setdefault(model, ModelStats(0, None, 0, 0.0))
+        total.scored += scored
+        total.score_sum += float(score_sum)
+    _cache.by_agent, _cache.by_model = by_agent, by_model
+    _cache.loaded_at = time.monotonic()
+
+
+async def _fresh_stats() -> _StatsCache:
+    if time.monotonic() - _cache.loaded_at >= settings.model_router_refresh_seconds:
+        async with _cache.lock:
+            if time.monotonic() - _cache.loaded_at >= settings.model_router_refresh_seconds:
+                await _load_stats()
+    return _cache
+
+
+def _mean_score(stats: _StatsCache, agent: str, model: str) -> float | None:
+    own = stats.by_agent.get((agent, model))
+    if own and own.scored >= settings.model_router_min_samples:
+        return own.mean_score
+    overall = stats.by_model.get(model)
+    if overall and overall.scored >= settings.model_router_min_samples:
+        return overall.mean_score
+    return None
+
+
+def _cheapest_above_score(route: ModelRoute, stats: _StatsCache, agent: str) -> str | None:
+    passing = [
+        model
+        for model in route.candidates
+        if (score := _mean_score(stats, agent, model)) is not None and score >= route.min_score
+    ]
+    if not passing:
+        return None
+
+    def cost(model: str) -> tuple[bool, float]:
+        price = model_cost(model)
+        return price is None, price or 0.0  # Unknown prices last
+
+    return min(passing, key=cost)
+
+
+def _fastest_p95(route: ModelRoute, stats: _StatsCache, agent: str) -> str | None:
+    timed = {
+        model: own.p95_ms
+        for model in route.candidates
+        if (own := stats.by_agent.get((agent, model)))
+        and own.runs >= settings.model_router_min_samples
+        and own.p95_ms is not None
+    }
+    return min(timed, key=timed.__getitem__) if timed else None
+
+
+def _under_sampled(route: ModelRoute, stats: _StatsCache, agent: str) -> list[str]:
+    """Candidates the route's policy skips for lack of history."""
+    if route.policy == RoutingPolicy.CHEAPEST_ABOVE_SCORE:
+        return [model for model in route.candidates if _mean_score(stats, agent, model) is None]
+    return [
+        model
+        for model in route.candidates
+        if not (own := stats.by_agent.get((agent, model)))
+        or own.runs < settings.model_router_min_samples
+        or own.p95_ms is None
+    ]
+
+
+async def select_model(agent: str, requested: str, routing: bool = True) -> str:
+    """The model `agent` should run with for a request that asked for `requested`."""
+    route = settings.model_routes.get(agent)
+    if not routing or route is None:
+        return requested
+    if route.policy == RoutingPolicy.FIXED:
+        return route.model or requested
+
+    try:
+        stats = await _fresh_stats()
+    except SQLAlchemyError as e:
+        logger.warning(f"Model routing for {agent} fell back to {requested}: {e}")
+        return requested
+
+    unexplored = _under_sampled(route, stats, agent)
+    if unexplored and random.random() < settings.model_router_explore_rate:
+        selected = random.choice(unexplored)
+        logger.info(f"Routed {agent} to {selected} to build its history ({route.policy})")
+        return selected
+
+    if route.policy == RoutingPolicy.CHEAPEST_ABOVE_SCORE:
+        selected = _cheapest_above_score(route, stats, agent)
+    else:
+        selected = _fastest_p95(route, stats, agent)
+    if selected is None:
+        logger.info(f"No {route.policy} candidate with enough history for {agent}: {requested}")
+        return requested
+    logger.info(f"Routed {agent} to {selected} ({route.policy})")
+    return selected
@@ -0,0 +1,119 @@
+"""
+Per-dream run timelines from the JSON span files written by app.core.tracing.
+
+The critical path is the chain of spans that determined the run's wall time: walking
+back from the end of a span, the child that finished last is on it, then whichever
+child finished last before that one started, and so on, recursively. Time on the path
+not covered by a child is the span's own (`self_ms`).
+"""
+
+import json
+from collections import defaultdict
+from datetime import UTC, datetime
+
+from app.core.tracing import dream_spans_path
+from app.schemas.timeline import CriticalStep, Timeline, TimelineSpan
+
+
+def read_dream_spans(dream_id: int) -> list[dict]:
+    """All recorded spans of a dream (every run), or [] if none were exported."""
+    path = dream_spans_path(dream_id)
+    if not path.exists():
+        return []
+    with path.open() as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def runs_by_recency(spans: list[dict]) -> list[str]:
+    started: dict[str, int] = {}
+    for span in spans:
+        trace_id = span["trace_id"]
+        started[trace_id] = min(started.get(trace_id, span["start"]), span["start"])
+    return sorted(started, key=started.__getitem__, reverse=True)
+
+
+def critical_path(spans: list[dict]) -> list[tuple[dict, int]]:
+    """(span, self time in ns) for the spans on the critical path of one trace."""
+    ids = {span["span_id"] for span in spans}
+    children: dict[str | None, list[dict]] = defaultdict(list)
+    for span in spans:
+        # Spans whose parent wasn't exported (yet) hang off a virtual root
+        parent = span["parent_id"] if span["parent_id"] in ids else None
+        children[parent].append(span)
+    for siblings in children.values():
+        siblings.sort(key=lambda s: s["end"], reverse=True)
+
+    path: list[tuple[dict, int]] = []
+
+    def walk(span: dict, until: int) -> int:
+        cursor = min(span["end"], until)
+        own = 0
+        for child in children.get(span["span_id"], []):
+            if child["start"] >= cursor:
+                continue
+            child_end = min(child["end"], cursor)
+            own += cursor - child_end
+            # Take the slot before recursing, so a parent precedes children starting with it
+            index = len(path)
+            path.append((child, 0))
+            path[index] = (child, walk(child, child_end))
+            cursor = max(child["start"], span["start"])
+        return own + max(cursor - span["start"], 0)
+
+    root = {
+        "span_id": None,
+        "start": min(span["start"] for span in spans),
+        "end": max(span["end"] for span in spans),
+    }
+    walk(root, root["end"])
+    return sorted(path, key=lambda step: step[0]["start"])
+
+
+def build_timeline(
+    dream_id: int, spans: list[dict], trace_id: str | None = None
+) -> Timeline | None:
+    """Timeline of one run (the latest unless `trace_id` is given), or None if unknown."""
+    runs = runs_by_recency(spans)
+    trace_id = trace_id or (runs[0] if runs else None)
+    run = [span for span in spans if span["trace_id"] == trace_id]
+    if not run:
+        return None
+
+    start = min(span["start"] for span in run)
+    end = max(span["end"] for span in run)
+    path = critical_path(run)
+    on_path = {span["span_id"] for span, _ in path}
+
+    def ms(ns: int) -> float:
+        return round(ns / 1e6, 3)
+
+    return Timeline(
+        dream_id=dream_id,
+        trace_id=trace_id,  # type: ignore[arg-type]
+        started_at=datetime.fromtimestamp(start / 1e9, UTC),
+        duration_ms=ms(end - start),
+        critical_path=[
+            CriticalStep(
+                span_id=span["span_id"],
+                name=span["name"],
+                start_ms=ms(span["start"] - start),
+                duration_ms=ms(span["end"] - span["start"]),
+                self_ms=ms(own),
+            )
+            for span, own in path
+        ],
+        spans=[
+            TimelineSpan(
+                span_id=span["span_id"],
+                parent_id=span["parent_id"],
+                name=span["name"],
+                start_ms=ms(span["start"] - start),
+                duration_ms=ms(span["end"] - span["start"]),
+                status=span["status"],
+                attributes=span["attributes"],
+                critical=span["span_id"] in on_path,
+            )
+            for span in sorted(run, key=lambda s: s["start"])
+        ],
+        runs=runs,
+    )
@@ -1,9 +1,17 @@
 from loguru import logger
 
+from app.core.config import get_settings
+from app.core.metrics import EMBEDDING_BATCH_SIZE
+from app.core.tracing import span
+
+settings = get_settings()
+
+EMBEDDING_DIMENSIONS = 384  # all-MiniLM-L6-v2; matches the dreams.embedding vector(384) column
+
 _model = None
 
 
-def _get_embedding_model():
+def get_embedding_model():
     global _model
     if _model is None:
         from sentence_transformers import SentenceTransformer
@@ -14,9 +22,32 @@ def _get_embedding_model():
     return _model
 
 
+def _encode(texts: list[str], batch_size: int = 32) -> list[list[float]]:
+    backend = "model_server" if settings.model_server_socket else "local"
+    EMBEDDING_BATCH_SIZE.labels(backend).observe(len(texts))
+    with span("embed", **{"embedding.texts": len(texts), "embedding.backend": backend}):
+        if settings.model_server_socket:
+            from app.core import model_client
+
+            return model_client.embed(texts).tolist()
+        model = get_embedding_model()
+        return model.encode(texts, batch_size=batch_size, show_progress_bar=False).tolist()
+
+
 def embed_text(text: str) -> list[float]:
     """Embed text into a 384-dimensional vector using sentence-transformers."""
     if not text or not text.strip():
-        return [0.0] * 384
-    model = _get_embedding_model()
-    return model.encode(text, show_progress_bar=False).tolist()
+        return [0.0] * EMBEDDING_DIMENSIONS
+    return _encode([text])[0]
+
+
+def embed_texts(texts: list[str], batch_size: int = 32) -> list[list[float]]:
+    """Embed many texts in batches. Blank texts get a zero vector, like embed_text."""
+    vectors: list[list[float]] = [[0.0] * EMBEDDING_DIMENSIONS for _ in texts]
+    indexed = [(i, t) for i, t in enumerate(texts) if t and t.strip()]
+    if not indexed:
+        return vectors
+    encoded = _encode([t for _, t in indexed], batch_size=batch_size)
+    for (i, _), vector in zip(indexed, encoded, strict=True):
+        vectors[i] = vector
+    return vectors
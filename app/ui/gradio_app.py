@@ -1,8 +1,11 @@
 import gradio as gr
 
+from app.core.config import get_settings
 from app.core.models_config import DEFAULT_MODEL_LABEL, MODEL_LABELS
 from app.ui.handlers import get_past_dreams, run_analysis
-from app.ui.whisper import transcribe_audio
+from app.ui.whisper import transcribe_stream
+
+settings = get_settings()
 
 with gr.Blocks(theme="soft", title="Dreamscape") as gradio_ui:
     gr.Markdown("# 🌙 Dreamscape")
@@ -35,7 +38,7 @@ with gr.Blocks(theme="soft", title="Dreamscape") as gradio_ui:
 
             analyze_btn = gr.Button("🔮 Analyze Dream", variant="primary", size="lg")
 
-            transcribe_btn.click(fn=transcribe_audio, inputs=[mic_input], outputs=[dream_input])
+            transcribe_btn.click(fn=transcribe_stream, inputs=[mic_input], outputs=[dream_input])
 
             with gr.Row():
                 generalist_output = gr.Textbox(label="🗺️ Overview", lines=6, max_lines=15, scale=1)
@@ -75,6 +78,8 @@ with gr.Blocks(theme="soft", title="Dreamscape") as gradio_ui:
                     synthesis_output,
                     similar_dreams,
                 ],
+                # Gradio defaults to 1; handlers are async, so sessions don't hold a thread
+                concurrency_limit=settings.ui_concurrency_limit,
             )
 
         with gr.Tab("📚 Past Dreams"):
@@ -1,11 +1,51 @@
+"""
+Gradio callbacks.
+
+By default they run in-process: async generators on the API's own event loop calling
+the services and streaming workflow directly, so a UI session costs no worker thread,
+no loopback HTTP hop and no JSON round trip. Set UI_API_BASE_URL to drive a remote API
+instead; that path shares one pooled httpx.AsyncClient across all sessions.
+"""
+
 import json
+from collections.abc import AsyncIterator
 
 import httpx
 from loguru import logger
 
+from app.core.config import get_settings
+from app.core.database import AsyncSessionLocal
 from app.core.models_config import DEFAULT_MODEL, MODEL_MAP
+from app.core.sse import coalesce
+from app.services.dream_service import DreamService
+from app.ui.updates import PanelUpdater, paced
+from app.workflows.streaming import stream_pipeline_events
+
+settings = get_settings()
+
+_client: httpx.AsyncClient | None = None
+
+# Last GET /dreams response in remote mode, reused when the API answers 304
+_past_dreams_etag: str | None = None
+_past_dreams: list[dict] = []
+
 
-API_BASE = "http://localhost:8000/api/v1"
+def _get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            base_url=str(settings.ui_api_base_url),
+            timeout=httpx.Timeout(300, connect=10),
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        )
+    return _client
+
+
+async def close_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
 
 
 def _stars(score: int | None) -> str:
@@ -14,145 +54,122 @@ def _stars(score: int | None) -> str:
     return "★" * score + "☆" * (5 - score)
 
 
-def run_analysis(dream_text: str, model_label: str):
-    empty = ("", "", "", "", "", "", "", "", "", [])
-
+async def _local_pipeline_events(dream_text: str, model: str) -> AsyncIterator[dict]:
+    async with AsyncSessionLocal() as db:
+        dream = await DreamService(db).create_dream(content=dream_text)
+    async for event in coalesce(stream_pipeline_events(dream.id, dream.content, model)):
+        yield event
+
+
+async def _remote_pipeline_events(dream_text: str, model: str) -> AsyncIterator[dict]:
+    async with _get_client().stream(
+        "POST", "/dreams/pipeline", json={"content": dream_text, "model": model}
+    ) as response:
+        response.raise_for_status()
+        async for line in response.aiter_lines():
+            if line.startswith("data: "):
+                yield json.loads(line[6:])
+
+
+def _pipeline_events(dream_text: str, model: str) -> AsyncIterator[dict]:
+    if settings.ui_api_base_url:
+        return _remote_pipeline_events(dream_text, model)
+    return _local_pipeline_events(dream_text, model)
+
+
+# Output order of run_analysis, matching the outputs wired up in gradio_app
+PANELS = (
+    "status",
+    "generalist",
+    "symbol_stars",
+    "symbol",
+    "emotion_stars",
+    "emotion",
+    "theme_stars",
+    "theme",
+    "synthesis",
+    "similar",
+)
+
+# Streaming agent -> panel its tokens go to
+AGENT_PANELS = {
+    "generalist": "generalist",
+    "symbol_specialist": "symbol",
+    "emotion_specialist": "emotion",
+    "theme_specialist": "theme",
+    "synthesizer": "synthesis",
+}
+
+
+async def run_analysis(dream_text: str, model_label: str):
     if not dream_text or len(dream_text.strip()) < 10:
-        yield ("❌ Please enter a longer dream (at least 10 characters)", *empty)
+        panels = PanelUpdater(PANELS, similar=[])
+        panels["status"] = "❌ Please enter a longer dream (at least 10 characters)"
+        yield panels.frame()
         return
 
     model = MODEL_MAP.get(model_label, DEFAULT_MODEL)
     model_name = model_label.split("(")[0].strip()
 
-    # Phase 1: create dream
+    # Re-rendering all ten panels per token is what made long streams heavy in the
+    # browser; frames are paced to UI_MAX_FPS and only carry the panels that changed.
+    panels = PanelUpdater(PANELS, similar=[])
+    panels["status"] = f"⏳ Generalist analyzing with {model_name}..."
+    yield panels.frame()
+
+    # Whole pipeline (create → generalist → specialists → rating → synthesizer → similar)
     try:
-        with httpx.Client(timeout=30) as client:
-            resp = client.post(f"{API_BASE}/dreams", json={"content": dream_text})
-            resp.raise_for_status()
-            dream_id = resp.json()["id"]
+        async for batch in paced(_pipeline_events(dream_text, model), settings.ui_max_fps):
+            for data in batch:
+                event = data.get("event")
+
+                if event == "scores":
+                    scores = data["data"]
+                    for name in ("symbol", "emotion", "theme"):
+                        panels[f"{name}_stars"] = _stars(scores.get(name))
+                elif event == "similar":
+                    # Format for Gradio Dataframe: list of lists
+                    panels["similar"] = [
+                        [d["id"], d["content"], d["similarity"]] for d in data["data"]
+                    ]
+                elif event == "error":
+                    raise RuntimeError(data.get("detail", "pipeline failed"))
+                elif "token" in data and data["agent"] in AGENT_PANELS:
+                    panels.append(AGENT_PANELS[data["agent"]], data["token"])
+                    if data["agent"] != "generalist":
+                        panels["status"] = "⏳ Analyzing..."
+
+            if panels.changed:
+                yield panels.frame()
     except Exception as e:
-        yield (f"❌ Failed to create dream: {e}", *empty)
+        logger.error(f"Pipeline error: {e}")
+        panels["status"] = f"❌ Pipeline error: {e}"
+        yield panels.frame()
         return
 
-    def out(status, gen="", ss="", s="", es="", e="", ts="", t="", sy="", similar=None):
-        return (status, gen, ss, s, es, e, ts, t, sy, similar or [])
+    panels["status"] = "✅ Complete"
+    yield panels.frame()
 
-    # Phase 2: stream generalist
-    generalist_text = ""
-    yield out(f"⏳ Generalist analyzing with {model_name}...")
 
-    try:
-        with httpx.Client(timeout=120) as client:
-            with client.stream(
-                "POST",
-                f"{API_BASE}/dreams/{dream_id}/stream-generalist",
-                params={"model": model},
-            ) as response:
-                response.raise_for_status()
-                for chunk in response.iter_text():
-                    generalist_text += chunk
-                    yield out("⏳ Generalist analyzing...", generalist_text)
-    except Exception as e:
-        logger.error(f"Streaming error: {e}")
-        yield out(f"❌ Generalist error: {e}", generalist_text)
-        return
+async def _fetch_past_dreams() -> list[dict]:
+    if not settings.ui_api_base_url:
+        async with AsyncSessionLocal() as db:
+            return await DreamService(db).get_dream_rows(limit=50)
 
-    # Phase 3: stream specialists + rating + synthesizer via SSE
-    symbol_text = ""
-    emotion_text = ""
-    theme_text = ""
-    synthesis_text = ""
-    scores: dict = {}
+    global _past_dreams_etag, _past_dreams
+    headers = {"If-None-Match": _past_dreams_etag} if _past_dreams_etag else {}
+    response = await _get_client().get("/dreams", params={"limit": 50}, headers=headers)
+    if response.status_code == httpx.codes.NOT_MODIFIED:
+        return _past_dreams
+    response.raise_for_status()
+    _past_dreams_etag = response.headers.get("etag")
+    _past_dreams = response.json()
+    return _past_dreams
 
-    yield out("⏳ Running specialists...", generalist_text)
 
+async def get_past_dreams():
     try:
-        with httpx.Client(timeout=300) as client:
-            with client.stream(
-                "POST",
-                f"{API_BASE}/dreams/{dream_id}/stream-analyze",
-                params={"model": model},
-            ) as response:
-                response.raise_for_status()
-                for line in response.iter_lines():
-                    if not line.startswith("data: "):
-                        continue
-                    data = json.loads(line[6:])
-
-                    if data.get("event") == "scores":
-                        scores = data["data"]
-                    elif data.get("event") == "done":
-                        break
-                    elif "token" in data:
-                        agent = data["agent"]
-                        token = data["token"]
-                        if agent == "symbol_specialist":
-                            symbol_text += token
-                        elif agent == "emotion_specialist":
-                            emotion_text += token
-                        elif agent == "theme_specialist":
-                            theme_text += token
-                        elif agent == "synthesizer":
-                            synthesis_text += token
-
-                    yield out(
-                        "⏳ Analyzing...",
-                        generalist_text,
-                        _stars(scores.get("symbol")),
-                        symbol_text,
-                        _stars(scores.get("emotion")),
-                        emotion_text,
-                        _stars(scores.get("theme")),
-                        theme_text,
-                        synthesis_text,
-                    )
-    except Exception as e:
-        logger.error(f"Pipeline error: {e}")
-        yield out(
-            f"❌ Pipeline error: {e}",
-            generalist_text,
-            _stars(scores.get("symbol")),
-            symbol_text,
-            _stars(scores.get("emotion")),
-            emotion_text,
-            _stars(scores.get("theme")),
-            theme_text,
-            synthesis_text,
-        )
-        return
-
-    # Fetch similar dreams
-    similar_dreams = []
-    try:
-        with httpx.Client(timeout=10) as client:
-            resp = client.get(f"{API_BASE}/dreams/{dream_id}/similar?limit=3")
-            resp.raise_for_status()
-            data = resp.json()
-            # Format for Gradio Dataframe: list of lists
-            similar_dreams = [[d["id"], d["content"], d["similarity"]] for d in data]
-    except Exception as e:
-        logger.error(f"Similar dreams error: {e}")
-
-    yield out(
-        "✅ Complete",
-        generalist_text,
-        _stars(scores.get("symbol")),
-        symbol_text,
-        _stars(scores.get("emotion")),
-        emotion_text,
-        _stars(scores.get("theme")),
-        theme_text,
-        synthesis_text,
-        similar_dreams,
-    )
-
-
-def get_past_dreams():
-    try:
-        with httpx.Client(timeout=30) as client:
-            response = client.get(f"{API_BASE}/dreams?limit=50")
-            response.raise_for_status()
-            dreams = response.json()
+        dreams = await _fetch_past_dreams()
     except Exception as e:
         logger.error(f"UI error fetching dreams: {e}")
         return [[f"Error: {e}", "", "", "", ""]]
@@ -167,7 +184,8 @@ def get_past_dreams():
         rows.append(
             [
                 str(dream["id"]),
-                dream["created_at"][:16].replace("T", " "),
+                # datetime in-process, ISO string from the remote API
+                str(dream["created_at"])[:16].replace("T", " "),
                 dream["content"][:80] + ("..." if len(dream["content"]) > 80 else ""),
                 first["model_used"] if first else "",
                 first["content"][:100] + "..." if first else "",
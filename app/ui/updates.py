@@ -0,0 +1,104 @@
+"""
+Frame pacing for streaming Gradio outputs.
+
+`paced` groups pipeline events into at most one batch per frame interval, so the UI
+re-renders at a bounded rate no matter how many agents stream at once. `PanelUpdater`
+tracks the output panels and builds each frame with gr.skip() for the ones that haven't
+changed since the last frame, so finished panels aren't re-sent and re-rendered.
+"""
+
+import asyncio
+from collections.abc import AsyncIterator, Sequence
+
+import gradio as gr
+
+_END = object()
+_UNSENT = object()
+
+
+class _Failure:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+async def paced(events: AsyncIterator[dict], max_fps: float) -> AsyncIterator[list[dict]]:
+    """
+    Yield events in batches, at most `max_fps` batches per second.
+
+    A batch is released as soon as the frame interval since the previous one has
+    passed, so the first event after a quiet period goes out immediately and the tail
+    of a stream is never held back waiting for more events. Order is preserved.
+    """
+    interval = 1 / max_fps if max_fps > 0 else 0
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def pump() -> None:
+        try:
+            async for event in events:
+                await queue.put(event)
+        except Exception as e:
+            await queue.put(_Failure(e))
+        else:
+            await queue.put(_END)
+
+    pump_task = asyncio.create_task(pump())
+    loop = asyncio.get_running_loop()
+    next_frame = 0.0
+
+    try:
+        while True:
+            items = [await queue.get()]
+            delay = next_frame - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            while not queue.empty():
+                items.append(queue.get_nowait())
+            next_frame = loop.time() + interval
+
+            batch = []
+            for item in items:
+                if item is _END or isinstance(item, _Failure):
+                    if batch:
+                        yield batch
+                    if isinstance(item, _Failure):
+                        raise item.error
+                    return
+                batch.append(item)
+            yield batch
+    finally:
+        pump_task.cancel()
+        await asyncio.gather(pump_task, return_exceptions=True)
+
+
+class PanelUpdater:
+    """Current value of each output panel, diffed against what was last sent."""
+
+    def __init__(self, panels: Sequence[str], **initial):
+        self._panels = list(panels)
+        self._values = {name: initial.get(name, "") for name in self._panels}
+        self._sent = dict.fromkeys(self._panels, _UNSENT)
+
+    def __getitem__(self, panel: str):
+        return self._values[panel]
+
+    def __setitem__(self, panel: str, value) -> None:
+        self._values[panel] = value
+
+    def append(self, panel: str, text: str) -> None:
+        self._values[panel] += text
+
+    @property
+    def changed(self) -> bool:
+        return any(self._values[p] != self._sent[p] for p in self._panels)
+
+    def frame(self) -> tuple:
+        """Output tuple for Gradio: new values for changed panels, gr.skip() for the rest."""
+        out = []
+        for panel in self._panels:
+            value = self._values[panel]
+            if value == self._sent[panel]:
+                out.append(gr.skip())
+            else:
+                out.append(value)
+                self._sent[panel] = value
+        return tuple(out)
@@ -1,28 +1,163 @@
+"""
+Speech-to-text for dream recordings.
+
+Recordings are split on voice activity into chunks of at most WHISPER_CHUNK_SECONDS
+(Whisper's window is 30 s), resampled to 16 kHz and transcribed in batches, so long
+recordings stream partial text instead of blocking until the end. WHISPER_MODEL picks
+a smaller checkpoint and WHISPER_QUANTIZE applies int8 dynamic quantization to its
+linear layers, for CPU-only hosts.
+"""
+
+from collections.abc import Iterator
+
 import numpy as np
 from loguru import logger
 
+from app.core.config import get_settings
+
+settings = get_settings()
+
+WHISPER_SAMPLE_RATE = 16000
+
+# Voice activity detection on short-time energy
+_FRAME_SECONDS = 0.03
+_SPEECH_PAD_FRAMES = 5  # Keep ~150 ms around speech so onsets and tails aren't clipped
+_NOISE_PERCENTILE = 10
+_NOISE_FACTOR = 3.0
+_MIN_THRESHOLD = 1e-3  # ~ -60 dBFS, so digital silence never counts as speech
+
 _whisper = None
 
 
-def _get_whisper():
+def get_whisper():
     global _whisper
     if _whisper is None:
         from transformers import pipeline
 
-        logger.info("Loading Whisper model...")
+        logger.info(f"Loading Whisper model {settings.whisper_model}...")
         _whisper = pipeline(
-            "automatic-speech-recognition", model="openai/whisper-small", device="cpu"
-        )  # noqa: E501
+            "automatic-speech-recognition", model=settings.whisper_model, device="cpu"
+        )
+        if settings.whisper_quantize:
+            import torch
+
+            _whisper.model = torch.ao.quantization.quantize_dynamic(
+                _whisper.model, {torch.nn.Linear}, dtype=torch.qint8
+            )
         logger.info("Whisper loaded.")
     return _whisper
 
 
-def transcribe_audio(audio):
-    if audio is None:
-        return ""
-    sample_rate, data = audio
+def to_mono_float(data: np.ndarray) -> np.ndarray:
+    """Gradio microphone buffer (int PCM or float, mono or multi-channel) → mono float32."""
+    if np.issubdtype(data.dtype, np.integer):
+        # Full scale is 2**(bits - 1); unsigned PCM (8-bit WAV) is centred on its midpoint
+        info = np.iinfo(data.dtype)
+        scale = (int(info.max) + 1) if info.min < 0 else (int(info.max) + 1) // 2
+        offset = 0 if info.min < 0 else scale
+        data = (data.astype(np.float64) - offset) / scale
+    data = data.astype(np.float32)
     if data.ndim > 1:
         data = data.mean(axis=1)
-    audio_float = data.astype(np.float32) / 32768.0
-    result: dict = _get_whisper()({"sampling_rate": sample_rate, "raw": audio_float})  # type: ignore[assignment]
-    return result["text"].strip()
+    return data
+
+
+def resample(audio: np.ndarray, sample_rate: int) -> np.ndarray:
+    """Band-limited resampling to Whisper's 16 kHz."""
+    if sample_rate == WHISPER_SAMPLE_RATE:
+        return audio
+    import torch
+    import torchaudio
+
+    waveform = torch.from_numpy(audio)
+    return torchaudio.functional.resample(waveform, sample_rate, WHISPER_SAMPLE_RATE).numpy()
+
+
+def split_on_voice(
+    audio: np.ndarray, sample_rate: int, max_seconds: float | None = None
+) -> list[np.ndarray]:
+    """
+    Split audio into chunks of at most `max_seconds`, cutting only in pauses.
+
+    Speech regions are found by frame energy against an adaptive noise floor. Regions are
+    packed into chunks greedily; a chunk ends at the pause before the region that would
+    overflow it. Silence at the edges is dropped, and a recording with no speech gives no
+    chunks. A single region longer than `max_seconds` is split hard.
+    """
+    max_seconds = max_seconds or settings.whisper_chunk_seconds
+    frame = max(1, int(sample_rate * _FRAME_SECONDS))
+    n_frames = len(audio) // frame
+    if n_frames == 0:
+        return []
+
+    frames = audio[: n_frames * frame].reshape(n_frames, frame)
+    energy = np.sqrt(np.mean(frames**2, axis=1))
+    threshold = max(np.percentile(energy, _NOISE_PERCENTILE) * _NOISE_FACTOR, _MIN_THRESHOLD)
+    voiced = energy > threshold
+    if not voiced.any():
+        return []
+    voiced = np.convolve(voiced, np.ones(2 * _SPEECH_PAD_FRAMES + 1), mode="same") > 0
+
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], voiced.astype(np.int8), [0]))))
+    regions = list(zip(edges[::2], edges[1::2], strict=True))
+
+    max_frames = max(1, int(max_seconds / _FRAME_SECONDS))
+    spans = []
+    start, end = regions[0]
+    for region_start, region_end in regions[1:]:
+        if region_end - start <= max_frames:
+            end = region_end
+        else:
+            spans.append((start, end))
+            start, end = region_start, region_end
+    spans.append((start, end))
+
+    chunks = []
+    for start, end in spans:
+        for offset in range(start, end, max_frames):
+            stop = min(offset + max_frames, end)
+            chunks.append(audio[offset * frame : stop * frame])
+    return chunks
+
+
+def transcribe_chunks(chunks: list[np.ndarray], sample_rate: int) -> list[str]:
+    """Transcribe chunks of at most 30 s in one batched call."""
+    if settings.model_server_socket:
+        from app.core import model_client
+
+        # The model server batches across requests and resamples in the pipeline
+        return [model_client.transcribe(sample_rate, chunk).strip() for chunk in chunks]
+
+    clips = [
+        {"sampling_rate": WHISPER_SAMPLE_RATE, "raw": resample(chunk, sample_rate)}
+        for chunk in chunks
+    ]
+    results: list[dict] = get_whisper()(clips, batch_size=len(clips))  # type: ignore[assignment]
+    return [result["text"].strip() for result in results]
+
+
+def transcribe_stream(audio) -> Iterator[str]:
+    """Yield the transcript so far after every batch of chunks (Gradio streams it)."""
+    if audio is None:
+        yield ""
+        return
+    sample_rate, data = audio
+    chunks = split_on_voice(to_mono_float(data), sample_rate)
+    if not chunks:
+        yield ""
+        return
+
+    text = ""
+    batch_size = settings.whisper_batch_size
+    for i in range(0, len(chunks), batch_size):
+        parts = transcribe_chunks(chunks[i : i + batch_size], sample_rate)
+        text = " ".join(part for part in (text, *parts) if part)
+        yield text
+
+
+def transcribe_audio(audio) -> str:
+    """Whole transcript at once."""
+    text = ""
+    for partial in transcribe_stream(audio):
+        text = partial
+    return text
@@ -0,0 +1,27 @@
+"""
+Building the pipeline's agents, shared by the graph nodes and the streaming pipeline.
+"""
+
+from app.agents.base_agent import BaseAgent
+from app.agents.prompts import OVERRIDE_VARIANT, choose_prompt
+from app.services.model_router import select_model
+
+
+async def make_agent[A: BaseAgent](
+    cls: type[A],
+    dream_id: int,
+    model: str,
+    *,
+    routing: bool = True,
+    experiments: bool = True,
+    prompts: dict[str, str] | None = None,
+) -> A:
+    """The agent with its routed model (MODEL_ROUTES) and system prompt: an override
+    from `prompts` (evals) if given, else its PROMPT_EXPERIMENTS variant for the dream."""
+    agent = cls(model=model)
+    agent.model = await select_model(agent.name, model, routing)
+    if prompts and agent.name in prompts:
+        agent.system_prompt, agent.prompt_variant = prompts[agent.name], OVERRIDE_VARIANT
+    elif experiments:
+        agent.prompt_variant, agent.system_prompt = choose_prompt(agent.name, dream_id)
+    return agent
@@ -0,0 +1,31 @@
+from loguru import logger
+
+from app.core.config import get_settings
+from app.core.database import AsyncSessionLocal
+from app.core.task_queue import BackgroundQueue
+from app.services.dream_service import DreamService
+from app.workflows.dream_analysis import run_dream_analysis
+
+settings = get_settings()
+
+
+async def _analyze(job: tuple[int, str]) -> None:
+    dream_id, model = job
+    async with AsyncSessionLocal() as db:
+        dream = await DreamService(db).get_dream_by_id(dream_id)
+    if not dream:
+        logger.warning(f"Queued analysis skipped: dream {dream_id} no longer exists")
+        return
+    await run_dream_analysis(dream_id=dream_id, dream=dream.content, model=model)
+    logger.info(f"Queued analysis done for dream {dream_id}")
+
+
+analysis_queue = BackgroundQueue(
+    "analysis", handler=_analyze, concurrency=settings.analysis_queue_concurrency
+)
+
+
+def enqueue_analysis(dream_ids: list[int], model: str) -> None:
+    """Queue full pipeline runs (generalist included) for already-saved dreams."""
+    for dream_id in dream_ids:
+        analysis_queue.enqueue((dream_id, model))
@@ -5,8 +5,10 @@ Flow:
 If generalist_output is pre-seeded (from streaming endpoint), generalist node is skipped.
 """
 
-from langgraph.graph import END, START, StateGraph
+from functools import lru_cache
 
+from app.core.profiling import maybe_profile
+from app.core.tracing import DREAM_ID, span
 from app.workflows.nodes import (
     generalist_node,
     rating_node,
@@ -21,7 +23,11 @@ def _route_start(state: DreamAnalysisState) -> str:
     return "specialists" if state["generalist"] else "generalist"
 
 
-def _build_graph():
+@lru_cache
+def get_dream_graph():
+    """Compile the graph on first use; langgraph is slow to import, so API startup skips it."""
+    from langgraph.graph import END, START, StateGraph
+
     graph = StateGraph(DreamAnalysisState)
 
     graph.add_node("generalist", generalist_node)
@@ -41,20 +47,23 @@ def _build_graph():
     return graph.compile()
 
 
-dream_graph = _build_graph()
-
-
 async def run_dream_analysis(
     dream_id: int,
     dream: str,
     model: str,
     generalist_output: str = "",
+    prompts: dict[str, str] | None = None,
+    routing: bool = True,
+    experiments: bool = True,
 ) -> DreamAnalysisState:
     """Run the pipeline. Pass generalist_output to skip the generalist node."""
     initial: DreamAnalysisState = {
         "dream_id": dream_id,
         "dream": dream,
         "model": model,
+        "prompts": prompts or {},
+        "routing": routing,
+        "experiments": experiments,
         "generalist": generalist_output,
         "symbol": "",
         "emotion": "",
@@ -67,5 +76,7 @@ async def run_dream_analysis(
         "retried": [],
     }
 
-    result: DreamAnalysisState = await dream_graph.ainvoke(initial)  # type: ignore[assignment]
+    async with maybe_profile("pipeline", f"dream {dream_id}"):
+        with span("pipeline.graph", **{DREAM_ID: dream_id, "pipeline.model": model}):
+            result: DreamAnalysisState = await get_dream_graph().ainvoke(initial)  # type: ignore[assignment]
     return result
@@ -1,7 +1,9 @@
 import asyncio
+from collections.abc import Awaitable
 
 from loguru import logger
 
+from app.agents.base_agent import BaseAgent
 from app.agents.emotion_specialist import EmotionSpecialist
 from app.agents.generalist_agent import GeneralistAgent
 from app.agents.rating_agent import RatingAgent
@@ -9,13 +11,37 @@ from app.agents.symbol_specialist import SymbolSpecialist
 from app.agents.synthesizer_agent import SynthesizerAgent
 from app.agents.theme_specialist import ThemeSpecialist
 from app.core.database import AsyncSessionLocal
-from app.services.analysis_service import AnalysisService
+from app.core.metrics import timed_node
+from app.core.tracing import traced
+from app.services.analysis_service import AgentRun, AnalysisService, measure_run
+from app.workflows.agents import make_agent
 from app.workflows.state import DreamAnalysisState
 
 
+async def _agent[A: BaseAgent](
+    cls: type[A], state: DreamAnalysisState, experiments: bool = True
+) -> A:
+    return await make_agent(
+        cls,
+        state["dream_id"],
+        state["model"],
+        routing=state["routing"],
+        experiments=experiments and state["experiments"],
+        prompts=state["prompts"],
+    )
+
+
+async def _run(call: Awaitable[str]) -> tuple[str, AgentRun]:
+    with measure_run() as run:
+        output = await call
+    return output, run
+
+
+@timed_node("generalist")
+@traced("node.generalist")
 async def generalist_node(state: DreamAnalysisState) -> dict:
-    agent = GeneralistAgent(model=state["model"])
-    output = await agent.analyze(state["dream"])
+    agent = await _agent(GeneralistAgent, state)
+    output, run = await _run(agent.analyze(state["dream"]))
 
     async with AsyncSessionLocal() as db:
         await AnalysisService(db).create_analysis(
@@ -24,26 +50,33 @@ async def generalist_node(state: DreamAnalysisState) -> dict:
             agent_type=agent.agent_type,
             model_used=agent.model,
             content=output,
+            prompt_variant=agent.prompt_variant,
+            run=run,
         )
 
     logger.info("Generalist done")
     return {"generalist": output}
 
 
+@timed_node("specialists")
+@traced("node.specialists")
 async def specialists_node(state: DreamAnalysisState) -> dict:
-    model = state["model"]
     context = state["generalist"]
     dream = state["dream"]
 
-    symbol_agent = SymbolSpecialist(model=model)
-    emotion_agent = EmotionSpecialist(model=model)
-    theme_agent = ThemeSpecialist(model=model)
-
-    logger.info(f"Running 3 specialists in parallel with {model}")
-    symbol_out, emotion_out, theme_out = await asyncio.gather(
-        symbol_agent.analyze(dream, context=context),
-        emotion_agent.analyze(dream, context=context),
-        theme_agent.analyze(dream, context=context),
+    symbol_agent = await _agent(SymbolSpecialist, state)
+    emotion_agent = await _agent(EmotionSpecialist, state)
+    theme_agent = await _agent(ThemeSpecialist, state)
+
+    logger.info(f"Running 3 specialists in parallel with {state['model']}")
+    (
+        (symbol_out, symbol_run),
+        (emotion_out, emotion_run),
+        (theme_out, theme_run),
+    ) = await asyncio.gather(
+        _run(symbol_agent.analyze(dream, context=context)),
+        _run(emotion_agent.analyze(dream, context=context)),
+        _run(theme_agent.analyze(dream, context=context)),
     )
 
     async with AsyncSessionLocal() as db:
@@ -54,6 +87,8 @@ async def specialists_node(state: DreamAnalysisState) -> dict:
             agent_type=symbol_agent.agent_type,
             model_used=symbol_agent.model,
             content=symbol_out,
+            prompt_variant=symbol_agent.prompt_variant,
+            run=symbol_run,
         )
         emotion_row = await service.create_analysis(
             dream_id=state["dream_id"],
@@ -61,6 +96,8 @@ async def specialists_node(state: DreamAnalysisState) -> dict:
             agent_type=emotion_agent.agent_type,
             model_used=emotion_agent.model,
             content=emotion_out,
+            prompt_variant=emotion_agent.prompt_variant,
+            run=emotion_run,
         )
         theme_row = await service.create_analysis(
             dream_id=state["dream_id"],
@@ -68,6 +105,8 @@ async def specialists_node(state: DreamAnalysisState) -> dict:
             agent_type=theme_agent.agent_type,
             model_used=theme_agent.model,
             content=theme_out,
+            prompt_variant=theme_agent.prompt_variant,
+            run=theme_run,
         )
 
     logger.info("Specialists done")
@@ -81,8 +120,11 @@ async def specialists_node(state: DreamAnalysisState) -> dict:
     }
 
 
+@timed_node("rating")
+@traced("node.rating")
 async def rating_node(state: DreamAnalysisState) -> dict:
-    judge = RatingAgent(model=state["model"])
+    # No experiments on the judge: its variant would change the scores being compared
+    judge = await _agent(RatingAgent, state, experiments=False)
     dream = state["dream"]
 
     logger.info("Rating specialist outputs")
@@ -108,8 +150,10 @@ async def rating_node(state: DreamAnalysisState) -> dict:
     return {"scores": scores}
 
 
+@timed_node("synthesizer")
+@traced("node.synthesizer")
 async def synthesizer_node(state: DreamAnalysisState) -> dict:
-    agent = SynthesizerAgent(model=state["model"])
+    agent = await _agent(SynthesizerAgent, state)
 
     context = (
         f"First-pass analysis:\n{state['generalist']}\n\n"
@@ -118,7 +162,7 @@ async def synthesizer_node(state: DreamAnalysisState) -> dict:
         f"Theme analysis:\n{state['theme']}"
     )
 
-    output = await agent.analyze(state["dream"], context=context)
+    output, run = await _run(agent.analyze(state["dream"], context=context))
 
     async with AsyncSessionLocal() as db:
         await AnalysisService(db).create_analysis(
@@ -127,6 +171,8 @@ async def synthesizer_node(state: DreamAnalysisState) -> dict:
             agent_type=agent.agent_type,
             model_used=agent.model,
             content=output,
+            prompt_variant=agent.prompt_variant,
+            run=run,
         )
 
     logger.info("Synthesizer done")
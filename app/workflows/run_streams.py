@@ -0,0 +1,207 @@
+"""
+Pipeline runs published to Redis Streams.
+
+A run executes in a background task, independent of any HTTP connection, and appends
+every (coalesced) event to `pipeline:run:<run_id>`. Viewers read the stream with XREAD,
+so a dropped connection can resume from its last event id and any number of viewers can
+watch the same run without extra LLM calls. SSE event ids are "<run_id>.<entry_id>", so
+a Last-Event-ID alone is enough to find the run again.
+
+While a run is in flight its worker keeps `pipeline:run:<run_id>:owner` alive. If the
+worker dies, the key lapses within a few heartbeats and the run counts as orphaned:
+readers get a terminal "error" event instead of keepalives, and the next request for the
+dream starts a new run. Streams expire PIPELINE_STREAM_TTL after their last event either
+way, so a dead run can't keep its stream forever.
+"""
+
+import asyncio
+import json
+import uuid
+from collections.abc import AsyncGenerator, AsyncIterator
+
+from loguru import logger
+
+from app.core.config import get_settings
+from app.core.redis import get_redis
+from app.core.sse import coalesce, format_event
+
+settings = get_settings()
+
+TERMINAL_EVENTS = {"done", "error"}
+
+# Strong references so running pipelines aren't garbage collected mid-run
+_running: set[asyncio.Task] = set()
+
+
+def _stream_key(run_id: str) -> str:
+    return f"pipeline:run:{run_id}"
+
+
+def _owner_key(run_id: str) -> str:
+    return f"pipeline:run:{run_id}:owner"
+
+
+def _active_key(dream_id: int) -> str:
+    return f"pipeline:dream:{dream_id}:run"
+
+
+def parse_event_id(event_id: str | None) -> tuple[str, str] | None:
+    """Split a Last-Event-ID into (run_id, stream entry id)."""
+    if not event_id or "." not in event_id:
+        return None
+    run_id, entry_id = event_id.split(".", 1)
+    return run_id, entry_id
+
+
+async def run_exists(run_id: str) -> bool:
+    return bool(await get_redis().exists(_stream_key(run_id)))
+
+
+async def run_alive(run_id: str) -> bool:
+    """Whether the run's worker is still publishing (its heartbeat hasn't lapsed)."""
+    return bool(await get_redis().exists(_owner_key(run_id)))
+
+
+async def _append(run_id: str, fields: dict) -> None:
+    """Add a stream entry and push the stream's expiry out again."""
+    key = _stream_key(run_id)
+    async with get_redis().pipeline(transaction=False) as pipe:
+        pipe.xadd(key, fields)
+        pipe.expire(key, settings.pipeline_stream_ttl)
+        await pipe.execute()
+
+
+async def _ended(run_id: str) -> bool:
+    """Whether the run's last stream entry is a terminal event."""
+    last = await get_redis().xrevrange(_stream_key(run_id), count=1)
+    if not last or b"event" not in last[0][1]:
+        return False
+    return json.loads(last[0][1][b"event"]).get("event") in TERMINAL_EVENTS
+
+
+async def _end_orphan(run_id: str) -> None:
+    """Give a run whose worker died a terminal event, so its readers stop waiting."""
+    logger.warning(f"Pipeline run {run_id} lost its worker; ending it")
+    detail = "Pipeline run was interrupted"
+    await _append(run_id, {"event": json.dumps({"event": "error", "detail": detail})})
+
+
+async def _heartbeat(run_id: str) -> None:
+    interval = settings.pipeline_run_heartbeat_seconds
+    while True:
+        try:
+            await get_redis().set(_owner_key(run_id), 1, ex=interval * 3)
+        except Exception as e:
+            logger.warning(f"Heartbeat of pipeline run {run_id} failed: {e}")
+        await asyncio.sleep(interval)
+
+
+async def active_run(dream_id: int) -> str | None:
+    run_id = await get_redis().get(_active_key(dream_id))
+    return run_id.decode() if run_id else None
+
+
+async def start_run(dream_id: int, events: AsyncGenerator[dict]) -> tuple[str, bool]:
+    """
+    Start publishing a pipeline run for a dream, unless one is already in flight.
+
+    Args:
+        dream_id: Dream the run belongs to (one active run per dream)
+        events: Pipeline event generator; only consumed if a new run is started
+
+    Returns:
+        (run_id, started) — started is False when an active run was joined instead
+    """
+    redis = get_redis()
+    run_id = uuid.uuid4().hex
+    claimed = await redis.set(
+        _active_key(dream_id), run_id, nx=True, ex=settings.pipeline_run_timeout
+    )
+    if not claimed:
+        existing = await active_run(dream_id)
+        if existing and await run_alive(existing):
+            await events.aclose()
+            return existing, False
+        if existing and await run_exists(existing) and not await _ended(existing):
+            await _end_orphan(existing)
+        # The other run finished or died, so take the dream over
+        await redis.set(_active_key(dream_id), run_id, ex=settings.pipeline_run_timeout)
+
+    # Claim ownership and create the stream up front so readers can attach (and see a
+    # live run) before the first event
+    interval = settings.pipeline_run_heartbeat_seconds
+    await redis.set(_owner_key(run_id), 1, ex=interval * 3)
+    await _append(run_id, {"meta": json.dumps({"dream_id": dream_id})})
+
+    task = asyncio.create_task(_publish(run_id, dream_id, events), name=f"pipeline-run-{run_id}")
+    _running.add(task)
+    task.add_done_callback(_running.discard)
+    logger.info(f"Started pipeline run {run_id} for dream {dream_id}")
+    return run_id, True
+
+
+async def _publish(run_id: str, dream_id: int, events: AsyncIterator[dict]) -> None:
+    redis = get_redis()
+    heartbeat = asyncio.create_task(_heartbeat(run_id))
+    try:
+        async for event in coalesce(events):
+            await _append(run_id, {"event": json.dumps(event)})
+    except Exception as e:
+        logger.error(f"Pipeline run {run_id} failed: {e}")
+        try:
+            await _append(run_id, {"event": json.dumps({"event": "error", "detail": str(e)})})
+        except Exception as redis_error:
+            # Readers notice the lapsed heartbeat and end the run themselves
+            logger.error(f"Could not publish the failure of run {run_id}: {redis_error}")
+    finally:
+        heartbeat.cancel()
+        try:
+            await redis.delete(_owner_key(run_id))
+            # Release the dream only if we still own it
+            if await active_run(dream_id) == run_id:
+                await redis.delete(_active_key(dream_id))
+        except Exception as e:
+            logger.error(f"Could not release pipeline run {run_id}: {e}")
+
+
+async def read_run(run_id: str, after: str = "0-0") -> AsyncIterator[tuple[str, dict] | None]:
+    """
+    Yield (entry_id, event) from a run's stream after `after`, until a terminal event.
+
+    Yields None whenever SSE_KEEPALIVE_SECONDS pass without a new event, so callers
+    can keep idle connections alive. Stops if the stream expires or never existed; a
+    run whose worker died gets a terminal "error" event appended and read back.
+    """
+    redis = get_redis()
+    key = _stream_key(run_id)
+    block_ms = settings.sse_keepalive_seconds * 1000
+    while True:
+        response = await redis.xread({key: after}, count=100, block=block_ms)
+        if not response:
+            if not await redis.exists(key):
+                return
+            if not await run_alive(run_id):
+                if await _ended(run_id):
+                    return  # Finished; the caller already saw its terminal event
+                await _end_orphan(run_id)
+                continue
+            yield None
+            continue
+        for entry_id, fields in response[0][1]:
+            after = entry_id.decode()
+            if b"event" not in fields:
+                continue  # stream metadata, not a pipeline event
+            event = json.loads(fields[b"event"])
+            yield after, event
+            if event.get("event") in TERMINAL_EVENTS:
+                return
+
+
+async def run_frames(run_id: str, after: str = "0-0") -> AsyncIterator[str]:
+    """SSE frames for a run, with resumable ids and keepalive comments."""
+    async for item in read_run(run_id, after):
+        if item is None:
+            yield ": keepalive\n\n"
+            continue
+        entry_id, event = item
+        yield format_event(event, event_id=f"{run_id}.{entry_id}")
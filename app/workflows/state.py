@@ -5,6 +5,12 @@ class DreamAnalysisState(TypedDict):
     dream_id: int
     dream: str
     model: str
+    # System prompt overrides by agent name (evals); agents missing here use their own
+    prompts: dict[str, str]
+    # Apply MODEL_ROUTES per agent (off for evals, which compare the models they name)
+    routing: bool
+    # Pick PROMPT_EXPERIMENTS variants per agent (off for evals, which name their prompts)
+    experiments: bool
     # Agent outputs
     generalist: str
     symbol: str
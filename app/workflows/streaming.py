@@ -0,0 +1,243 @@
+"""
+Streaming variant of the dream pipeline.
+
+Yields plain event dicts instead of touching HTTP, so the same run can be served
+directly as SSE or published to a run stream for resumable, multi-viewer delivery:
+  {"agent": "<name>", "token": "<chunk>"}   — token from a streaming agent
+  {"event": "scores", "data": {...}}         — rating scores after specialists finish
+  {"event": "embedding", "data": {...}}      — synthesis embedding written (stored, ms)
+  {"event": "done"}                          — pipeline complete
+
+stream_pipeline_events wraps the whole thing (generalist → ... → similar dreams) for
+the single-connection endpoint and adds "dream" and "similar" events.
+
+Stages hold spans across their yields, so each generator runs in its own task
+(`in_own_task`); whichever task the endpoint or run stream resumes them from, every
+span of a run stays in its trace.
+"""
+
+import asyncio
+import time
+from collections.abc import AsyncIterator
+
+from sqlalchemy import text
+
+from app.agents.emotion_specialist import EmotionSpecialist
+from app.agents.generalist_agent import GeneralistAgent
+from app.agents.rating_agent import RatingAgent
+from app.agents.symbol_specialist import SymbolSpecialist
+from app.agents.synthesizer_agent import SynthesizerAgent
+from app.agents.theme_specialist import ThemeSpecialist
+from app.core.database import AsyncSessionLocal
+from app.core.tracing import DREAM_ID, in_own_task, span
+from app.services.analysis_service import AgentRun, AnalysisService, measure_run, measure_stream
+from app.services.dream_service import DreamService
+from app.ui.embeddings import embed_text
+from app.workflows.agents import make_agent
+
+
+@in_own_task
+async def stream_generalist_chunks(
+    dream_id: int,
+    dream_content: str,
+    model: str,
+) -> AsyncIterator[str]:
+    """Stream the generalist's text chunks, saving the full output when complete."""
+    agent = await make_agent(GeneralistAgent, dream_id, model)
+    full_output = ""
+    run = AgentRun()
+    with span("stage.generalist", **{DREAM_ID: dream_id, "pipeline.model": model}):
+        async for chunk in measure_stream(agent.analyze_stream(dream_content), run):
+            full_output += chunk
+            yield chunk
+
+        async with AsyncSessionLocal() as save_db:
+            await AnalysisService(save_db).create_analysis(
+                dream_id=dream_id,
+                agent_name=agent.name,
+                agent_type=agent.agent_type,
+                model_used=agent.model,
+                content=full_output,
+                prompt_variant=agent.prompt_variant,
+                run=run,
+            )
+
+
+@in_own_task
+async def stream_analysis_events(
+    dream_id: int,
+    dream_content: str,
+    generalist_output: str,
+    model: str,
+) -> AsyncIterator[dict]:
+    """Run specialists, rating and synthesizer, saving each step and yielding events."""
+    with span("pipeline.analysis", **{DREAM_ID: dream_id, "pipeline.model": model}):
+        with span("stage.specialists"):
+            queue: asyncio.Queue = asyncio.Queue()
+
+            async def stream_specialist(agent, context: str) -> str:
+                full = ""
+                with measure_run() as runs[agent.name]:
+                    async for chunk in agent.analyze_stream(dream_content, context=context):
+                        full += chunk
+                        await queue.put({"agent": agent.name, "token": chunk})
+                await queue.put({"_done": agent.name, "content": full})
+                return full
+
+            runs: dict[str, AgentRun] = {}
+            symbol_agent = await make_agent(SymbolSpecialist, dream_id, model)
+            emotion_agent = await make_agent(EmotionSpecialist, dream_id, model)
+            theme_agent = await make_agent(ThemeSpecialist, dream_id, model)
+
+            tasks = [
+                asyncio.create_task(stream_specialist(symbol_agent, generalist_output)),
+                asyncio.create_task(stream_specialist(emotion_agent, generalist_output)),
+                asyncio.create_task(stream_specialist(theme_agent, generalist_output)),
+            ]
+
+            # Drain queue until all three specialists signal done
+            results: dict[str, str] = {}
+            while len(results) < 3:
+                event = await queue.get()
+                if "_done" in event:
+                    results[event["_done"]] = event["content"]
+                else:
+                    yield {"agent": event["agent"], "token": event["token"]}
+
+            await asyncio.gather(*tasks)
+
+            # Save specialists to DB
+            async with AsyncSessionLocal() as save_db:
+                service = AnalysisService(save_db)
+                symbol_row = await service.create_analysis(
+                    dream_id=dream_id,
+                    agent_name=symbol_agent.name,
+                    agent_type=symbol_agent.agent_type,
+                    model_used=symbol_agent.model,
+                    content=results[symbol_agent.name],
+                    prompt_variant=symbol_agent.prompt_variant,
+                    run=runs[symbol_agent.name],
+                )
+                emotion_row = await service.create_analysis(
+                    dream_id=dream_id,
+                    agent_name=emotion_agent.name,
+                    agent_type=emotion_agent.agent_type,
+                    model_used=emotion_agent.model,
+                    content=results[emotion_agent.name],
+                    prompt_variant=emotion_agent.prompt_variant,
+                    run=runs[emotion_agent.name],
+                )
+                theme_row = await service.create_analysis(
+                    dream_id=dream_id,
+                    agent_name=theme_agent.name,
+                    agent_type=theme_agent.agent_type,
+                    model_used=theme_agent.model,
+                    content=results[theme_agent.name],
+                    prompt_variant=theme_agent.prompt_variant,
+                    run=runs[theme_agent.name],
+                )
+
+        # Rate all three in parallel
+        with span("stage.rating"):
+            judge = await make_agent(RatingAgent, dream_id, model, experiments=False)
+            s_raw, e_raw, t_raw = await asyncio.gather(
+                judge.analyze(dream_content, context=results[symbol_agent.name]),
+                judge.analyze(dream_content, context=results[emotion_agent.name]),
+                judge.analyze(dream_content, context=results[theme_agent.name]),
+            )
+            scores = {
+                "symbol": judge.average_score(judge.parse_scores(s_raw)),
+                "emotion": judge.average_score(judge.parse_scores(e_raw)),
+                "theme": judge.average_score(judge.parse_scores(t_raw)),
+            }
+
+            async with AsyncSessionLocal() as score_db:
+                service = AnalysisService(score_db)
+                await service.update_analysis_score(symbol_row.id, scores["symbol"])
+                await service.update_analysis_score(emotion_row.id, scores["emotion"])
+                await service.update_analysis_score(theme_row.id, scores["theme"])
+
+        yield {"event": "scores", "data": scores}
+
+        # Stream synthesizer
+        with span("stage.synthesizer"):
+            synth = await make_agent(SynthesizerAgent, dream_id, model)
+            context = (
+                f"First-pass analysis:\n{generalist_output}\n\n"
+                f"Symbol analysis:\n{results[symbol_agent.name]}\n\n"
+                f"Emotion analysis:\n{results[emotion_agent.name]}\n\n"
+                f"Theme analysis:\n{results[theme_agent.name]}"
+            )
+            synth_output = ""
+            run = AgentRun()
+            async for chunk in measure_stream(
+                synth.analyze_stream(dream_content, context=context), run
+            ):
+                synth_output += chunk
+                yield {"agent": "synthesizer", "token": chunk}
+
+            async with AsyncSessionLocal() as synth_db:
+                await AnalysisService(synth_db).create_analysis(
+                    dream_id=dream_id,
+                    agent_name=synth.name,
+                    agent_type=synth.agent_type,
+                    model_used=synth.model,
+                    content=synth_output,
+                    prompt_variant=synth.prompt_variant,
+                    run=run,
+                )
+
+        with span("stage.embedding"):
+            started = time.perf_counter()
+            async with AsyncSessionLocal() as embed_db:
+                embedding = await asyncio.to_thread(embed_text, synth_output)
+                # Convert list to pgvector format: "[0.1, 0.2, ...]"
+                embedding_str = str(embedding)
+                with span("db.update_embedding"):
+                    result = await embed_db.execute(
+                        text("UPDATE dreams SET embedding = CAST(:emb AS vector) WHERE id = :id"),
+                        {"emb": embedding_str, "id": dream_id},
+                    )
+                    await embed_db.commit()
+
+        # stored is False if the dream was deleted mid-run
+        yield {
+            "event": "embedding",
+            "data": {
+                "stored": result.rowcount == 1,
+                "dimensions": len(embedding),
+                "ms": round((time.perf_counter() - started) * 1000, 1),
+            },
+        }
+
+    yield {"event": "done"}
+
+
+@in_own_task
+async def stream_pipeline_events(
+    dream_id: int,
+    dream_content: str,
+    model: str,
+    similar_limit: int = 3,
+) -> AsyncIterator[dict]:
+    """Whole pipeline for a freshly created dream, generalist through similar dreams."""
+    with span("pipeline.stream", **{DREAM_ID: dream_id, "pipeline.model": model}):
+        yield {"event": "dream", "data": {"id": dream_id}}
+
+        generalist_output = ""
+        async for chunk in stream_generalist_chunks(dream_id, dream_content, model):
+            generalist_output += chunk
+            yield {"agent": "generalist", "token": chunk}
+
+        async for event in stream_analysis_events(
+            dream_id, dream_content, generalist_output, model
+        ):
+            if event.get("event") != "done":
+                yield event
+
+        with span("stage.similar"):
+            async with AsyncSessionLocal() as db:
+                similar = await DreamService(db).get_similar_dreams(dream_id, limit=similar_limit)
+        yield {"event": "similar", "data": similar}
+
+    yield {"event": "done"}
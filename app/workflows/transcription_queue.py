@@ -0,0 +1,156 @@
+"""
+Background transcription jobs.
+
+Uploads are saved to a temp file by the API and queued here. TRANSCRIPTION_CONCURRENCY
+workers transcribe them (Whisper is CPU-bound, so extra submissions wait in the queue
+instead of competing for cores). Job state lives in a Redis hash, `transcription:job:<id>`,
+updated after every batch of chunks, so any API worker can serve status and partial text.
+The audio file itself is local to the worker that accepted the upload and runs the job.
+
+That worker keeps a heartbeat key alive while it runs. Jobs are held in process memory,
+so if the worker restarts its queued and running jobs are lost: once the heartbeat lapses,
+reading such a job marks it failed instead of leaving it queued until TRANSCRIPTION_JOB_TTL.
+"""
+
+import asyncio
+import contextlib
+import os
+import uuid
+from datetime import UTC, datetime
+
+from loguru import logger
+
+from app.core.config import get_settings
+from app.core.redis import get_redis
+from app.core.task_queue import BackgroundQueue
+from app.schemas.transcription import TranscriptionJob, TranscriptionStatus
+
+settings = get_settings()
+
+# Identifies this process's jobs. app.serve imports the app before forking its workers, so
+# every forked process (including a restarted worker) draws a new id; siblings sharing
+# one would keep each other's heartbeat alive and hide a crashed worker's jobs
+_WORKER_ID = uuid.uuid4().hex
+_heartbeat_task: asyncio.Task | None = None
+
+
+def _reset_worker() -> None:
+    global _WORKER_ID, _heartbeat_task
+    _WORKER_ID = uuid.uuid4().hex
+    _heartbeat_task = None  # The parent's task belongs to the parent's event loop
+
+
+os.register_at_fork(after_in_child=_reset_worker)
+
+
+def _job_key(job_id: str) -> str:
+    return f"transcription:job:{job_id}"
+
+
+def _worker_key(worker_id: str) -> str:
+    return f"transcription:worker:{worker_id}"
+
+
+async def _beat() -> None:
+    interval = settings.transcription_heartbeat_seconds
+    await get_redis().set(_worker_key(_WORKER_ID), 1, ex=interval * 3)
+
+
+async def _heartbeat() -> None:
+    while True:
+        await asyncio.sleep(settings.transcription_heartbeat_seconds)
+        try:
+            await _beat()
+        except Exception as e:
+            logger.warning(f"Transcription worker heartbeat failed: {e}")
+
+
+def _now() -> str:
+    return datetime.now(UTC).isoformat()
+
+
+async def _update(job_id: str, **fields) -> None:
+    redis = get_redis()
+    fields["updated_at"] = _now()
+    mapping = {key: "" if value is None else str(value) for key, value in fields.items()}
+    async with redis.pipeline(transaction=True) as pipe:
+        pipe.hset(_job_key(job_id), mapping=mapping)
+        pipe.expire(_job_key(job_id), settings.transcription_job_ttl)
+        await pipe.execute()
+
+
+async def get_job(job_id: str) -> TranscriptionJob | None:
+    raw = await get_redis().hgetall(_job_key(job_id))
+    if not raw:
+        return None
+    job = {key.decode(): value.decode() for key, value in raw.items()}
+    pending = job["status"] in (TranscriptionStatus.QUEUED, TranscriptionStatus.RUNNING)
+    if pending and job.get("worker") and not await get_redis().exists(_worker_key(job["worker"])):
+        error = "The API worker holding this job restarted; upload the audio again"
+        await _update(job_id, status=TranscriptionStatus.FAILED, error=error)
+        job.update(status=TranscriptionStatus.FAILED, error=error, updated_at=_now())
+    return TranscriptionJob(
+        id=job_id,
+        status=TranscriptionStatus(job["status"]),
+        text=job.get("text", ""),
+        chunks_done=int(job.get("chunks_done") or 0),
+        chunks_total=int(job["chunks_total"]) if job.get("chunks_total") else None,
+        error=job.get("error") or None,
+        created_at=datetime.fromisoformat(job["created_at"]),
+        updated_at=datetime.fromisoformat(job["updated_at"]),
+    )
+
+
+def _read_audio(path: str):
+    import soundfile as sf
+
+    from app.ui.whisper import split_on_voice, to_mono_float
+
+    data, sample_rate = sf.read(path, dtype="float32")
+    return split_on_voice(to_mono_float(data), sample_rate), sample_rate
+
+
+async def _transcribe(job: tuple[str, str]) -> None:
+    from app.ui.whisper import transcribe_chunks
+
+    job_id, path = job
+    try:
+        await _update(job_id, status=TranscriptionStatus.RUNNING)
+        chunks, sample_rate = await asyncio.to_thread(_read_audio, path)
+        await _update(job_id, chunks_total=len(chunks))
+
+        text = ""
+        batch_size = settings.whisper_batch_size
+        for i in range(0, len(chunks), batch_size):
+            batch = chunks[i : i + batch_size]
+            parts = await asyncio.to_thread(transcribe_chunks, batch, sample_rate)
+            text = " ".join(part for part in (text, *parts) if part)
+            await _update(job_id, text=text, chunks_done=i + len(batch))
+
+        await _update(job_id, status=TranscriptionStatus.DONE)
+        logger.info(f"Transcription {job_id} done: {len(chunks)} chunks")
+    except Exception as e:
+        logger.error(f"Transcription {job_id} failed: {e}")
+        await _update(job_id, status=TranscriptionStatus.FAILED, error=str(e))
+    finally:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(path)
+
+
+transcription_queue = BackgroundQueue(
+    "transcription", handler=_transcribe, concurrency=settings.transcription_concurrency
+)
+
+
+async def submit_transcription(path: str) -> str:
+    """Register a queued job for an audio file (deleted once transcribed) and return its id."""
+    global _heartbeat_task
+    if _heartbeat_task is None or _heartbeat_task.done():
+        await _beat()
+        _heartbeat_task = asyncio.create_task(_heartbeat(), name="transcription-heartbeat")
+    job_id = uuid.uuid4().hex
+    await _update(
+        job_id, status=TranscriptionStatus.QUEUED, text="", created_at=_now(), worker=_WORKER_ID
+    )
+    transcription_queue.enqueue((job_id, path))
+    return job_id
@@ -0,0 +1,90 @@
+"""
+Cold import time of the API (`import app.main`), from `python -X importtime`.
+
+Imports the app in a fresh interpreter (API-only by default, i.e. SERVE_UI=false),
+reports the total and the slowest top-level packages, and fails if the total is over
+the budget or if any of the heavy modules that should load lazily got imported.
+Exit code 1 on failure, so it can gate CI:
+
+    uv run python -m benchmarks.import_time --budget-ms 1500
+    uv run python -m benchmarks.import_time --ui  # UI mounted; no lazy-module check
+
+tests/test_import_time.py runs the same check under pytest (IMPORT_TIME_BUDGET_MS
+overrides its budget on slow machines).
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+# Deferred until first use (llm_client.get_litellm, get_dream_graph, the embedding and
+# Whisper loaders) or only needed by the UI
+LAZY_MODULES = (
+    "litellm",
+    "langgraph",
+    "gradio",
+    "sentence_transformers",
+    "transformers",
+    "torch",
+)
+
+
+def _import_profile(ui: bool) -> dict[str, tuple[int, int]]:
+    """Return {module: (self_us, cumulative_us)} for one cold `import app.main`."""
+    env = {**os.environ, "SERVE_UI": "true" if ui else "false"}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if result.returncode != 0:
+        sys.exit(f"import app.main failed:\n{result.stderr[-2000:]}")
+
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        profile[name.strip()] = (int(self_us), int(cumulative_us))
+    return profile
+
+
+def main(budget_ms: float, runs: int, ui: bool, top: int) -> int:
+    # Best of N: the first run also pays for cold .pyc compilation and disk cache
+    profiles = [_import_profile(ui) for _ in range(runs)]
+    profile = min(profiles, key=lambda p: p["app.main"][1])
+    total_ms = profile["app.main"][1] / 1000
+
+    by_package: dict[str, int] = defaultdict(int)
+    for name, (self_us, _) in profile.items():
+        by_package[name.split(".")[0]] += self_us
+
+    print(f"import app.main ({'with UI' if ui else 'API only'}): {total_ms:.0f} ms")
+    print(f"{'package':<28} {'ms':>8}")
+    for package, us in sorted(by_package.items(), key=lambda kv: kv[1], reverse=True)[:top]:
+        print(f"{package:<28} {us / 1000:>8.1f}")
+
+    failed = False
+    if total_ms > budget_ms:
+        print(f"FAIL: {total_ms:.0f} ms is over the {budget_ms:g} ms budget")
+        failed = True
+    if not ui:
+        eager = [m for m in LAZY_MODULES if m in profile]
+        if eager:
+            print(f"FAIL: imported at startup, should be lazy: {', '.join(eager)}")
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--budget-ms", type=float, default=1500)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--ui", action="store_true", help="Import with the Gradio UI mounted")
+    parser.add_argument("--top", type=int, default=12)
+    args = parser.parse_args()
+    sys.exit(main(args.budget_ms, args.runs, args.ui, args.top))
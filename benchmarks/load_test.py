@@ -0,0 +1,322 @@
+"""
+Load test: concurrent end-to-end dream pipelines against a running app.
+
+Each simulated user runs create → stream-generalist → stream-analyze → similar for one
+new dream. Dreams arrive at `--rate` per second (open loop; 0 = start the next one as
+soon as a slot is free) with at most `--concurrency` in flight. Per phase it reports
+p50/p95/p99 latency and errors; streaming phases also get time to first chunk/event.
+Event loop lag is measured in this process (is the client keeping up?) and read from
+the app's /metrics histogram (how blocked was the server?).
+
+Point it at an app using a stand-in LLM so only our own overhead is measured:
+
+    STUB_LLM_ENABLED=true SERVE_UI=false uv run uvicorn app.main:app  # stub model, below
+    LLM_CASSETTE_MODE=replay uv run uvicorn app.main:app                 # or recorded traffic
+
+    uv run python -m benchmarks.load_test --dreams 200 --concurrency 32 --rate 4
+    uv run python -m benchmarks.load_test --compare benchmarks/results/<earlier>.json
+
+Results are saved as JSON (default benchmarks/results/load_test-<commit>-<time>.json).
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import re
+import subprocess
+import time
+from collections import defaultdict
+from datetime import UTC, datetime
+from pathlib import Path
+
+import httpx
+
+PHASES = (
+    "create",
+    "generalist_first_chunk",
+    "generalist",
+    "analyze_first_event",
+    "analyze",
+    "similar",
+    "total",
+)
+PERCENTILES = (50, 95, 99)
+
+_DREAMS = [
+    "I was walking through my childhood home but every door opened onto the sea.",
+    "A train with no driver kept stopping at stations that all had my name.",
+    "I was late for an exam in a language I had never studied, and my teeth were loose.",
+    "My grandmother handed me a key made of ice that melted before I found the lock.",
+    "I could fly, but only a few inches above the ground, and everyone pretended not to see.",
+]
+
+_BUCKET = re.compile(r'^dreamscape_event_loop_lag_seconds_bucket\{le="([^"]+)"\} (\S+)$')
+
+
+def percentile(values: list[float], p: float) -> float | None:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]  # nearest rank
+
+
+def summarize(values: list[float]) -> dict:
+    summary: dict = {"count": len(values)}
+    for p in PERCENTILES:
+        summary[f"p{p}"] = percentile(values, p)
+    summary["mean"] = sum(values) / len(values) if values else None
+    summary["max"] = max(values) if values else None
+    return summary
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+        self.completed = 0
+
+
+async def _create(client: httpx.AsyncClient, model: str, index: int) -> int:
+    content = f"{random.choice(_DREAMS)} (dream {index})"
+    response = await client.post("/dreams", json={"content": content, "model": model})
+    response.raise_for_status()
+    return response.json()["id"]
+
+
+async def _generalist(client: httpx.AsyncClient, dream_id: int, model: str) -> float:
+    """Stream the generalist; returns seconds to the first chunk."""
+    started = time.perf_counter()
+    first: float | None = None
+    url = f"/dreams/{dream_id}/stream-generalist"
+    async with client.stream("POST", url, params={"model": model}) as response:
+        response.raise_for_status()
+        async for chunk in response.aiter_text():
+            if chunk and first is None:
+                first = time.perf_counter() - started
+    if first is None:
+        raise RuntimeError("empty generalist stream")
+    return first
+
+
+async def _analyze(client: httpx.AsyncClient, dream_id: int, model: str) -> float:
+    """Stream specialists → synthesizer until "done"; returns seconds to the first event."""
+    started = time.perf_counter()
+    first: float | None = None
+    url = f"/dreams/{dream_id}/stream-analyze"
+    async with client.stream("POST", url, params={"model": model}) as response:
+        response.raise_for_status()
+        async for line in response.aiter_lines():
+            if not line.startswith("data: "):
+                continue  # ids, keepalive comments, blank separators
+            if first is None:
+                first = time.perf_counter() - started
+            event = json.loads(line[len("data: ") :])
+            if event.get("event") == "error":
+                raise RuntimeError(f"pipeline error: {event.get('detail')}")
+            if event.get("event") == "done":
+                return first
+    raise RuntimeError("stream ended without done")
+
+
+async def _similar(client: httpx.AsyncClient, dream_id: int) -> None:
+    response = await client.get(f"/dreams/{dream_id}/similar")
+    response.raise_for_status()
+
+
+async def _timed(recorder: Recorder, phase: str, call):
+    started = time.perf_counter()
+    try:
+        result = await call
+    except Exception:
+        recorder.errors[phase] += 1
+        raise
+    recorder.latencies[phase].append(time.perf_counter() - started)
+    return result
+
+
+async def run_user(client: httpx.AsyncClient, recorder: Recorder, model: str, index: int):
+    started = time.perf_counter()
+    try:
+        dream_id = await _timed(recorder, "create", _create(client, model, index))
+        first = await _timed(recorder, "generalist", _generalist(client, dream_id, model))
+        recorder.latencies["generalist_first_chunk"].append(first)
+        first = await _timed(recorder, "analyze", _analyze(client, dream_id, model))
+        recorder.latencies["analyze_first_event"].append(first)
+        await _timed(recorder, "similar", _similar(client, dream_id))
+    except Exception:
+        return
+    recorder.latencies["total"].append(time.perf_counter() - started)
+    recorder.completed += 1
+
+
+async def _monitor_lag(samples: list[float], interval: float = 0.05) -> None:
+    loop = asyncio.get_running_loop()
+    while True:
+        started = loop.time()
+        await asyncio.sleep(interval)
+        samples.append(max(0.0, loop.time() - started - interval))
+
+
+async def _server_lag_buckets(client: httpx.AsyncClient, root_url: str) -> dict[float, float]:
+    try:
+        response = await client.get(f"{root_url}/metrics")
+        response.raise_for_status()
+    except httpx.HTTPError:
+        return {}
+    buckets: dict[float, float] = {}
+    for line in response.text.splitlines():
+        if match := _BUCKET.match(line):
+            buckets[float(match.group(1))] = float(match.group(2))
+    return buckets
+
+
+def _bucket_summary(before: dict[float, float], after: dict[float, float]) -> dict | None:
+    """Percentile upper bounds from the change in cumulative histogram buckets."""
+    delta = sorted((le, after[le] - before.get(le, 0.0)) for le in after)
+    total = delta[-1][1] if delta else 0
+    if not total:
+        return None
+    summary: dict = {"samples": int(total)}
+    for p in PERCENTILES:
+        summary[f"p{p}_le"] = next(le for le, count in delta if count >= total * p / 100)
+    return summary
+
+
+def _commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+async def load_test(args: argparse.Namespace) -> dict:
+    api_url = args.base_url.rstrip("/") + "/api/v1"
+    recorder = Recorder()
+    client_lag: list[float] = []
+    limits = httpx.Limits(max_connections=args.concurrency * 2 + 4)
+    timeout = httpx.Timeout(args.timeout)
+
+    async with httpx.AsyncClient(base_url=api_url, limits=limits, timeout=timeout) as client:
+        lag_before = await _server_lag_buckets(client, args.base_url.rstrip("/"))
+        monitor = asyncio.create_task(_monitor_lag(client_lag))
+        slots = asyncio.Semaphore(args.concurrency)
+        users: list[asyncio.Task] = []
+
+        async def user(index: int) -> None:
+            try:
+                await run_user(client, recorder, args.model, index)
+            finally:
+                slots.release()
+
+        started = time.perf_counter()
+        for index in range(args.dreams):
+            await slots.acquire()
+            users.append(asyncio.create_task(user(index)))
+            if args.rate > 0:
+                await asyncio.sleep(random.expovariate(args.rate))  # Poisson arrivals
+        await asyncio.gather(*users)
+        elapsed = time.perf_counter() - started
+
+        monitor.cancel()
+        lag_after = await _server_lag_buckets(client, args.base_url.rstrip("/"))
+
+    errors = sum(recorder.errors.values())
+    return {
+        "meta": {
+            "commit": _commit(),
+            "finished_at": datetime.now(UTC).isoformat(),
+            "base_url": args.base_url,
+            "model": args.model,
+            "dreams": args.dreams,
+            "concurrency": args.concurrency,
+            "rate": args.rate,
+        },
+        "elapsed_s": elapsed,
+        "completed": recorder.completed,
+        "throughput_per_s": recorder.completed / elapsed if elapsed else 0.0,
+        "error_rate": errors / args.dreams if args.dreams else 0.0,
+        "errors": dict(recorder.errors),
+        "phases": {phase: summarize(recorder.latencies[phase]) for phase in PHASES},
+        "event_loop_lag": {
+            "client": summarize(client_lag),
+            "server": _bucket_summary(lag_before, lag_after),
+        },
+    }
+
+
+def _ms(value: float | None) -> str:
+    return "-" if value is None else f"{value * 1000:.0f}"
+
+
+def print_report(result: dict, baseline: dict | None = None) -> None:
+    meta = result["meta"]
+    print(
+        f"{meta['dreams']} dreams, concurrency {meta['concurrency']}, rate {meta['rate']}/s, "
+        f"model {meta['model']} @ {meta['commit']}"
+    )
+    print(
+        f"completed {result['completed']} in {result['elapsed_s']:.1f}s: "
+        f"{result['throughput_per_s']:.2f} dreams/s, error rate {result['error_rate']:.1%} "
+        f"{result['errors'] or ''}"
+    )
+    header = f"{'phase (ms)':<24}" + "".join(f"{f'p{p}':>9}" for p in PERCENTILES)
+    if baseline:
+        header += f"{'p95 base':>10}{'Δp95':>8}"
+    print(header)
+    for phase, stats in result["phases"].items():
+        row = f"{phase:<24}" + "".join(f"{_ms(stats[f'p{p}']):>9}" for p in PERCENTILES)
+        base = (baseline or {}).get("phases", {}).get(phase, {}).get("p95")
+        if baseline:
+            change = (
+                f"{(stats['p95'] - base) / base:+.0%}" if base and stats["p95"] is not None else "-"
+            )
+            row += f"{_ms(base):>10}{change:>8}"
+        print(row)
+
+    lag = result["event_loop_lag"]
+    client = lag["client"]
+    print(f"client loop lag ms: p95 {_ms(client['p95'])}, max {_ms(client['max'])}")
+    server = lag["server"]
+    if server:
+        bounds = ", ".join(f"p{p} <= {_ms(server[f'p{p}_le'])}" for p in PERCENTILES)
+        print(f"server loop lag ms: {bounds} ({server['samples']} samples)")
+    else:
+        print("server loop lag: unavailable (no /metrics)")
+    if baseline:
+        print(
+            f"throughput {result['throughput_per_s']:.2f}/s vs "
+            f"{baseline['throughput_per_s']:.2f}/s baseline"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--model", default="stub/load?ttft_ms=300&tps=40")
+    parser.add_argument("--dreams", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--rate", type=float, default=0, help="Arrivals per second (0 = closed)")
+    parser.add_argument("--timeout", type=float, default=300, help="Per-request seconds")
+    parser.add_argument("--output", type=Path, help="Result JSON path")
+    parser.add_argument("--compare", type=Path, help="Earlier result JSON to compare against")
+    args = parser.parse_args()
+
+    result = asyncio.run(load_test(args))
+    baseline = json.loads(args.compare.read_text()) if args.compare else None
+    print_report(result, baseline)
+
+    output = args.output or Path("benchmarks/results") / (
+        f"load_test-{result['meta']['commit'] or 'nogit'}-{int(time.time())}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(result, indent=2))
+    print(f"saved {output}")
+
+
+if __name__ == "__main__":
+    main()
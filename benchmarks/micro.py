@@ -0,0 +1,350 @@
+"""
+Micro-benchmarks for the per-dream hot paths, with saved baselines.
+
+Groups (run all, or pick some with --only):
+  parse_scores   RatingAgent.parse_scores on clean, fenced and malformed judge output
+  sse            SSE frame construction for `stream-analyze` (format_event, sse_frames, gzip)
+  serialization  a 100-dream page of DreamRead: Pydantic from ORM objects vs orjson rows
+  embedding      embed_text, and embed_texts at batch sizes 1-64 (needs the model or
+                 MODEL_SERVER_SOCKET)
+  db             AnalysisService create/update/read against DATABASE_URL, on a scratch
+                 dream that is deleted afterwards (needs Postgres; without Redis the
+                 timings include failing cache invalidation)
+
+Each case is calibrated so one round takes at least --min-round-ms, then timed for
+--rounds rounds; the report shows min/median/stdev per call. Groups whose backend is
+missing are reported as skipped. Comparisons use the median.
+
+This is a standalone script like the other benchmarks, not a pytest-benchmark suite:
+the test suite stays fast and backend-free, and the groups that need the embedding
+model or Postgres skip themselves instead of failing a test run.
+
+`benchmarks/baselines/micro.json` is the committed baseline and the default for a bare
+--compare. Its `meta` says where it was taken (only parse_scores, sse and serialization
+ran there); refresh it with --save on the machine you compare on, in the same commit as
+the change it measures. Ad-hoc runs go to the gitignored benchmarks/results/.
+
+    uv run python -m benchmarks.micro --compare
+    uv run python -m benchmarks.micro --only parse_scores sse --compare --threshold 0.1
+    uv run python -m benchmarks.micro --save benchmarks/results/micro-branch.json
+
+With --compare the exit status is 1 if any case got slower than the threshold.
+"""
+
+import argparse
+import asyncio
+import inspect
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from collections.abc import Callable
+from contextlib import AsyncExitStack
+from datetime import UTC, datetime
+from pathlib import Path
+
+from loguru import logger
+
+from benchmarks.serialization import _as_orm, build_page
+
+EMBED_BATCH_SIZES = (1, 2, 4, 8, 16, 32, 64)
+BASELINE = Path(__file__).parent / "baselines" / "micro.json"
+
+
+class BackendUnavailableError(Exception):
+    """A group's backend (model, database) is not reachable here."""
+
+
+# --- groups: each returns {case name: zero-argument callable (sync or async)} ---
+
+
+def parse_scores_cases(stack: AsyncExitStack) -> dict[str, Callable]:
+    from app.agents.rating_agent import RatingAgent
+
+    agent = RatingAgent(model="stub/bench")
+    outputs = {
+        "clean": '{"depth": 4, "relevance": 5, "insight": 3}',
+        "fenced": '```json\n{"depth": 4, "relevance": 5, "insight": 3}\n```',
+        "whitespace": '\n\n  {"depth": 4,\n   "relevance": 5,\n   "insight": 3}  \n',
+        "out_of_range": '{"depth": 9, "relevance": 0, "insight": "4"}',
+        "prose": 'Sure! Here are my scores: {"depth": 4, "relevance": 5, "insight": 3}',
+        "truncated": '{"depth": 4, "relevance": 5, "ins',
+        "non_numeric": '{"depth": "high", "relevance": 5, "insight": 3}',
+    }
+    return {name: (lambda raw=raw: agent.parse_scores(raw)) for name, raw in outputs.items()}
+
+
+def _analyze_events(tokens_per_agent: int = 400) -> list[dict]:
+    """Event sequence of one `stream-analyze` run, with per-token events."""
+    events: list[dict] = []
+    specialists = ["symbol_specialist", "emotion_specialist", "theme_specialist"]
+    for i in range(tokens_per_agent):
+        for name in specialists:
+            events.append({"agent": name, "token": f" word{i % 97}"})
+    events.append({"event": "scores", "data": {"symbol": 4, "emotion": 3, "theme": 4}})
+    events.extend({"agent": "synthesizer", "token": f" word{i % 97}"} for i in range(400))
+    events.append({"event": "done"})
+    return events
+
+
+def sse_cases(stack: AsyncExitStack) -> dict[str, Callable]:
+    from app.core.sse import format_event, gzip_frames, sse_frames
+
+    events = _analyze_events()
+    token = {"agent": "symbol_specialist", "token": " water"}
+    scores = {"event": "scores", "data": {"symbol": 4, "emotion": 3, "theme": 4}}
+
+    async def replay():
+        for event in events:
+            yield event
+
+    async def frames() -> None:
+        async for _ in sse_frames(replay()):
+            pass
+
+    async def gzipped() -> None:
+        async for _ in gzip_frames(sse_frames(replay())):
+            pass
+
+    return {
+        "format_event[token]": lambda: format_event(token),
+        "format_event[token+id]": lambda: format_event(token, "1712345678901-0"),
+        "format_event[scores]": lambda: format_event(scores),
+        f"sse_frames[dream, {len(events)} events]": frames,
+        f"gzip_frames[dream, {len(events)} events]": gzipped,
+    }
+
+
+def serialization_cases(stack: AsyncExitStack) -> dict[str, Callable]:
+    from pydantic import TypeAdapter
+
+    from app.core.serialization import dumps
+    from app.schemas.dream import DreamRead
+
+    page = build_page(100)
+    orm_page = _as_orm(page)
+    adapter = TypeAdapter(list[DreamRead])
+    return {
+        "DreamRead[100] from ORM + dump_json": lambda: adapter.dump_json(
+            adapter.validate_python(orm_page, from_attributes=True)
+        ),
+        "orjson rows[100]": lambda: dumps(page),
+    }
+
+
+def embedding_cases(stack: AsyncExitStack) -> dict[str, Callable]:
+    from app.core.config import get_settings
+    from app.ui.embeddings import embed_text, embed_texts
+
+    if not get_settings().model_server_socket:
+        try:
+            import sentence_transformers  # noqa: F401
+        except ImportError as e:
+            raise BackendUnavailableError(f"sentence-transformers not installed ({e})") from e
+    try:
+        embed_text("warm up the model")
+    except OSError as e:  # model server socket not listening
+        raise BackendUnavailableError(str(e)) from e
+
+    texts = [f"I was in a house by the sea and door {i} opened onto a forest." for i in range(64)]
+    cases: dict[str, Callable] = {"embed_text": lambda: embed_text(texts[0])}
+    for size in EMBED_BATCH_SIZES:
+        batch = texts[:size]
+        cases[f"embed_texts[{size}]"] = lambda batch=batch, size=size: embed_texts(batch, size)
+    return cases
+
+
+async def db_cases(stack: AsyncExitStack) -> dict[str, Callable]:
+    from sqlalchemy import text
+    from sqlalchemy.exc import DBAPIError
+
+    from app.core.database import AsyncSessionLocal, engine
+    from app.services.analysis_service import AnalysisService
+    from app.services.dream_service import DreamService
+
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    except (OSError, DBAPIError) as e:
+        raise BackendUnavailableError(f"database not reachable ({e.__class__.__name__})") from e
+    stack.push_async_callback(engine.dispose)
+
+    db = await stack.enter_async_context(AsyncSessionLocal())
+    dream = await DreamService(db).create_dream("Micro-benchmark scratch dream.")
+
+    async def cleanup() -> None:
+        await DreamService(db).delete_dream(dream.id)
+
+    stack.push_async_callback(cleanup)
+
+    service = AnalysisService(db)
+    content = "The sea stands for what the dreamer cannot yet name. " * 40
+    analysis = await service.create_analysis(
+        dream.id, "symbol_specialist", "specialist", "stub/bench", content
+    )
+    scores = iter(range(10**9))
+
+    return {
+        "create_analysis": lambda: service.create_analysis(
+            dream.id, "symbol_specialist", "specialist", "stub/bench", content
+        ),
+        "update_analysis_score": lambda: service.update_analysis_score(
+            analysis.id, next(scores) % 5 + 1
+        ),
+        "get_analyses_for_dream": lambda: service.get_analyses_for_dream(dream.id),
+    }
+
+
+GROUPS: dict[str, Callable] = {
+    "parse_scores": parse_scores_cases,
+    "sse": sse_cases,
+    "serialization": serialization_cases,
+    "embedding": embedding_cases,
+    "db": db_cases,
+}
+
+
+# --- runner ---
+
+
+async def _round(fn: Callable, loops: int) -> float:
+    is_async = inspect.iscoroutinefunction(fn)
+    started = time.perf_counter()
+    for _ in range(loops):
+        result = fn()
+        if is_async or inspect.isawaitable(result):
+            await result
+    return time.perf_counter() - started
+
+
+async def measure(fn: Callable, rounds: int, min_round_s: float) -> dict:
+    loops = 1
+    while (elapsed := await _round(fn, loops)) < min_round_s:
+        loops = loops * 2 if elapsed < min_round_s / 10 else int(loops * min_round_s / elapsed) + 1
+    per_call = [await _round(fn, loops) / loops for _ in range(rounds)]
+    return {
+        "min": min(per_call),
+        "median": statistics.median(per_call),
+        "mean": statistics.fmean(per_call),
+        "stdev": statistics.stdev(per_call) if len(per_call) > 1 else 0.0,
+        "rounds": rounds,
+        "loops": loops,
+    }
+
+
+def _commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+async def run(groups: list[str], rounds: int, min_round_s: float) -> dict:
+    results: dict[str, dict] = {}
+    skipped: dict[str, str] = {}
+    for group in groups:
+        async with AsyncExitStack() as stack:
+            try:
+                cases = GROUPS[group](stack)
+                if inspect.isawaitable(cases):
+                    cases = await cases
+            except BackendUnavailableError as e:
+                skipped[group] = str(e)
+                print(f"{group}: skipped, {e}", file=sys.stderr)
+                continue
+            for name, fn in cases.items():
+                key = f"{group}/{name}"
+                results[key] = await measure(fn, rounds, min_round_s)
+                print(f"  {key}: {_fmt(results[key]['median'])}", file=sys.stderr)
+    return {
+        "meta": {
+            "commit": _commit(),
+            "finished_at": datetime.now(UTC).isoformat(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "rounds": rounds,
+        },
+        "results": results,
+        "skipped": skipped,
+    }
+
+
+def _fmt(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("µs", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def print_report(result: dict, baseline: dict | None, threshold: float) -> list[str]:
+    """Print the results table; returns the cases that regressed beyond `threshold`."""
+    base = (baseline or {}).get("results", {})
+    width = max((len(key) for key in result["results"]), default=10) + 2
+    header = f"{'case':<{width}}{'min':>11}{'median':>11}{'stdev':>11}"
+    if baseline:
+        header += f"{'baseline':>11}{'change':>9}"
+    print(header)
+
+    regressions: list[str] = []
+    for key, stats in result["results"].items():
+        row = f"{key:<{width}}" + "".join(
+            f"{_fmt(stats[field]):>11}" for field in ("min", "median", "stdev")
+        )
+        if baseline:
+            before = base.get(key, {}).get("median")
+            if before:
+                change = stats["median"] / before - 1
+                flag = " !" if change > threshold else ""
+                row += f"{_fmt(before):>11}{change:>+8.0%}{flag}"
+                if flag:
+                    regressions.append(key)
+            else:
+                row += f"{'new':>11}"
+        print(row)
+
+    for group, reason in result["skipped"].items():
+        print(f"{group}: skipped ({reason})")
+    if baseline:
+        meta = baseline["meta"]
+        print(f"baseline: {meta.get('commit')} @ {meta.get('finished_at')}")
+        if regressions:
+            print(f"{len(regressions)} case(s) slower than the baseline by over {threshold:.0%}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--only", nargs="+", choices=list(GROUPS), default=list(GROUPS))
+    parser.add_argument("--rounds", type=int, default=7)
+    parser.add_argument("--min-round-ms", type=float, default=50)
+    parser.add_argument("--save", type=Path, help="Write results as JSON (a baseline)")
+    parser.add_argument(
+        "--compare",
+        type=Path,
+        nargs="?",
+        const=BASELINE,
+        help="Baseline JSON to compare against (bare --compare: the committed baseline)",
+    )
+    parser.add_argument("--threshold", type=float, default=0.1, help="Regression, 0.1 = +10%%")
+    args = parser.parse_args()
+
+    logger.disable("app")  # Warnings from malformed-input cases would swamp the output
+    result = asyncio.run(run(args.only, args.rounds, args.min_round_ms / 1000))
+    baseline = json.loads(args.compare.read_text()) if args.compare else None
+    regressions = print_report(result, baseline, args.threshold)
+
+    if args.save:
+        args.save.parent.mkdir(parents=True, exist_ok=True)
+        args.save.write_text(json.dumps(result, indent=2))
+        print(f"saved {args.save}")
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
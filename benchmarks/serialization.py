@@ -0,0 +1,137 @@
+"""
+Serialization throughput for 100-dream `GET /dreams` pages.
+
+Compares the path FastAPI takes with `response_model=list[DreamRead]` on ORM objects
+(validate from attributes → dump to jsonable python → json.dumps) against the orjson
+path that `get_dreams` now uses on plain row dicts. No database needed: the page is
+synthetic, sized like a fully analyzed dream (generalist, three specialists, synthesizer).
+
+    uv run python -m benchmarks.serialization --dreams 100 --seconds 3
+"""
+
+import argparse
+import json
+import random
+import time
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+
+from pydantic import TypeAdapter
+
+from app.core.serialization import dumps
+from app.schemas.dream import DreamRead
+
+AGENTS = [
+    ("generalist", "generalist", 1800),
+    ("symbol_specialist", "specialist", 2600),
+    ("emotion_specialist", "specialist", 2600),
+    ("theme_specialist", "specialist", 2600),
+    ("synthesizer", "synthesizer", 2000),
+]
+WORDS = "water forest door falling mother house light dark flying river stairs mirror".split()
+
+
+def _text(rng: random.Random, size: int) -> str:
+    out: list[str] = []
+    length = 0
+    while length < size:
+        word = rng.choice(WORDS)
+        out.append(word)
+        length += len(word) + 1
+    return " ".join(out)
+
+
+def build_page(n_dreams: int, seed: int = 0) -> list[dict]:
+    rng = random.Random(seed)
+    now = datetime.now(UTC)
+    dreams = []
+    analysis_id = 0
+    for dream_id in range(1, n_dreams + 1):
+        created = now - timedelta(minutes=dream_id)
+        analyses = []
+        for name, agent_type, size in AGENTS:
+            analysis_id += 1
+            analyses.append(
+                {
+                    "id": analysis_id,
+                    "dream_id": dream_id,
+                    "agent_name": name,
+                    "agent_type": agent_type,
+                    "model_used": "ollama/qwen2.5:7b",
+                    "content": _text(rng, size),
+                    "score": rng.randint(1, 5) if agent_type == "specialist" else None,
+                    "duration_ms": round(rng.uniform(2000, 40000), 1),
+                    "prompt_variant": "default",
+                    "prompt_tokens": rng.randint(300, 1500),
+                    "completion_tokens": size // 4,
+                    "ttft_ms": round(rng.uniform(200, 3000), 1),
+                    "created_at": created + timedelta(seconds=analysis_id % 60),
+                }
+            )
+        dreams.append(
+            {
+                "id": dream_id,
+                "content": _text(rng, 600),
+                "dream_date": created,
+                "created_at": created,
+                "updated_at": created,
+                "analyses": analyses,
+            }
+        )
+    return dreams
+
+
+def _as_orm(page: list[dict]) -> list[SimpleNamespace]:
+    return [
+        SimpleNamespace(**{**d, "analyses": [SimpleNamespace(**a) for a in d["analyses"]]})
+        for d in page
+    ]
+
+
+def _rate(fn, seconds: float) -> tuple[float, int]:
+    size = len(fn())
+    count = 0
+    started = time.perf_counter()
+    while (elapsed := time.perf_counter() - started) < seconds:
+        fn()
+        count += 1
+    return count / elapsed, size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--dreams", type=int, default=100)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    args = parser.parse_args()
+
+    page = build_page(args.dreams)
+    orm_page = _as_orm(page)
+    adapter = TypeAdapter(list[DreamRead])
+
+    def fastapi_default() -> bytes:
+        validated = adapter.validate_python(orm_page, from_attributes=True)
+        return json.dumps(adapter.dump_python(validated, mode="json")).encode()
+
+    def pydantic_dump_json() -> bytes:
+        return adapter.dump_json(adapter.validate_python(orm_page, from_attributes=True))
+
+    def orjson_rows() -> bytes:
+        return dumps(page)
+
+    assert json.loads(orjson_rows()) == json.loads(pydantic_dump_json()), "outputs differ"
+
+    print(f"{args.dreams}-dream page, {len(AGENTS)} analyses per dream")
+    print(f"{'path':<22}{'pages/s':>10}{'ms/page':>10}{'bytes':>12}")
+    baseline = None
+    for name, fn in [
+        ("fastapi default", fastapi_default),
+        ("pydantic dump_json", pydantic_dump_json),
+        ("orjson rows", orjson_rows),
+    ]:
+        rate, size = _rate(fn, args.seconds)
+        baseline = baseline or rate
+        print(f"{name:<22}{rate:>10.1f}{1000 / rate:>10.2f}{size:>12}  ({rate / baseline:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+SSE framing cost for one dream's `stream-analyze` stream.
+
+Simulates three specialists streaming concurrently, then the synthesizer, at a given
+per-agent token rate, and pushes the events through the same helpers the endpoint
+uses: one frame per token vs. coalesced frames, each optionally gzip-compressed.
+Reports frames, bytes on the wire and CPU time spent framing.
+
+    uv run python -m benchmarks.sse_frames --tokens 400 --rate 200 --interval-ms 50
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from app.core.sse import coalesce_tokens, gzip_frames, sse_frames
+
+SPECIALISTS = ["symbol_specialist", "emotion_specialist", "theme_specialist"]
+
+
+async def _pipeline_events(tokens: int, rate: float, seed: int = 0):
+    rng = random.Random(seed)
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def agent(name: str) -> None:
+        for _ in range(tokens):
+            await asyncio.sleep(rng.expovariate(rate))
+            await queue.put({"agent": name, "token": " " + "x" * rng.randint(1, 7)})
+        await queue.put(None)
+
+    tasks = [asyncio.create_task(agent(name)) for name in SPECIALISTS]
+    finished = 0
+    while finished < len(tasks):
+        event = await queue.get()
+        if event is None:
+            finished += 1
+        else:
+            yield event
+    yield {"event": "scores", "data": {"symbol": 4, "emotion": 3, "theme": 4}}
+    for _ in range(tokens):
+        await asyncio.sleep(rng.expovariate(rate))
+        yield {"agent": "synthesizer", "token": " " + "x" * rng.randint(1, 7)}
+    yield {"event": "done"}
+
+
+async def _measure(tokens: int, rate: float, interval_ms: int, max_bytes: int, gzip: bool):
+    events = coalesce_tokens(_pipeline_events(tokens, rate), interval_ms, max_bytes)
+    frames = sse_frames(events)
+    frame_count = 0
+
+    async def counted():
+        nonlocal frame_count
+        async for frame in frames:
+            frame_count += 1
+            yield frame
+
+    cpu_started = time.process_time()
+    wire = 0
+    if gzip:
+        async for chunk in gzip_frames(counted()):
+            wire += len(chunk)
+    else:
+        async for frame in counted():
+            wire += len(frame.encode())
+    return frame_count, wire, time.process_time() - cpu_started
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--tokens", type=int, default=400, help="Tokens per agent")
+    parser.add_argument("--rate", type=float, default=200.0, help="Tokens/s per agent")
+    parser.add_argument("--interval-ms", type=int, default=50)
+    parser.add_argument("--max-bytes", type=int, default=2048)
+    args = parser.parse_args()
+
+    print(f"4 agents x {args.tokens} tokens at {args.rate:.0f} tok/s each")
+    print(f"{'variant':<26}{'frames':>8}{'bytes':>10}{'cpu ms':>9}")
+    baseline = None
+    for name, interval, max_bytes, gzip in [
+        ("per-token", 0, 0, False),
+        ("per-token + gzip", 0, 0, True),
+        (f"coalesced {args.interval_ms}ms", args.interval_ms, args.max_bytes, False),
+        (f"coalesced {args.interval_ms}ms + gzip", args.interval_ms, args.max_bytes, True),
+    ]:
+        frames, wire, cpu = await _measure(args.tokens, args.rate, interval, max_bytes, gzip)
+        baseline = baseline or (frames, wire)
+        print(
+            f"{name:<26}{frames:>8}{wire:>10}{cpu * 1000:>9.1f}"
+            f"  ({frames / baseline[0]:.0%} frames, {wire / baseline[1]:.0%} bytes)"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,72 @@
+"""
+Gradio output frames for one dream: per-event full tuples vs paced, diff-only frames.
+
+Replays the simulated `stream-analyze` event stream from `sse_frames.py` (three
+specialists at once, then the synthesizer) into the UI's panel state. Counts frames,
+panel values Gradio has to postprocess (everything not gr.skip()) and the characters of
+text in those values, which is what the server re-processes and the browser re-renders.
+
+    uv run python -m benchmarks.ui_frames --tokens 400 --rate 200 --fps 10
+"""
+
+import argparse
+import asyncio
+
+from app.core.sse import coalesce_tokens
+from app.ui.handlers import AGENT_PANELS, PANELS
+from app.ui.updates import PanelUpdater, paced
+from benchmarks.sse_frames import _pipeline_events
+
+
+def _apply(panels: PanelUpdater, event: dict) -> None:
+    if "token" in event:
+        panels.append(AGENT_PANELS[event["agent"]], event["token"])
+    elif event.get("event") == "scores":
+        for name, score in event["data"].items():
+            panels[f"{name}_stars"] = "★" * score
+
+
+def _count(frame: tuple) -> tuple[int, int]:
+    sent = [value for value in frame if value != {"__type__": "update"}]
+    return len(sent), sum(len(value) for value in sent if isinstance(value, str))
+
+
+async def _measure(tokens: int, rate: float, fps: float) -> tuple[int, int, int]:
+    events = coalesce_tokens(_pipeline_events(tokens, rate), 50, 2048)
+    panels = PanelUpdater(PANELS, similar=[])
+    frames = values = chars = 0
+
+    def emit(frame: tuple) -> None:
+        nonlocal frames, values, chars
+        sent, text = _count(frame)
+        frames, values, chars = frames + 1, values + sent, chars + text
+
+    if fps <= 0:
+        # Previous behaviour: the full tuple after every event
+        async for event in events:
+            _apply(panels, event)
+            emit(tuple(panels[p] for p in PANELS))
+    else:
+        async for batch in paced(events, fps):
+            for event in batch:
+                _apply(panels, event)
+            if panels.changed:
+                emit(panels.frame())
+    return frames, values, chars
+
+
+async def main(tokens: int, rate: float, fps: float) -> None:
+    print(f"{tokens} tokens/agent @ {rate:g} tokens/s, SSE coalesced at 50 ms")
+    print(f"{'mode':<24} {'frames':>7} {'panel values':>13} {'text chars':>11}")
+    for label, mode_fps in (("every event, all panels", 0), (f"{fps:g} fps, diff-only", fps)):
+        frames, values, chars = await _measure(tokens, rate, mode_fps)
+        print(f"{label:<24} {frames:>7} {values:>13} {chars:>11}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tokens", type=int, default=400)
+    parser.add_argument("--rate", type=float, default=200)
+    parser.add_argument("--fps", type=float, default=10)
+    args = parser.parse_args()
+    asyncio.run(main(args.tokens, args.rate, args.fps))
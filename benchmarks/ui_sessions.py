@@ -0,0 +1,148 @@
+"""
+Concurrent Gradio analysis sessions per worker: the old blocking handler vs the real
+async `app.ui.handlers.run_analysis`.
+
+Every session analyzes a new dream end to end with a `stub/` model, so only our own
+overhead is measured. Cases (`--cases`):
+
+  legacy   the pre-async handler: a sync generator streaming POST /dreams/pipeline
+           with a blocking httpx.Client per call. Gradio runs each step of a sync
+           generator in its thread pool (anyio's 40 tokens), so it is driven that way,
+           at concurrency_limit=1 (Gradio's default) and at `--concurrency`
+  remote   run_analysis with UI_API_BASE_URL set: one pooled httpx.AsyncClient
+  local    run_analysis in-process: services and the streaming workflow on this
+           process's event loop (needs the database, Redis and the embedding model)
+
+legacy and remote need a running API; local needs the app's environment in this process:
+
+    STUB_LLM_ENABLED=true SERVE_UI=false uv run uvicorn app.main:app
+    uv run python -m benchmarks.ui_sessions --sessions 64 --concurrency 32
+
+Reports wall time, sessions/s, failed sessions and the peak number of threads.
+"""
+
+import argparse
+import asyncio
+import json
+import threading
+import time
+
+import anyio
+import anyio.to_thread
+import httpx
+
+from app.core.config import get_settings
+from app.core.models_config import MODEL_MAP
+from app.ui import handlers
+
+settings = get_settings()
+
+CASES = ("legacy", "remote", "local")
+_LABEL = "Benchmark stub"
+_DREAM = "I was walking through my childhood home but every door opened onto the sea."
+
+
+def _legacy_run_analysis(api_url: str, dream_text: str, model: str):
+    """The handler before it became async: blocking reads, a client per call."""
+    with httpx.Client(timeout=300) as client:
+        with client.stream(
+            "POST", f"{api_url}/dreams/pipeline", json={"content": dream_text, "model": model}
+        ) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if not line.startswith("data: "):
+                    continue
+                data = json.loads(line[6:])
+                if data.get("event") == "error":
+                    raise RuntimeError(data.get("detail", "pipeline failed"))
+                if data.get("event") == "done":
+                    break
+                yield data
+
+
+async def _legacy_session(api_url: str, model: str, limiter: anyio.CapacityLimiter) -> bool:
+    # What Gradio does with a sync generator: every next() is a thread-pool call, and the
+    # thread is held for the whole blocking read
+    iterator = _legacy_run_analysis(api_url, _DREAM, model)
+    sentinel = object()
+    while await anyio.to_thread.run_sync(next, iterator, sentinel, limiter=limiter) is not sentinel:
+        pass
+    return True
+
+
+async def _async_session() -> bool:
+    complete = False
+    async for frame in handlers.run_analysis(_DREAM, _LABEL):
+        status = frame[handlers.PANELS.index("status")]
+        if isinstance(status, str):  # Unchanged panels are gr.skip()
+            complete = status == "✅ Complete"
+    return complete
+
+
+async def _run(sessions: int, concurrency: int, session) -> tuple[float, int, int]:
+    peak_threads = threading.active_count()
+    failed = 0
+    gate = asyncio.Semaphore(concurrency)
+
+    async def gated() -> None:
+        nonlocal peak_threads, failed
+        async with gate:
+            try:
+                ok = await session()
+            except Exception:
+                ok = False
+            failed += not ok
+            peak_threads = max(peak_threads, threading.active_count())
+
+    started = time.perf_counter()
+    await asyncio.gather(*(gated() for _ in range(sessions)))
+    return time.perf_counter() - started, failed, peak_threads
+
+
+async def main(sessions: int, concurrency: int, model: str, api_url: str, cases: list[str]) -> None:
+    # run_analysis maps a dropdown label to a model; give the stub model one
+    MODEL_MAP[_LABEL] = model
+    settings.stub_llm_enabled = True  # For the in-process (local) case
+    limiter = anyio.CapacityLimiter(40)
+    print(f"{sessions} sessions, {model}, API {api_url}")
+    print(f"{'handler':<34} {'wall s':>8} {'sessions/s':>11} {'failed':>7} {'threads':>8}")
+
+    # Async cases first: idle pool threads from legacy would otherwise inflate their count
+    runs = []
+    for case in sorted(cases, key=CASES.index, reverse=True):
+        if case == "legacy":
+            for limit in (1, concurrency):
+                runs.append(
+                    (
+                        f"legacy sync, concurrency_limit={limit}",
+                        limit,
+                        lambda: _legacy_session(api_url, model, limiter),
+                        None,
+                    )
+                )
+        else:
+            base_url = api_url if case == "remote" else None
+            runs.append(
+                (f"{case} async, limit={concurrency}", concurrency, _async_session, base_url)
+            )
+
+    for label, limit, session, base_url in runs:
+        settings.ui_api_base_url = base_url
+        wall, failed, threads = await _run(sessions, limit, session)
+        print(f"{label:<34} {wall:>8.2f} {sessions / wall:>11.1f} {failed:>7} {threads:>8}")
+    await handlers.close_client()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sessions", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--model", default="stub/ui?ttft_ms=200&tps=50&max_tokens=60")
+    parser.add_argument("--api-url", default="http://localhost:8000/api/v1")
+    parser.add_argument("--cases", default=",".join(CASES), help=f"Comma-separated: {CASES}")
+    args = parser.parse_args()
+    selected = [case.strip() for case in args.cases.split(",") if case.strip()]
+    unknown = set(selected) - set(CASES)
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(sorted(unknown))}")
+    asyncio.run(main(args.sessions, args.concurrency, args.model, args.api_url, selected))
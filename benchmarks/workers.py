@@ -0,0 +1,132 @@
+"""
+Memory per worker and aggregate throughput of `python -m app.serve` at 1/2/4/8 workers.
+
+Starts the server for each worker count, with and without preloading models in the
+parent, waits for it to come up, and then reports:
+  - RSS per worker (what `top` shows; counts shared pages in every process)
+  - PSS per worker and in total (shared pages split between the processes that map
+    them, so the total is the real memory footprint), from /proc/<pid>/smaps_rollup
+  - requests/s against `--path` from `--concurrency` keep-alive connections
+
+Linux only. The load generator is a single asyncio process; for high worker counts on
+cheap endpoints, it can become the bottleneck before the server does.
+
+    uv run python -m benchmarks.workers --workers 1 2 4 8 --path /api/v1/dreams?limit=20
+"""
+
+import argparse
+import asyncio
+import os
+import signal
+import subprocess
+import sys
+import time
+
+import httpx
+
+
+def _memory_kb(pid: int) -> tuple[int, int]:
+    rss = pss = 0
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            if line.startswith("Rss:"):
+                rss = int(line.split()[1])
+            elif line.startswith("Pss:"):
+                pss = int(line.split()[1])
+    return rss, pss
+
+
+def _children(pid: int) -> list[int]:
+    with open(f"/proc/{pid}/task/{pid}/children") as f:
+        return [int(child) for child in f.read().split()]
+
+
+async def _wait_up(base_url: str, timeout: float) -> bool:
+    """Wait for /ready (models warm); fall back to /health if warmup can't succeed here."""
+    deadline = time.monotonic() + timeout
+    healthy_since = None
+    async with httpx.AsyncClient(base_url=base_url, timeout=5) as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get("/ready")).status_code == 200:
+                    return True
+                if (await client.get("/health")).status_code == 200:
+                    healthy_since = healthy_since or time.monotonic()
+                    # Warmup failed (e.g. no Ollama here): give it time to settle, then go
+                    if time.monotonic() - healthy_since > 15:
+                        return True
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.5)
+    return False
+
+
+async def _throughput(base_url: str, path: str, concurrency: int, seconds: float) -> float:
+    done = 0
+    deadline = time.monotonic() + seconds
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+
+        async def loop() -> None:
+            nonlocal done
+            while time.monotonic() < deadline:
+                (await client.get(path)).raise_for_status()
+                done += 1
+
+        await asyncio.gather(*(loop() for _ in range(concurrency)))
+    return done / seconds
+
+
+async def _measure(args, workers: int, preload: bool) -> None:
+    port = args.port
+    cmd = [sys.executable, "-m", "app.serve", "--workers", str(workers), "--port", str(port)]
+    if not preload:
+        cmd.append("--no-preload")
+    server = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        if not await _wait_up(base_url, args.startup_timeout):
+            print(f"{workers:>7} {'yes' if preload else 'no':>8}  server did not come up")
+            return
+        rps = await _throughput(base_url, args.path, args.concurrency, args.seconds)
+        memory = [_memory_kb(pid) for pid in _children(server.pid)]
+        parent_rss, parent_pss = _memory_kb(server.pid)
+        rss = sum(m[0] for m in memory) / len(memory) / 1024
+        pss = sum(m[1] for m in memory) / len(memory) / 1024
+        total_pss = (sum(m[1] for m in memory) + parent_pss) / 1024
+        print(
+            f"{workers:>7} {'yes' if preload else 'no':>8} {rss:>12.0f} {pss:>12.0f}"
+            f" {total_pss:>10.0f} {rps:>10.0f}"
+        )
+    finally:
+        server.send_signal(signal.SIGTERM)
+        try:
+            server.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+
+async def main(args) -> None:
+    print(f"GET {args.path}, {args.concurrency} connections, {args.seconds:g}s per run")
+    print(
+        f"{'workers':>7} {'preload':>8} {'RSS/worker':>12} {'PSS/worker':>12}"
+        f" {'PSS total':>10} {'req/s':>10}   (MB)"
+    )
+    for workers in args.workers:
+        for preload in (False, True):
+            await _measure(args, workers, preload)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--path", default="/health")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--port", type=int, default=8799)
+    parser.add_argument("--startup-timeout", type=float, default=300)
+    args = parser.parse_args()
+    if not os.path.exists("/proc/self/smaps_rollup"):
+        sys.exit("Needs Linux /proc/<pid>/smaps_rollup")
+    asyncio.run(main(args))
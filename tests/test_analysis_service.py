@@ -0,0 +1,55 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.metrics import collect_llm_calls, track_llm_call
+from app.services.analysis_service import AgentRun, measure_stream
+
+
+async def _agent_stream(fail: bool = False):
+    with track_llm_call("stub/test", "test_agent", "stream") as call:
+        for chunk in ("a", "b", "c"):
+            call.first_token()
+            yield chunk
+        if fail:
+            raise RuntimeError("provider went away")
+        call.usage(SimpleNamespace(prompt_tokens=7, completion_tokens=3))
+
+
+@pytest.mark.asyncio
+async def test_measure_stream_fills_the_run_when_the_stream_ends():
+    run = AgentRun()
+    assert [chunk async for chunk in measure_stream(_agent_stream(), run)] == ["a", "b", "c"]
+    assert (run.prompt_tokens, run.completion_tokens) == (7, 3)
+    assert run.duration_ms is not None and run.ttft_ms is not None
+
+
+@pytest.mark.asyncio
+async def test_measure_stream_can_be_resumed_from_other_tasks():
+    # SSE code resumes pipeline generators from other tasks; a collector held across the
+    # generator's yields used to fail with "created in a different Context"
+    run = AgentRun()
+    chunks = measure_stream(_agent_stream(), run)
+    first = await asyncio.create_task(anext(chunks))
+    rest = [chunk async for chunk in chunks]
+    assert [first, *rest] == ["a", "b", "c"]
+    assert run.completion_tokens == 3
+
+
+@pytest.mark.asyncio
+async def test_measure_stream_calls_reach_outer_collectors():
+    with collect_llm_calls() as calls:
+        _ = [chunk async for chunk in measure_stream(_agent_stream(), AgentRun())]
+    assert [call.agent for call in calls] == ["test_agent"]
+
+
+@pytest.mark.asyncio
+async def test_measure_stream_raises_stream_errors():
+    run = AgentRun()
+    received = []
+    with pytest.raises(RuntimeError, match="provider went away"):
+        async for chunk in measure_stream(_agent_stream(fail=True), run):
+            received.append(chunk)
+    assert received == ["a", "b", "c"]
+    assert run.duration_ms is None
@@ -0,0 +1,67 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.core import cassettes
+from app.core.cassettes import CassetteMissError, cassette_key, recording, replay
+
+_MESSAGES = [{"role": "system", "content": "Be brief"}, {"role": "user", "content": "A dream"}]
+
+
+@pytest.fixture(autouse=True)
+def cassette_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(cassettes.settings, "llm_cassette_dir", str(tmp_path))
+    monkeypatch.setattr(cassettes.settings, "llm_cassette_speed", 0)
+    cassettes._load.cache_clear()
+    yield tmp_path
+    cassettes._load.cache_clear()
+
+
+async def _provider(model, messages, stream=False, **kwargs):
+    """A provider answering "a dream" in two chunks, then usage."""
+    usage = SimpleNamespace(prompt_tokens=5, completion_tokens=2)
+    if not stream:
+        message = SimpleNamespace(content="a dream")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=usage)
+
+    async def chunks():
+        for text in ("a", " dream"):
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+        yield SimpleNamespace(choices=[], usage=usage)
+
+    return chunks()
+
+
+def test_key_ignores_dict_order_but_not_temperature():
+    reordered = [{"content": m["content"], "role": m["role"]} for m in _MESSAGES]
+    assert cassette_key("m", _MESSAGES, 0.7) == cassette_key("m", reordered, 0.7)
+    assert cassette_key("m", _MESSAGES, 0.7) != cassette_key("m", _MESSAGES, 0.2)
+    assert cassette_key("m", _MESSAGES, 0.7) != cassette_key("other", _MESSAGES, 0.7)
+
+
+@pytest.mark.asyncio
+async def test_recorded_stream_replays_chunk_by_chunk():
+    recorded = await recording(_provider)("m", _MESSAGES, stream=True, temperature=0.7)
+    assert [c.choices[0].delta.content async for c in recorded if c.choices] == ["a", " dream"]
+
+    replayed = await replay("m", _MESSAGES, stream=True, temperature=0.7)
+    chunks = [chunk async for chunk in replayed]
+    assert [c.choices[0].delta.content for c in chunks if c.choices] == ["a", " dream"]
+    assert chunks[-1].usage.completion_tokens == 2
+
+
+@pytest.mark.asyncio
+async def test_streamed_recording_replays_for_a_plain_call():
+    recorded = await recording(_provider)("m", _MESSAGES, stream=True, temperature=0.7)
+    _ = [chunk async for chunk in recorded]
+
+    response = await replay("m", _MESSAGES, temperature=0.7)
+    assert response.choices[0].message.content == "a dream"
+    assert response.usage.prompt_tokens == 5
+
+
+@pytest.mark.asyncio
+async def test_unrecorded_call_fails():
+    await recording(_provider)("m", _MESSAGES, temperature=0.7)
+    with pytest.raises(CassetteMissError):
+        await replay("m", _MESSAGES, temperature=0.2)
@@ -0,0 +1,179 @@
+from datetime import UTC, datetime
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+
+from app.api.conditional import _not_modified, compute_etag, compute_last_modified
+from app.api.v1 import dreams as dreams_api
+from app.core import cache
+from app.core.cache import CachedResponse
+from app.core.database import get_db
+from app.services.dream_service import DreamService
+
+_UPDATED = datetime(2026, 10, 1, 12, 0, 0, 500_000, tzinfo=UTC)
+_ETAG = '"abc123"'
+
+
+def _request(**headers: str) -> Request:
+    raw = [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw})
+
+
+def _entry() -> CachedResponse:
+    return CachedResponse(body=b"{}", etag=_ETAG, last_modified=_UPDATED)
+
+
+def _analysis(analysis_id: int, score: float | None = None, minute: int = 5) -> dict:
+    created = datetime(2026, 10, 1, 12, minute, tzinfo=UTC)
+    return {"id": analysis_id, "created_at": created, "score": score, "content": "..."}
+
+
+def _dream(*analyses: dict) -> dict:
+    return {"id": 1, "content": "A dream", "updated_at": _UPDATED, "analyses": list(analyses)}
+
+
+@pytest.mark.parametrize(
+    "if_none_match",
+    [_ETAG, f"W/{_ETAG}", "*", f'"other", {_ETAG}', f'"other",W/{_ETAG}'],
+)
+def test_matching_etags_are_not_modified(if_none_match):
+    assert _not_modified(_request(if_none_match=if_none_match), _entry())
+
+
+def test_other_etag_is_modified():
+    assert not _not_modified(_request(if_none_match='"other", "another"'), _entry())
+
+
+def test_if_none_match_beats_if_modified_since():
+    # The date alone would match; the stale ETag must still win
+    request = _request(if_none_match='"stale"', if_modified_since="Thu, 01 Oct 2026 12:00:00 GMT")
+    assert not _not_modified(request, _entry())
+
+
+def test_if_modified_since_uses_whole_seconds():
+    assert _not_modified(_request(if_modified_since="Thu, 01 Oct 2026 12:00:00 GMT"), _entry())
+    assert not _not_modified(_request(if_modified_since="Thu, 01 Oct 2026 11:59:59 GMT"), _entry())
+    assert not _not_modified(_request(if_modified_since="not a date"), _entry())
+
+
+def test_no_validators_is_modified():
+    assert not _not_modified(_request(), _entry())
+
+
+def test_etag_is_stable_for_the_same_rows():
+    assert compute_etag([_dream(_analysis(1, 4.0))]) == compute_etag([_dream(_analysis(1, 4.0))])
+
+
+def test_etag_changes_when_an_analysis_is_added_or_rescored():
+    base = compute_etag([_dream(_analysis(1))])
+    assert compute_etag([_dream(_analysis(1), _analysis(2))]) != base
+    assert compute_etag([_dream(_analysis(1, 4.0))]) != base
+    assert compute_etag([_dream(_analysis(1, 4.0))]) != compute_etag([_dream(_analysis(1, 3.0))])
+
+
+def test_etag_changes_when_the_dream_is_edited():
+    edited = {**_dream(), "updated_at": datetime(2026, 10, 2, tzinfo=UTC)}
+    assert compute_etag([edited]) != compute_etag([_dream()])
+
+
+def test_last_modified_is_the_newest_timestamp():
+    assert compute_last_modified([_dream(_analysis(1, minute=30))]) == datetime(
+        2026, 10, 1, 12, 30, tzinfo=UTC
+    )
+    assert compute_last_modified([]) is None
+
+
+class _FakeRedis:
+    """The slice of redis.asyncio the response cache uses, in memory."""
+
+    def __init__(self):
+        self.data: dict[str, object] = {}
+
+    async def get(self, key):
+        value = self.data.get(key)
+        return str(value).encode() if value is not None else None
+
+    async def hgetall(self, key):
+        return dict(self.data.get(key, {}))
+
+    def pipeline(self, transaction: bool = True):
+        return _FakePipeline(self)
+
+
+class _FakePipeline:
+    def __init__(self, redis: _FakeRedis):
+        self.redis = redis
+        self.ops: list = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def hset(self, key, mapping):
+        self.ops.append(lambda: self.redis.data.__setitem__(key, _encoded(mapping)))
+
+    def expire(self, key, seconds):
+        self.ops.append(lambda: None)
+
+    def incr(self, key):
+        self.ops.append(lambda: self.redis.data.__setitem__(key, self.redis.data.get(key, 0) + 1))
+
+    async def execute(self):
+        for op in self.ops:
+            op()
+
+
+def _encoded(mapping: dict) -> dict:
+    return {
+        name.encode(): value if isinstance(value, bytes) else str(value).encode()
+        for name, value in mapping.items()
+    }
+
+
+@pytest.fixture
+def client(monkeypatch):
+    rows = {1: _dream(_analysis(1))}
+
+    async def get_dream_row(self, dream_id):
+        return rows.get(dream_id)
+
+    async def no_db():
+        yield None
+
+    monkeypatch.setattr(cache.settings, "response_cache_enabled", True)
+    redis = _FakeRedis()
+    monkeypatch.setattr(cache, "get_redis", lambda: redis)
+    monkeypatch.setattr(DreamService, "get_dream_row", get_dream_row)
+
+    app = FastAPI()
+    app.include_router(dreams_api.router)
+    app.dependency_overrides[get_db] = no_db
+    with TestClient(app) as test_client:
+        yield test_client, rows
+
+
+def test_conditional_get_until_a_write_bumps_the_generation(client):
+    test_client, rows = client
+
+    first = test_client.get("/dreams/1")
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+
+    cached = test_client.get("/dreams/1", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["etag"] == etag
+    assert cached.headers["cache-control"] == "no-cache"
+    assert cached.headers["last-modified"] == first.headers["last-modified"]
+
+    # What AnalysisService does after saving an analysis
+    rows[1] = _dream(_analysis(1), _analysis(2, minute=10))
+    test_client.portal.call(cache.invalidate_dream, 1)
+
+    fresh = test_client.get("/dreams/1", headers={"If-None-Match": etag})
+    assert fresh.status_code == 200
+    assert fresh.headers["etag"] != etag
+    assert len(fresh.json()["analyses"]) == 2
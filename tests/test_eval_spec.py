@@ -0,0 +1,69 @@
+import json
+from dataclasses import replace
+
+from app.evals.spec import Cell, expand_cells, load_spec
+from app.schemas.eval import EvalDream, EvalTarget
+
+
+def _cell(target: EvalTarget = EvalTarget.SYMBOL, prompts: dict | None = None, **fields) -> Cell:
+    cell = Cell(
+        dream=EvalDream(id="1", content="A lighthouse in the desert"),
+        target=target,
+        model="stub/eval",
+        prompt="default",
+        prompts=prompts or {},
+        judge_model="stub/judge",
+        repeat=0,
+    )
+    return replace(cell, **fields)
+
+
+def test_key_is_stable_and_ignores_the_variant_name():
+    assert _cell().key == _cell().key
+    assert _cell(prompt="terse").key == _cell().key
+    assert len(_cell().key) == 32
+
+
+def test_key_changes_with_what_determines_the_result():
+    base = _cell().key
+    assert _cell(model="stub/other").key != base
+    assert _cell(judge_model="stub/other").key != base
+    assert _cell(repeat=1).key != base
+    assert _cell(dream=EvalDream(id="1", content="Another dream")).key != base
+
+
+def test_specialist_key_only_sees_its_own_and_the_generalists_prompts():
+    base = _cell().key
+    assert _cell(prompts={"emotion_specialist": "Be terse"}).key == base
+    assert _cell(prompts={"symbol_specialist": "Be terse"}).key != base
+    assert _cell(prompts={"generalist": "Be terse"}).key != base
+
+
+def test_pipeline_key_sees_every_prompt():
+    base = _cell(EvalTarget.PIPELINE).key
+    assert _cell(EvalTarget.PIPELINE, prompts={"emotion_specialist": "Be terse"}).key != base
+
+
+def test_expand_cells_crosses_everything_and_reads_prompt_files(tmp_path):
+    (tmp_path / "dreams.ndjson").write_text('{"content": "one"}\n\n{"content": "two"}\n')
+    (tmp_path / "terse.txt").write_text("Be terse")
+    spec_path = tmp_path / "spec.json"
+    spec_path.write_text(
+        json.dumps(
+            {
+                "name": "small",
+                "dataset": "dreams.ndjson",
+                "models": ["stub/a", "stub/b"],
+                "targets": ["symbol_specialist"],
+                "prompts": {"default": {}, "terse": {"symbol_specialist": "@terse.txt"}},
+                "judge_model": "stub/judge",
+                "repeats": 2,
+            }
+        )
+    )
+    cells = expand_cells(load_spec(spec_path), spec_path)
+    assert len(cells) == 2 * 2 * 2 * 2
+    assert {cell.dream.id for cell in cells} == {"1", "3"}
+    assert len({cell.key for cell in cells}) == len(cells)
+    terse = next(cell for cell in cells if cell.prompt == "terse")
+    assert terse.prompts == {"symbol_specialist": "Be terse"}
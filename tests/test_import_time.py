@@ -0,0 +1,17 @@
+"""The API's cold import stays under budget and leaves heavy modules to first use."""
+
+import os
+
+from benchmarks import import_time
+
+BUDGET_MS = float(os.environ.get("IMPORT_TIME_BUDGET_MS", 1500))
+
+
+def test_api_import_defers_heavy_modules():
+    profile = import_time._import_profile(ui=False)
+    assert "app.main" in profile
+    assert [m for m in import_time.LAZY_MODULES if m in profile] == []
+
+
+def test_api_import_within_budget():
+    assert import_time.main(budget_ms=BUDGET_MS, runs=3, ui=False, top=0) == 0
@@ -0,0 +1,104 @@
+import pytest
+
+from app.core.config import ModelRoute, RoutingPolicy
+from app.services import model_router
+from app.services.model_router import ModelStats, _StatsCache, select_model
+
+_CHEAP = "ollama/small"
+_MID = "openrouter/openai/gpt-5-nano"
+_PRICEY = "openrouter/anthropic/claude-haiku-4.5"
+
+
+@pytest.fixture(autouse=True)
+def router_settings(monkeypatch):
+    monkeypatch.setattr(model_router.settings, "model_router_min_samples", 10)
+    monkeypatch.setattr(model_router.settings, "model_router_explore_rate", 0.0)
+    monkeypatch.setattr(model_router.settings, "model_costs", {_MID: (0.05, 0.4), _PRICEY: (1, 5)})
+    monkeypatch.setattr(model_router.settings, "model_routes", {})
+
+
+def _stats(by_agent: dict[str, ModelStats], agent: str = "synthesizer") -> _StatsCache:
+    stats = _StatsCache()
+    stats.by_agent = {(agent, model): own for model, own in by_agent.items()}
+    for model, own in by_agent.items():
+        stats.by_model[model] = ModelStats(0, None, own.scored, own.score_sum)
+    return stats
+
+
+def _scored(mean: float, scored: int = 20) -> ModelStats:
+    return ModelStats(runs=scored, p95_ms=1000.0, scored=scored, score_sum=mean * scored)
+
+
+def _timed(p95_ms: float, runs: int = 20) -> ModelStats:
+    return ModelStats(runs=runs, p95_ms=p95_ms, scored=0, score_sum=0.0)
+
+
+def _route(policy: RoutingPolicy, **fields) -> ModelRoute:
+    return ModelRoute(policy=policy, candidates=[_CHEAP, _MID, _PRICEY], **fields)
+
+
+async def _select(monkeypatch, route: ModelRoute, stats: _StatsCache) -> str:
+    monkeypatch.setattr(model_router.settings, "model_routes", {"synthesizer": route})
+
+    async def fresh_stats():
+        return stats
+
+    monkeypatch.setattr(model_router, "_fresh_stats", fresh_stats)
+    return await select_model("synthesizer", "requested/model")
+
+
+@pytest.mark.asyncio
+async def test_cheapest_candidate_above_the_score_wins(monkeypatch):
+    stats = _stats({_CHEAP: _scored(3.0), _MID: _scored(4.0), _PRICEY: _scored(4.5)})
+    route = _route(RoutingPolicy.CHEAPEST_ABOVE_SCORE, min_score=3.5)
+    assert await _select(monkeypatch, route, stats) == _MID
+
+
+@pytest.mark.asyncio
+async def test_candidates_without_enough_scores_are_skipped(monkeypatch):
+    stats = _stats({_CHEAP: _scored(5.0, scored=3), _PRICEY: _scored(4.0)})
+    route = _route(RoutingPolicy.CHEAPEST_ABOVE_SCORE)
+    assert await _select(monkeypatch, route, stats) == _PRICEY
+
+
+@pytest.mark.asyncio
+async def test_scores_across_agents_stand_in_for_unscored_agents(monkeypatch):
+    stats = _stats({})
+    stats.by_model[_CHEAP] = ModelStats(0, None, 20, 80.0)
+    route = _route(RoutingPolicy.CHEAPEST_ABOVE_SCORE)
+    assert await _select(monkeypatch, route, stats) == _CHEAP
+
+
+@pytest.mark.asyncio
+async def test_fastest_p95_wins(monkeypatch):
+    stats = _stats({_CHEAP: _timed(900), _MID: _timed(400), _PRICEY: _timed(100, runs=2)})
+    assert await _select(monkeypatch, _route(RoutingPolicy.FASTEST_P95), stats) == _MID
+
+
+@pytest.mark.asyncio
+async def test_no_qualifying_candidate_falls_back_to_the_request(monkeypatch):
+    stats = _stats({_CHEAP: _timed(900, runs=2)})
+    route = _route(RoutingPolicy.FASTEST_P95)
+    assert await _select(monkeypatch, route, stats) == "requested/model"
+
+
+@pytest.mark.asyncio
+async def test_fixed_route_and_no_route(monkeypatch):
+    route = ModelRoute(model=_CHEAP)
+    assert await _select(monkeypatch, route, _stats({})) == _CHEAP
+    assert await select_model("generalist", "requested/model") == "requested/model"
+
+
+@pytest.mark.asyncio
+async def test_exploration_sends_requests_to_under_sampled_candidates(monkeypatch):
+    monkeypatch.setattr(model_router.settings, "model_router_explore_rate", 1.0)
+    stats = _stats({_CHEAP: _scored(3.0), _MID: _scored(4.0), _PRICEY: _scored(4.5, scored=2)})
+    route = _route(RoutingPolicy.CHEAPEST_ABOVE_SCORE, min_score=3.5)
+    assert await _select(monkeypatch, route, stats) == _PRICEY
+
+
+@pytest.mark.asyncio
+async def test_exploration_stops_once_every_candidate_has_history(monkeypatch):
+    monkeypatch.setattr(model_router.settings, "model_router_explore_rate", 1.0)
+    stats = _stats({_CHEAP: _timed(900), _MID: _timed(400), _PRICEY: _timed(500)})
+    assert await _select(monkeypatch, _route(RoutingPolicy.FASTEST_P95), stats) == _MID
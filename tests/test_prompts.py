@@ -0,0 +1,56 @@
+from collections import Counter
+
+import pytest
+
+from app.agents import prompts
+from app.agents.prompts import DEFAULT_VARIANT, assign_variant, choose_prompt
+
+
+@pytest.fixture
+def experiments(monkeypatch):
+    def set_experiments(value: dict[str, dict[str, float]]) -> None:
+        monkeypatch.setattr(prompts.settings, "prompt_experiments", value)
+
+    set_experiments({})
+    return set_experiments
+
+
+def test_no_experiment_means_default(experiments):
+    assert assign_variant("symbol_specialist", 1) == DEFAULT_VARIANT
+
+
+def test_assignment_is_stable_and_ignores_key_order(experiments):
+    experiments({"symbol_specialist": {"default": 1, "terse-v1": 1}})
+    first = [assign_variant("symbol_specialist", dream_id) for dream_id in range(200)]
+    experiments({"symbol_specialist": {"terse-v1": 1, "default": 1}})
+    assert [assign_variant("symbol_specialist", dream_id) for dream_id in range(200)] == first
+
+
+def test_split_follows_the_weights(experiments):
+    experiments({"symbol_specialist": {"default": 3, "terse-v1": 1, "off": 0}})
+    counts = Counter(assign_variant("symbol_specialist", dream_id) for dream_id in range(4000))
+    assert set(counts) == {"default", "terse-v1"}
+    assert 0.2 < counts["terse-v1"] / 4000 < 0.3
+
+
+def test_agents_are_split_independently(experiments):
+    split = {"default": 1, "terse-v1": 1}
+    experiments({"symbol_specialist": split, "emotion_specialist": split})
+    symbol = [assign_variant("symbol_specialist", dream_id) for dream_id in range(200)]
+    emotion = [assign_variant("emotion_specialist", dream_id) for dream_id in range(200)]
+    assert symbol != emotion
+
+
+def test_missing_variant_file_falls_back_to_default(experiments, tmp_path, monkeypatch):
+    monkeypatch.setattr(prompts.settings, "prompts_dir", str(tmp_path))
+    experiments({"symbol_specialist": {"missing-v1": 1}})
+    assert choose_prompt("symbol_specialist", 1) == (DEFAULT_VARIANT, None)
+
+
+def test_variant_file_is_used(experiments, tmp_path, monkeypatch):
+    monkeypatch.setattr(prompts.settings, "prompts_dir", str(tmp_path))
+    (tmp_path / "symbol_specialist").mkdir()
+    (tmp_path / "symbol_specialist" / "terse-v1.txt").write_text("Be terse.\n")
+    experiments({"symbol_specialist": {"terse-v1": 1}})
+    prompts.load_variant.cache_clear()
+    assert choose_prompt("symbol_specialist", 1) == ("terse-v1", "Be terse.")
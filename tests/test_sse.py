@@ -0,0 +1,74 @@
+import asyncio
+
+import pytest
+
+from app.core.sse import coalesce_tokens
+
+
+async def _events(*events: dict, delay: float = 0):
+    for event in events:
+        if delay:
+            await asyncio.sleep(delay)
+        yield event
+
+
+async def _collect(events, interval_ms: int = 0, max_bytes: int = 0) -> list[dict]:
+    return [event async for event in coalesce_tokens(events, interval_ms, max_bytes)]
+
+
+def _tok(agent: str, token: str) -> dict:
+    return {"agent": agent, "token": token}
+
+
+@pytest.mark.asyncio
+async def test_disabled_passes_events_through():
+    events = [_tok("symbol", "a"), _tok("emotion", "b"), {"event": "done"}]
+    assert await _collect(_events(*events)) == events
+
+
+@pytest.mark.asyncio
+async def test_tokens_are_joined_per_agent_in_order():
+    events = _events(_tok("symbol", "a"), _tok("emotion", "x"), _tok("symbol", "b"))
+    assert await _collect(events, interval_ms=10_000) == [
+        _tok("symbol", "ab"),
+        _tok("emotion", "x"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_flushes_at_max_bytes():
+    events = _events(_tok("symbol", "ab"), _tok("symbol", "cd"), _tok("symbol", "e"))
+    assert await _collect(events, max_bytes=4) == [_tok("symbol", "abcd"), _tok("symbol", "e")]
+
+
+@pytest.mark.asyncio
+async def test_other_events_flush_pending_tokens_first():
+    events = _events(
+        _tok("symbol", "a"), {"event": "scores", "data": {}}, _tok("symbol", "b"), {"event": "done"}
+    )
+    assert await _collect(events, interval_ms=10_000) == [
+        _tok("symbol", "a"),
+        {"event": "scores", "data": {}},
+        _tok("symbol", "b"),
+        {"event": "done"},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_flushes_after_interval():
+    # Tokens 50 ms apart with a 10 ms window: each one is flushed on its own
+    events = _events(_tok("symbol", "a"), _tok("symbol", "b"), delay=0.05)
+    assert await _collect(events, interval_ms=10) == [_tok("symbol", "a"), _tok("symbol", "b")]
+
+
+@pytest.mark.asyncio
+async def test_source_error_is_raised_after_pending_tokens():
+    async def failing():
+        yield _tok("symbol", "a")
+        raise RuntimeError("boom")
+
+    received = []
+    with pytest.raises(RuntimeError, match="boom"):
+        async for event in coalesce_tokens(failing(), 10_000, 0):
+            received.append(event)
+    assert received == [_tok("symbol", "a")]
@@ -0,0 +1,51 @@
+import pytest
+
+from app.core import stub_llm
+from app.core.stub_llm import OVERRIDE_LIMITS, StubLLMDisabledError, stub_profile
+
+_MESSAGES = [{"role": "user", "content": "I dreamt of a lighthouse in the desert"}]
+
+
+def test_defaults_come_from_settings():
+    profile = stub_profile("stub/plain")
+    assert profile.ttft_ms == stub_llm.settings.stub_ttft_ms
+    assert profile.max_tokens == stub_llm.settings.stub_max_tokens
+
+
+def test_overrides_in_the_name_are_typed():
+    profile = stub_profile("stub/fast?ttft_ms=50&tps=400&max_tokens=80&unknown=1")
+    assert (profile.ttft_ms, profile.tps, profile.max_tokens) == (50.0, 400.0, 80)
+    assert isinstance(profile.max_tokens, int)
+
+
+def test_overrides_are_clamped():
+    profile = stub_profile("stub/x?max_tokens=100000000&tps=-5&ttft_ms=1e12&failure_rate=2")
+    assert profile.max_tokens == OVERRIDE_LIMITS["max_tokens"][1]
+    assert profile.tps == 0
+    assert profile.ttft_ms == OVERRIDE_LIMITS["ttft_ms"][1]
+    assert profile.failure_rate == 1
+
+
+@pytest.mark.parametrize("value", ["nan", "inf", "-inf", "abc", ""])
+def test_non_finite_or_non_numeric_overrides_are_ignored(value):
+    profile = stub_profile(f"stub/x?ttft_ms={value}&max_tokens={value}&tps=100")
+    assert profile.ttft_ms == stub_llm.settings.stub_ttft_ms
+    assert profile.max_tokens == stub_llm.settings.stub_max_tokens
+    assert profile.tps == 100
+
+
+@pytest.mark.asyncio
+async def test_rejected_unless_enabled(monkeypatch):
+    monkeypatch.setattr(stub_llm.settings, "stub_llm_enabled", False)
+    with pytest.raises(StubLLMDisabledError):
+        await stub_llm.acompletion("stub/x", _MESSAGES)
+
+
+@pytest.mark.asyncio
+async def test_same_request_gives_the_same_reply(monkeypatch):
+    monkeypatch.setattr(stub_llm.settings, "stub_llm_enabled", True)
+    model = "stub/x?ttft_ms=0&tps=0&jitter=0&max_tokens=20"
+    first = await stub_llm.acompletion(model, _MESSAGES)
+    second = await stub_llm.acompletion(model, _MESSAGES)
+    assert first.choices[0].message.content == second.choices[0].message.content
+    assert 10 <= first.usage.completion_tokens <= 20
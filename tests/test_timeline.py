@@ -0,0 +1,43 @@
+from app.services.timeline_service import critical_path
+
+
+def _span(span_id: str, start: int, end: int, parent_id: str | None = "run") -> dict:
+    return {"span_id": span_id, "parent_id": parent_id, "start": start, "end": end}
+
+
+def _path(spans: list[dict]) -> list[tuple[str, int]]:
+    return [(span["span_id"], own) for span, own in critical_path(spans)]
+
+
+def test_only_the_slowest_parallel_branch_is_on_the_path():
+    spans = [
+        _span("run", 0, 100, parent_id=None),
+        _span("symbol", 10, 50),
+        _span("emotion", 10, 80),
+        _span("synthesis", 80, 95),
+    ]
+    # run: 0-10 before the branches and 95-100 after synthesis
+    assert _path(spans) == [("run", 15), ("emotion", 70), ("synthesis", 15)]
+
+
+def test_nested_spans_split_self_time():
+    spans = [
+        _span("run", 0, 100, parent_id=None),
+        _span("agent", 0, 100),
+        _span("llm", 20, 90, parent_id="agent"),
+    ]
+    assert _path(spans) == [("run", 0), ("agent", 30), ("llm", 70)]
+
+
+def test_spans_with_unexported_parents_hang_off_the_root():
+    spans = [_span("a", 0, 40, parent_id="missing"), _span("b", 40, 60, parent_id="missing")]
+    assert _path(spans) == [("a", 40), ("b", 20)]
+
+
+def test_a_child_overlapping_the_next_one_is_cut_where_that_one_starts():
+    spans = [
+        _span("run", 0, 100, parent_id=None),
+        _span("first", 0, 60),
+        _span("second", 40, 100),
+    ]
+    assert _path(spans) == [("run", 0), ("first", 40), ("second", 60)]
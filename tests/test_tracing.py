@@ -0,0 +1,75 @@
+import asyncio
+import logging
+
+import pytest
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from app.core import tracing
+from app.core.tracing import in_own_task, span
+
+
+@pytest.fixture
+def exporter(monkeypatch):
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    monkeypatch.setattr(tracing, "tracer", provider.get_tracer("test"))
+    return exporter
+
+
+@in_own_task
+async def _stage():
+    with span("stage.first"):
+        yield 1
+        with span("llm.call"):  # Started after the consumer resumed us from another task
+            yield 2
+    with span("stage.second"):
+        yield 3
+
+
+async def _run_resumed_from_other_tasks() -> list[int]:
+    with span("pipeline.run"):
+        chunks = _stage()
+        first = await asyncio.create_task(anext(chunks))
+        second = await asyncio.create_task(anext(chunks))
+        return [first, second, *[item async for item in chunks]]
+
+
+@pytest.mark.asyncio
+async def test_spans_held_across_yields_stay_in_one_trace(exporter, caplog):
+    with caplog.at_level(logging.ERROR, logger="opentelemetry.context"):
+        assert await _run_resumed_from_other_tasks() == [1, 2, 3]
+    assert "Failed to detach context" not in caplog.text
+
+    spans = {s.name: s for s in exporter.get_finished_spans()}
+    root = spans["pipeline.run"]
+    assert {s.context.trace_id for s in spans.values()} == {root.context.trace_id}
+    assert spans["stage.first"].parent.span_id == root.context.span_id
+    assert spans["llm.call"].parent.span_id == spans["stage.first"].context.span_id
+    assert spans["stage.second"].parent.span_id == root.context.span_id
+
+
+@pytest.mark.asyncio
+async def test_errors_pass_through_and_early_close_ends_the_spans(exporter):
+    @in_own_task
+    async def failing():
+        with span("stage.failing"):
+            yield 1
+            raise RuntimeError("provider went away")
+
+    with pytest.raises(RuntimeError, match="provider went away"):
+        _ = [item async for item in failing()]
+
+    @in_own_task
+    async def stalled():
+        with span("stage.stalled"):
+            yield 1
+            await asyncio.Event().wait()  # A provider that stops sending
+            yield 2
+
+    chunks = stalled()
+    assert await anext(chunks) == 1
+    await chunks.aclose()  # The client went away: the stage is cancelled, its span ended
+    assert {s.name for s in exporter.get_finished_spans()} == {"stage.failing", "stage.stalled"}
@@ -0,0 +1,23 @@
+import os
+
+import pytest
+
+from app.workflows import transcription_queue
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+# Imported libraries (gradio) may have started threads; the child only writes to a pipe
+@pytest.mark.filterwarnings("ignore:This process .* is multi-threaded:DeprecationWarning")
+def test_forked_worker_gets_its_own_id():
+    read, write = os.pipe()
+    pid = os.fork()
+    if pid == 0:  # Child: report its id and exit without running pytest's teardown
+        os.close(read)
+        os.write(write, transcription_queue._WORKER_ID.encode())
+        os._exit(0)
+    os.close(write)
+    with os.fdopen(read) as f:
+        child_id = f.read()
+    os.waitpid(pid, 0)
+    assert child_id
+    assert child_id != transcription_queue._WORKER_ID
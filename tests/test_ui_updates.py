@@ -0,0 +1,79 @@
+import asyncio
+import time
+
+import pytest
+
+gr = pytest.importorskip("gradio")
+
+from app.ui.updates import PanelUpdater, paced  # noqa: E402
+
+
+async def _events(count: int, gap: float = 0, then_wait: float = 0, fail: bool = False):
+    for i in range(count):
+        if gap:
+            await asyncio.sleep(gap)
+        yield {"n": i}
+    if then_wait:
+        await asyncio.sleep(then_wait)
+    if fail:
+        raise RuntimeError("pipeline failed")
+
+
+@pytest.mark.asyncio
+async def test_order_is_preserved_across_batches():
+    batches = [batch async for batch in paced(_events(200, gap=0.001), max_fps=30)]
+    assert [event["n"] for batch in batches for event in batch] == list(range(200))
+    assert all(batches)
+
+
+@pytest.mark.asyncio
+async def test_at_most_max_fps_batches():
+    started = time.perf_counter()
+    batches = [batch async for batch in paced(_events(100, gap=0.003), max_fps=20)]
+    elapsed = time.perf_counter() - started
+    assert len(batches) <= elapsed * 20 + 1
+    assert len(batches) < 100
+
+
+@pytest.mark.asyncio
+async def test_tail_is_released_without_waiting_for_the_stream_to_end():
+    started = time.perf_counter()
+    received: list[tuple[float, list[int]]] = []
+    async for batch in paced(_events(3, then_wait=0.5), max_fps=10):
+        received.append((time.perf_counter() - started, [event["n"] for event in batch]))
+    assert [n for _, batch in received for n in batch] == [0, 1, 2]
+    # Everything was sent one frame interval (0.1 s) in, long before the source ended
+    assert received[-1][0] < 0.3
+
+
+@pytest.mark.asyncio
+async def test_first_event_goes_out_immediately():
+    started = time.perf_counter()
+    async for _ in paced(_events(1), max_fps=1):
+        assert time.perf_counter() - started < 0.1
+
+
+@pytest.mark.asyncio
+async def test_source_errors_are_raised_after_pending_events():
+    received = []
+    with pytest.raises(RuntimeError, match="pipeline failed"):
+        async for batch in paced(_events(3, fail=True), max_fps=1000):
+            received.extend(event["n"] for event in batch)
+    assert received == [0, 1, 2]
+
+
+def test_panel_updater_skips_unchanged_panels():
+    panels = PanelUpdater(["status", "symbol", "emotion"], status="Starting")
+    assert panels.frame() == ("Starting", "", "")
+    assert not panels.changed
+    assert panels.frame() == (gr.skip(), gr.skip(), gr.skip())
+
+    panels.append("symbol", "Water")
+    panels["status"] = "Starting"  # Same value: not a change
+    assert panels.changed
+    assert panels.frame() == (gr.skip(), "Water", gr.skip())
+
+    panels.append("symbol", " means")
+    panels["emotion"] = "Calm"
+    assert panels.frame() == (gr.skip(), "Water means", "Calm")
+    assert panels["symbol"] == "Water means"
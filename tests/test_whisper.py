@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+
+from app.ui.whisper import to_mono_float
+
+
+@pytest.mark.parametrize("dtype", [np.int8, np.int16, np.int32])
+def test_signed_pcm_full_scale(dtype):
+    info = np.iinfo(dtype)
+    audio = to_mono_float(np.array([info.min, 0, info.max], dtype=dtype))
+    assert audio.dtype == np.float32
+    np.testing.assert_allclose(audio, [-1.0, 0.0, 1.0], atol=1e-2)
+
+
+def test_unsigned_pcm_is_centred():
+    audio = to_mono_float(np.array([0, 128, 255], dtype=np.uint8))
+    np.testing.assert_allclose(audio, [-1.0, 0.0, 127 / 128])
+
+
+def test_multichannel_int_is_scaled_then_mixed():
+    stereo = np.array([[16384, -16384], [32767, 32767]], dtype=np.int16)
+    np.testing.assert_allclose(to_mono_float(stereo), [0.0, 32767 / 32768])
+
+
+def test_float_passes_through():
+    audio = np.array([0.5, -0.25], dtype=np.float64)
+    result = to_mono_float(audio)
+    assert result.dtype == np.float32
+    np.testing.assert_array_equal(result, [0.5, -0.25])